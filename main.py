@@ -1,13 +1,17 @@
 import sys
 import os
-import psutil
-import ctypes
-from PySide6.QtWidgets import QApplication, QSystemTrayIcon
-from PySide6.QtCore import Qt, QTimer
-from src.views.main_views.main_widget import MainWidget
-from src.tray.system_tray import SystemTrayIcon
 
-def main():
+def main(command, instance_listener):
+    # GUI相关模块在这里才导入，标签提取子进程和转发命令的进程不需要加载它们
+    import psutil
+    import ctypes
+    from PySide6.QtWidgets import QApplication, QSystemTrayIcon
+    from PySide6.QtCore import Qt, QTimer
+    from src.views.main_views.main_widget import MainWidget
+    from src.tray.system_tray import SystemTrayIcon
+    from src.utils.stall_watchdog import StallWatchdog
+    from src.configs.base_config import get_stall_threshold
+
     QApplication.setHighDpiScaleFactorRoundingPolicy(
         Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
     
@@ -21,8 +25,39 @@ def main():
     else:
         print("系统托盘不可用")
     
+    # 主线程卡顿看门狗
+    stall_threshold = get_stall_threshold()
+    if stall_threshold > 0:
+        watchdog = StallWatchdog(stall_threshold)
+        watchdog.start()
+        app.aboutToQuit.connect(watchdog.stop)
+    
+    # 接收后启动的进程转发的命令，信号把命令从监听线程转到GUI线程
+    if instance_listener is not None:
+        instance_listener.start(widget.instanceCommand.emit)
+        app.aboutToQuit.connect(instance_listener.close)
+    if command["command"] != "show":
+        widget.handle_instance_command(command)
+    
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--extraction-worker" in sys.argv:
+        # 标签提取子进程，见src/utils/extraction_service.py
+        from src.utils.extraction_service import serve
+        serve()
+    else:
+        from src.utils.single_instance import InstanceListener, USAGE, forward_command, parse_command
+        command = parse_command(sys.argv[1:])
+        if command is None:
+            print(USAGE)
+            sys.exit(2)
+        # 已有实例在运行时只转发命令，不加载界面
+        if forward_command(command):
+            sys.exit(0)
+        instance_listener = InstanceListener.acquire()
+        # 同时启动时另一个进程可能先开始了监听
+        if instance_listener is None and forward_command(command):
+            sys.exit(0)
+        main(command, instance_listener)
\ No newline at end of file
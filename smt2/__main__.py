@@ -0,0 +1,12 @@
+# python -m smt2 add|list|done：不加载界面的命令行工具，见src/utils/todo_cli.py
+import os
+import sys
+
+if __name__ == "__main__":
+    # 配置文件和todo文件的路径相对于项目根目录，从其他目录调用时也能找到
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    os.chdir(root)
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    from src.utils.todo_cli import main
+    sys.exit(main(sys.argv[1:]))
@@ -6,6 +6,7 @@ from src.configs.defaul_config import *
 _properties = {}
 _properties_file = "resources/properties.json"
 _properties_loaded = False
+_todo_pos_prefixes = None  # 由todo_poses转换的词性前缀，配置重新加载时失效
 
 def _load_properties():
     global _properties, _properties_loaded
@@ -20,11 +21,20 @@ def _load_properties():
             
 
 def reload_properties():
-    global _properties, _properties_loaded
+    global _properties, _properties_loaded, _todo_pos_prefixes
     _properties_loaded = False
     _properties = {}
+    _todo_pos_prefixes = None
     _load_properties()
 
+
+def _get_bool(key: str, default: bool) -> bool:
+    """读取布尔配置，兼容在设置界面中被保存为字符串的情况"""
+    value = _properties.get(key, default)
+    if isinstance(value, str):
+        return value.lower() in ('true', '1', 'yes', 'on')
+    return bool(value)
+
 # 获取todo文件路径
 def get_todo_file_name() -> str:
     _load_properties()
@@ -35,11 +45,64 @@ def get_todo_poses() -> list[str]:
     _load_properties()
     return _properties.get("todo_poses", ('n', 'eng'))
 
+# 获取去重后的词性前缀，只在配置加载后转换一次，可直接用于str.startswith
+def get_todo_pos_prefixes() -> tuple:
+    global _todo_pos_prefixes
+    _load_properties()
+    if _todo_pos_prefixes is None:
+        _todo_pos_prefixes = tuple(frozenset(get_todo_poses()))
+    return _todo_pos_prefixes
+
+# 获取用户词典文件列表，每行 “词 [词频] [词性]”
+def get_user_dictionaries() -> list[str]:
+    _load_properties()
+    return _properties.get("user_dictionaries", ["resources/tag_words.txt"])
+
 # 获取文本抽取模型
 def get_extractor_model() -> str:
     _load_properties()
     return _properties.get("extractor_model", 'jieba')
 
+# 获取trie分词使用的词表文件，每行一个词
+def get_tag_word_list() -> str:
+    _load_properties()
+    return _properties.get("tag_word_list", "resources/tag_words.txt")
+
+# 是否在子进程中提取标签，避免jieba词典常驻GUI进程
+def get_extraction_process() -> bool:
+    _load_properties()
+    return _get_bool("extraction_process", False)
+
+# 获取标签提取子进程的空闲退出时间（秒）
+def get_extraction_idle_timeout() -> int:
+    _load_properties()
+    return _properties.get("extraction_idle_timeout", 60)
+
+# 获取标签栏最多显示的标签数量
+def get_tag_bar_max_tags() -> int:
+    _load_properties()
+    return _properties.get("tag_bar_max_tags", 20)
+
+# 获取性能监控采样间隔（毫秒）
+def get_performance_interval() -> int:
+    _load_properties()
+    return _properties.get("performance_interval", 1000)
+
+# 获取主线程卡顿检测阈值（毫秒），0表示关闭
+def get_stall_threshold() -> int:
+    _load_properties()
+    return _properties.get("stall_threshold_ms", 500)
+
+# 是否开启热点函数耗时统计
+def get_profile_hooks() -> bool:
+    _load_properties()
+    return _get_bool("profile_hooks", False)
+
+# 是否记录Chrome Trace事件
+def get_trace_events() -> bool:
+    _load_properties()
+    return _get_bool("trace_events", False)
+
 
 # 获取字体配置
 def get_font() -> str:
@@ -6,11 +6,22 @@ class defaul_config():
         self.default_properties = {
             "todo_file_name": "resources/todos.json",
             "extractor_model": "jieba",
+            "tag_word_list": "resources/tag_words.txt",
+            "user_dictionaries": [
+                "resources/tag_words.txt"
+            ],
+            "extraction_process": False,
+            "extraction_idle_timeout": 60,
             "todo_poses": [
                 "n",
                 "eng"
             ],
+            "tag_bar_max_tags": 20,
             "font": "Microsoft YaHei UI",
+            "performance_interval": 1000,
+            "stall_threshold_ms": 500,
+            "profile_hooks": False,
+            "trace_events": False,
             "colors": {
                 "performance_panel_background": [
                     50,
@@ -96,6 +107,12 @@ class defaul_config():
                     136,
                     136
                 ],
+                "todo_panel_todoitem_selected_background": [
+                    74,
+                    144,
+                    226,
+                    80
+                ],
                 "todo_panel_titlelabel_foreground": [
                     204,
                     204,
@@ -143,6 +160,11 @@ class defaul_config():
                     160,
                     240
                 ],
+                "todo_panel_tagbutton_excluded_background": [
+                    160,
+                    80,
+                    80
+                ],
                 "todo_panel_scrollarea_background": [
                     50,
                     50,
@@ -2,6 +2,8 @@ from PySide6.QtWidgets import QSystemTrayIcon, QMenu, QApplication
 from PySide6.QtGui import QAction, QIcon, QPixmap, QColor
 from PySide6.QtCore import QObject, Signal, Slot
 from src.utils.win_pin import WindowPinner
+from src.utils.profiler import HotPathProfiler
+from src.utils.tracer import EventTracer, trace_slot
 from src.views.toolbox_views.toolbox_window import ToolBoxWindow
 
 
@@ -49,16 +51,38 @@ class SystemTrayIcon(QSystemTrayIcon):
         
         self.menu.addSeparator()
         
+        # 性能分析报告（仅在开启耗时统计时显示）
+        if HotPathProfiler.enabled:
+            self.profile_action = QAction("导出性能分析报告", None)
+            self.profile_action.triggered.connect(self.dump_profile_report)
+            self.menu.addAction(self.profile_action)
+        
+        # 导出Trace（仅在开启事件记录时显示）
+        if EventTracer.enabled:
+            self.trace_action = QAction("导出 Trace", None)
+            self.trace_action.triggered.connect(self.export_trace)
+            self.menu.addAction(self.trace_action)
+        
         # 工具箱
         self.tools_action = QAction("工具箱", None)
-        self.tools_action.triggered.connect(self.open_toolbox)
+        self.tools_action.triggered.connect(lambda: self.open_toolbox())
         self.menu.addAction(self.tools_action)
         
+        self.memory_action = QAction("内存分析", None)
+        self.memory_action.triggered.connect(lambda: self.open_toolbox(ToolBoxWindow.MEMORY_PAGE))
+        self.menu.addAction(self.memory_action)
+        
+        self.archive_action = QAction("已完成归档", None)
+        self.archive_action.triggered.connect(lambda: self.open_toolbox(ToolBoxWindow.ARCHIVE_PAGE))
+        self.menu.addAction(self.archive_action)
+        
         self.exit_action = QAction("退出", None)
         self.exit_action.triggered.connect(QApplication.quit)
         self.menu.addAction(self.exit_action)
         
         self.setContextMenu(self.menu)
+        # 性能模式也可能由命令行切换，显示菜单时同步勾选状态
+        self.menu.aboutToShow.connect(self.sync_performance_action)
         
         self.pin_self_on_init()
         
@@ -73,16 +97,28 @@ class SystemTrayIcon(QSystemTrayIcon):
                 self.win_pin.toggle_pin(hwnd)
                 break
     
-    def open_toolbox(self):
-        """打开工具箱窗口"""
+    def open_toolbox(self, page=None):
+        """打开工具箱窗口，可指定打开的页面"""
         if self.toolbox_window is None:
             self.toolbox_window = ToolBoxWindow()
+        if page is not None:
+            self.toolbox_window.nav_list.setCurrentRow(page)
         
         # 显示窗口并将其置于前台
         self.toolbox_window.show()
         self.toolbox_window.raise_()
         self.toolbox_window.activateWindow()
     
+    def dump_profile_report(self):
+        """导出热点函数耗时报告"""
+        path = HotPathProfiler.dump()
+        self.showMessage("性能分析", f"报告已保存到 {path}")
+    
+    def export_trace(self):
+        """导出Chrome Trace，可拖入Perfetto查看"""
+        path = EventTracer.export()
+        self.showMessage("Trace", f"已导出到 {path}，可在 ui.perfetto.dev 中打开")
+    
     def toggle_performance_mode(self):
         widget = self.parent()
         if hasattr(widget, 'toggle_mode'):
@@ -92,6 +128,12 @@ class SystemTrayIcon(QSystemTrayIcon):
             elif hasattr(widget, 'main_widget'):
                 self.performance_action.setChecked(widget.main_widget.performance_panel.performance_mode)
     
+    def sync_performance_action(self):
+        widget = self.parent()
+        if hasattr(widget, 'performance_panel'):
+            self.performance_action.setChecked(widget.performance_panel.performance_mode)
+    
+    @trace_slot
     def update_win_pin_menu(self):
         # 清除现有动作
         self.win_pin_menu.clear()
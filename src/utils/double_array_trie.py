@@ -0,0 +1,177 @@
+# double_array_trie.py - 可用mmap直接加载的双数组Trie
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from typing import Iterable, Iterator, List, Optional
+
+# 文件格式：头部(魔数, 词表摘要, 字符表大小, 数组长度, 最长词长, 词数) + 字符表 + base数组 + check数组
+_MAGIC = b"SMTDAT1\0"
+_HEADER = struct.Struct("<8s16sIIII")
+
+
+def word_list_digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class DoubleArrayTrie:
+    """
+    双数组Trie：状态s经字符编码c转移到t = base[s] + c，且要求check[t] == s；编码0表示词在s处结束
+    字符按出现的字符集重新编码，数组只保存整数，保存为二进制后可用mmap零拷贝加载，不必逐词重建
+    """
+
+    def __init__(self, alphabet: Iterable[str], base, check, max_length: int, word_count: int,
+                 digest: bytes = b"", buffer=None):
+        self._alphabet = list(alphabet)  # 编码i对应_alphabet[i - 1]
+        self._codes = {ch: code for code, ch in enumerate(self._alphabet, 1)}
+        self._base = base
+        self._check = check
+        self._size = len(check)
+        self.max_length = max_length
+        self.word_count = word_count
+        self.digest = digest
+        self._buffer = buffer  # mmap对象，需与数组视图同生命周期
+
+    def __len__(self) -> int:
+        return self.word_count
+
+    # ---- 构建与存储 ----
+
+    @classmethod
+    def build(cls, words: Iterable[str], digest: bytes = b"") -> "DoubleArrayTrie":
+        words = sorted({word for word in words if word})
+        alphabet = sorted({ch for word in words for ch in word})
+        codes = {ch: code for code, ch in enumerate(alphabet, 1)}
+        keys = [[codes[ch] for ch in word] for word in words]
+        base = array("i", [0])
+        check = array("i", [0])  # 0号为根状态
+        next_free = 1
+
+        if not keys:
+            return cls(alphabet, base, check, 0, 0, digest)
+
+        stack = [(0, 0, len(keys), 0)]  # (状态, 词区间起点, 词区间终点, 深度)
+        while stack:
+            state, lo, hi, depth = stack.pop()
+            # 按深度处的字符编码分组，词已结束的编码为0，已排序所以各组连续
+            children = []
+            i = lo
+            while i < hi:
+                code = keys[i][depth] if depth < len(keys[i]) else 0
+                j = i + 1
+                while j < hi and (keys[j][depth] if depth < len(keys[j]) else 0) == code:
+                    j += 1
+                children.append((code, i, j))
+                i = j
+
+            offset = max(1, next_free - children[0][0])
+            while True:
+                needed = offset + children[-1][0] + 1
+                if needed > len(check):
+                    base.extend([0] * (needed - len(check)))
+                    check.extend([-1] * (needed - len(check)))
+                if all(check[offset + code] == -1 for code, _, _ in children):
+                    break
+                offset += 1
+            base[state] = offset
+            for code, i, j in children:
+                check[offset + code] = state
+                if code:
+                    stack.append((offset + code, i, j, depth + 1))
+            while next_free < len(check) and check[next_free] != -1:
+                next_free += 1
+
+        return cls(alphabet, base, check, max(map(len, words)), len(words), digest)
+
+    def save(self, path: str):
+        """写入临时文件后替换，避免半个文件被下次加载"""
+        alphabet = array("I", map(ord, self._alphabet))
+        header = _HEADER.pack(_MAGIC, self.digest.ljust(16, b"\0"), len(alphabet), self._size,
+                              self.max_length, self.word_count)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(alphabet.tobytes())
+            f.write(array("i", self._base).tobytes())
+            f.write(array("i", self._check).tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["DoubleArrayTrie"]:
+        """mmap映射二进制文件，base/check直接是文件上的视图；格式不对时返回None"""
+        try:
+            with open(path, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(buffer) < _HEADER.size:
+            buffer.close()
+            return None
+        magic, digest, alphabet_size, size, max_length, word_count = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC or len(buffer) != _HEADER.size + 4 * (alphabet_size + 2 * size):
+            buffer.close()
+            return None
+
+        view = memoryview(buffer)
+        position = _HEADER.size
+        alphabet = view[position:position + 4 * alphabet_size].cast("I")
+        position += 4 * alphabet_size
+        base = view[position:position + 4 * size].cast("i")
+        position += 4 * size
+        check = view[position:position + 4 * size].cast("i")
+        return cls((chr(code_point) for code_point in alphabet), base, check,
+                   max_length, word_count, digest, buffer)
+
+    # ---- 查询 ----
+
+    def _transition(self, state: int, ch: str) -> int:
+        code = self._codes.get(ch)
+        if code is None:
+            return -1
+        target = self._base[state] + code
+        if target < self._size and self._check[target] == state:
+            return target
+        return -1
+
+    def _is_end(self, state: int) -> bool:
+        target = self._base[state]
+        return target < self._size and self._check[target] == state
+
+    def __contains__(self, word: str) -> bool:
+        state = 0
+        for ch in word:
+            state = self._transition(state, ch)
+            if state < 0:
+                return False
+        return bool(word) and self._is_end(state)
+
+    def prefix_lengths(self, text: str, start: int = 0) -> Iterator[int]:
+        """从start开始的所有词典词的长度，由短到长"""
+        state = 0
+        for position in range(start, len(text)):
+            state = self._transition(state, text[position])
+            if state < 0:
+                return
+            if self._is_end(state):
+                yield position - start + 1
+
+    def longest_prefix(self, text: str, start: int = 0) -> int:
+        length = 0
+        for length in self.prefix_lengths(text, start):
+            pass
+        return length
+
+    def words(self) -> List[str]:
+        """按字典序列出所有词（用于调试和导出）"""
+        result = []
+        stack = [(0, "")]
+        while stack:
+            state, prefix = stack.pop()
+            if self._is_end(state):
+                result.append(prefix)
+            for ch in self._alphabet:
+                target = self._transition(state, ch)
+                if target >= 0:
+                    stack.append((target, prefix + ch))
+        return sorted(result)
@@ -0,0 +1,140 @@
+# duplicate_detector.py - 基于MinHash/LSH的近似重复事项检测
+import hashlib
+import re
+from array import array
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+_CJK_RUN = re.compile(r"[぀-ヿ㐀-䶿一-鿿豈-﫿가-힯]+")
+_WORD = re.compile(r"[a-z0-9_]+")
+MAX_CACHED_SIGNATURES = 8192
+
+
+def shingles(text: str, n: int = 2) -> FrozenSet[str]:
+    """中日韩文字取相邻n个字符组成的片段，其他文字取单词"""
+    text = text.lower()
+    result = set(_WORD.findall(text))
+    for run in _CJK_RUN.findall(text):
+        if len(run) <= n:
+            result.add(run)
+        else:
+            result.update(run[i:i + n] for i in range(len(run) - n + 1))
+    return frozenset(result)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class DuplicateDetector:
+    """
+    增量维护的近似重复检测：每条事项的片段集合计算MinHash签名，签名分成若干段(band)放入LSH桶，
+    只有落入同一个桶的事项才按Jaccard相似度确认，整体接近线性而不是两两比较
+    签名按文本内容的哈希缓存，重复添加的相同文本不再重新计算
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.6):
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._signatures: Dict[bytes, Tuple[int, ...]] = {}  # 内容哈希 -> 签名
+        self._shingles: Dict[str, FrozenSet[str]] = {}  # key -> 片段集合
+        self._key_buckets: Dict[str, List[tuple]] = {}  # key -> 所在的桶
+        self._buckets: Dict[tuple, Set[str]] = {}  # (段号, 段内签名) -> key集合
+        self._neighbors: Dict[str, Set[str]] = {}  # key -> 确认重复的key
+
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    def clear(self):
+        self._shingles.clear()
+        self._key_buckets.clear()
+        self._buckets.clear()
+        self._neighbors.clear()
+
+    def signature(self, shingle_set: FrozenSet[str]) -> Tuple[int, ...]:
+        """
+        MinHash签名：每个片段用shake_128一次生成num_perm个32位哈希，相当于num_perm个独立的哈希函数，
+        逐位取所有片段中的最小值
+        """
+        digest = hashlib.blake2b("\0".join(sorted(shingle_set)).encode("utf-8"), digest_size=16).digest()
+        cached = self._signatures.get(digest)
+        if cached is not None:
+            return cached
+        length = self.num_perm * 4
+        hashes = [array("I", hashlib.shake_128(shingle.encode("utf-8")).digest(length)) for shingle in shingle_set]
+        result = tuple(map(min, zip(*hashes)))
+        if len(self._signatures) >= MAX_CACHED_SIGNATURES:
+            # 丢弃最早缓存的签名
+            del self._signatures[next(iter(self._signatures))]
+        self._signatures[digest] = result
+        return result
+
+    def add(self, key: str, text: str):
+        """添加或更新事项，并与同桶的事项确认是否重复"""
+        shingle_set = shingles(text)
+        if self._shingles.get(key) == shingle_set:
+            return
+        self.remove(key)
+        if not shingle_set:
+            return
+        self._shingles[key] = shingle_set
+
+        signature = self.signature(shingle_set)
+        rows = self.rows
+        bucket_keys = [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+        self._key_buckets[key] = bucket_keys
+        candidates = set()
+        for bucket_key in bucket_keys:
+            bucket = self._buckets.setdefault(bucket_key, set())
+            candidates.update(bucket)
+            bucket.add(key)
+
+        for other in candidates:
+            if jaccard(shingle_set, self._shingles[other]) >= self.threshold:
+                self._neighbors.setdefault(key, set()).add(other)
+                self._neighbors.setdefault(other, set()).add(key)
+
+    def remove(self, key: str):
+        if self._shingles.pop(key, None) is None:
+            return
+        for bucket_key in self._key_buckets.pop(key, ()):
+            bucket = self._buckets[bucket_key]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[bucket_key]
+        for other in self._neighbors.pop(key, ()):
+            neighbors = self._neighbors[other]
+            neighbors.discard(key)
+            if not neighbors:
+                del self._neighbors[other]
+
+    def duplicate_keys(self) -> Set[str]:
+        """所有存在重复的key"""
+        return set(self._neighbors)
+
+    def group_of(self, key: str) -> Set[str]:
+        """与key直接或间接重复的所有key（含key本身）"""
+        if key not in self._neighbors:
+            return set()
+        group = {key}
+        stack = [key]
+        while stack:
+            for other in self._neighbors[stack.pop()]:
+                if other not in group:
+                    group.add(other)
+                    stack.append(other)
+        return group
+
+    def groups(self) -> List[Set[str]]:
+        """所有重复组"""
+        result = []
+        seen = set()
+        for key in self._neighbors:
+            if key not in seen:
+                group = self.group_of(key)
+                seen.update(group)
+                result.append(group)
+        return result
@@ -0,0 +1,159 @@
+# extraction_service.py - 在子进程中提取标签，空闲时子进程退出以释放jieba词典占用的内存
+import json
+import os
+import queue
+import struct
+import subprocess
+import sys
+import threading
+from collections import Counter
+from typing import List, Optional
+
+# 消息格式：4字节小端长度 + UTF-8 JSON
+_LENGTH = struct.Struct("<I")
+WORKER_FLAG = "--extraction-worker"
+
+
+def write_message(stream, message: dict):
+    data = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    stream.write(_LENGTH.pack(len(data)) + data)
+    stream.flush()
+
+
+def _read_exactly(stream, size: int) -> Optional[bytes]:
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def read_message(stream) -> Optional[dict]:
+    """读取一条消息，管道关闭时返回None"""
+    header = _read_exactly(stream, _LENGTH.size)
+    if header is None:
+        return None
+    data = _read_exactly(stream, _LENGTH.unpack(header)[0])
+    if data is None:
+        return None
+    return json.loads(data.decode("utf-8"))
+
+
+def serve():
+    """
+    子进程入口（main.py --extraction-worker）：每个请求是一批文本，应答是对应的词频
+    超过空闲时间没有请求或GUI进程关闭管道时退出
+    """
+    from src.configs.base_config import get_extraction_idle_timeout
+    from src.utils.todo_tag_extractor import TodoTagExtractor
+
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    sys.stdout = sys.stderr  # 提取过程中的print输出不能混入应答
+    idle_timeout = get_extraction_idle_timeout()
+
+    # 管道读取放在单独线程中，主线程按超时等待，Windows的管道不支持select
+    requests = queue.Queue()
+
+    def read_loop():
+        while True:
+            message = read_message(stdin)
+            requests.put(message)
+            if message is None:
+                return
+
+    threading.Thread(target=read_loop, daemon=True).start()
+    while True:
+        try:
+            message = requests.get(timeout=idle_timeout)
+        except queue.Empty:
+            # 读取线程仍阻塞在stdin上，直接结束进程，由GUI进程在下次请求时重新启动
+            os._exit(0)
+        if message is None:
+            return
+        counts = [dict(TodoTagExtractor.extract_term_counts(text)) for text in message.get("texts", ())]
+        write_message(stdout, {"counts": counts})
+
+
+class ExtractionClient:
+    """
+    GUI进程中的客户端：首次请求时启动子进程，子进程空闲退出后下次请求时自动重新启动
+    """
+
+    def __init__(self):
+        self._process = None
+        self._lock = threading.Lock()
+        self._closed = False  # 关闭后进行中的请求不再重试，也不再启动新的子进程
+
+    @staticmethod
+    def _command() -> List[str]:
+        if getattr(sys, "frozen", False):
+            return [sys.executable, WORKER_FLAG]
+        main_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "main.py")
+        return [sys.executable, main_path, WORKER_FLAG]
+
+    def _spawn(self):
+        self._process = subprocess.Popen(
+            self._command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+
+    def _discard(self):
+        process, self._process = self._process, None
+        if process is not None:
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+            for stream in (process.stdin, process.stdout):
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+
+    def count_terms_many(self, texts: List[str]) -> List[Counter]:
+        """批量提取词频；子进程已因空闲退出时重新启动并重试一次"""
+        with self._lock:
+            for _ in range(2):
+                if self._closed:
+                    break
+                try:
+                    if self._process is None or self._process.poll() is not None:
+                        self._discard()
+                        self._spawn()
+                    write_message(self._process.stdin, {"texts": texts})
+                    response = read_message(self._process.stdout)
+                except (OSError, ValueError):
+                    response = None
+                if response is not None:
+                    return [Counter(counts) for counts in response["counts"]]
+                self._discard()
+        raise RuntimeError("标签提取进程已关闭" if self._closed else "标签提取进程没有响应")
+
+    def is_running(self) -> bool:
+        process = self._process
+        return process is not None and process.poll() is None
+
+    def close(self, timeout: float = 1.0):
+        """
+        退出时结束子进程并回收，关闭管道；正在进行的请求读到管道关闭后直接失败，不会重新启动子进程
+        """
+        self._closed = True
+        process = self._process
+        if process is None:
+            return
+        if process.poll() is None:
+            process.kill()
+        try:
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            pass
+        # 等进行中的请求退出后再关闭管道，避免与读取线程同时操作
+        if self._lock.acquire(timeout=timeout):
+            try:
+                self._discard()
+            finally:
+                self._lock.release()
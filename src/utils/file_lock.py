@@ -0,0 +1,55 @@
+# file_lock.py - 跨进程的建议性文件锁，GUI和命令行工具读写同一个todos.json时使用
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+LOCK_SUFFIX = ".lock"
+RETRY_INTERVAL = 0.01
+
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if sys.platform == "win32":
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd: int):
+    if sys.platform == "win32":
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path: str, timeout: float = 5.0):
+    """
+    独占path对应的.lock文件，超时抛出TimeoutError（OSError的子类）
+    锁的是旁边的.lock文件而不是数据文件本身，快照通过os.replace替换后锁仍然有效
+    同一进程内不可嵌套使用
+    """
+    fd = os.open(path + LOCK_SUFFIX, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        deadline = time.monotonic() + timeout
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"等待文件锁超时: {path}{LOCK_SUFFIX}")
+            time.sleep(RETRY_INTERVAL)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
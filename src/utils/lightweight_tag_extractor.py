@@ -24,46 +24,56 @@ class LightweightTagExtractor:
         return [tag for tag in matches if len(tag) >= 2]
     
     @staticmethod
-    def extract_tags(text: str, max_tags: int = 10) -> List[str]:
+    def todo_tags(text: str, extracted_tags=None) -> frozenset:
         """
-        简化的标签提取：基于词频统计
+        事项的全部标签：文本中的[]标签加上提取出的标签（尚未提取时为None）
+        补全、标签筛选和标签查询都使用这个集合，避免补全给出的标签查询不到
+        """
+        return frozenset(LightweightTagExtractor.extract_hashtag_tags(text)).union(extracted_tags or ())
+    
+    @staticmethod
+    def count_terms(text: str) -> Counter:
+        """
+        统计候选标签的词频（不截断），供TF-IDF排序使用
         """
-        # 预处理：清理文本
         text = text.strip()
         if not text:
-            return []
+            return Counter()
         
-        # 步骤1：提取中括号标签（优先级最高）
-        hashtag_tags = LightweightTagExtractor.extract_hashtag_tags(text)
-        if len(hashtag_tags) >= max_tags:
-            return hashtag_tags[:max_tags]
-        
-        # 步骤2：用正则表达式提取所有候选词
-        # 中文词（连续的2-4个字符）
+        counts = Counter(LightweightTagExtractor.extract_hashtag_tags(text))
+        # 用正则表达式提取所有候选词：中文词（连续的2-4个字符）和英文单词（2个字符以上）
         chinese_words = re.findall(r'[\u4e00-\u9fff]{2,4}', text)
-        # 英文单词（2个字符以上）
         english_words = re.findall(r'[a-zA-Z]{2,}', text)
         
-        all_words = chinese_words + english_words
-        
-        # 步骤3：过滤停用词
-        filtered_words = []
-        for word in all_words:
+        for word in chinese_words + english_words:
             word_lower = word.lower()
-            # 同时检查word中是否包含停用词
+            # 过滤停用词，同时检查word中是否包含停用词
             if (word not in LightweightTagExtractor.STOPWORDS and 
                 word_lower not in LightweightTagExtractor.STOPWORDS and
                 not any(stopword in word for stopword in LightweightTagExtractor.STOPWORDS)
                 ):
-                filtered_words.append(word)
+                counts[word] += 1
+        return counts
+    
+    @staticmethod
+    def extract_tags(text: str, max_tags: int = 10) -> List[str]:
+        """
+        简化的标签提取：基于词频统计
+        """
+        # 预处理：清理文本
+        text = text.strip()
+        if not text:
+            return []
         
-        # 步骤4：统计词频
-        if not filtered_words:
-            return hashtag_tags
+        # 步骤1：提取中括号标签（优先级最高）
+        hashtag_tags = LightweightTagExtractor.extract_hashtag_tags(text)
+        if len(hashtag_tags) >= max_tags:
+            return hashtag_tags[:max_tags]
         
-        word_freq = Counter(filtered_words)
+        # 步骤2：统计候选词的词频，[]标签也计入其中，合并时会被跳过
+        word_freq = LightweightTagExtractor.count_terms(text)
         
-        # 步骤5：按频率排序，返回前N个
+        # 步骤3：按频率排序，返回前N个
         sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
         
         # 合并hashtag标签和频率标签
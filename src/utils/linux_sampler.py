@@ -0,0 +1,146 @@
+# linux_sampler.py - Linux下基于/proc与/sys的快速采样器
+import os
+import sys
+from typing import List, Optional, Tuple
+
+
+class LinuxProcSampler:
+    """
+    常驻打开/proc/stat、/proc/meminfo以及电池的sysfs文件，
+    每次采样用os.preadv从偏移0重新读入预分配缓冲区，只解析需要的字段，
+    避免每次采样都重新打开文件、创建对象，适合10Hz级别的高频采样
+    """
+
+    PROC_STAT = "/proc/stat"
+    PROC_MEMINFO = "/proc/meminfo"
+    POWER_SUPPLY_DIR = "/sys/class/power_supply"
+
+    def __init__(self):
+        self._stat_fd = os.open(self.PROC_STAT, os.O_RDONLY)
+        # 缓冲区只需容纳开头的cpu行，后面的intr等行会被截断而不解析
+        self._stat_buf = bytearray(max(4096, ((os.cpu_count() or 1) + 1) * 160))
+        self._meminfo_fd = os.open(self.PROC_MEMINFO, os.O_RDONLY)
+        self._meminfo_buf = bytearray(512)  # MemTotal/MemAvailable位于文件前几行
+        self._battery_fds = self._open_batteries()
+        self._battery_buf = bytearray(16)
+
+        # 上一次的CPU累计时间，用于计算差值
+        self._last_cpu_total = 0
+        self._last_cpu_idle = 0
+        self.get_cpu_percent()
+
+    @staticmethod
+    def is_supported() -> bool:
+        """当前系统是否支持该采样器"""
+        return (sys.platform.startswith("linux")
+                and hasattr(os, "preadv")
+                and os.path.exists(LinuxProcSampler.PROC_STAT))
+
+    def _open_batteries(self) -> List[int]:
+        """打开所有系统电池的capacity文件，忽略鼠标、键盘等外设电池"""
+        fds = []
+        try:
+            names = sorted(os.listdir(self.POWER_SUPPLY_DIR))
+        except OSError:
+            return fds
+
+        for name in names:
+            supply_dir = os.path.join(self.POWER_SUPPLY_DIR, name)
+            if self._read_text(os.path.join(supply_dir, "type")) != "Battery":
+                continue
+            if self._read_text(os.path.join(supply_dir, "scope")) == "Device":
+                continue
+            try:
+                fds.append(os.open(os.path.join(supply_dir, "capacity"), os.O_RDONLY))
+            except OSError:
+                continue
+        return fds
+
+    @staticmethod
+    def _read_text(path: str) -> str:
+        """读取一次性的小文本文件，失败时返回空字符串"""
+        try:
+            with open(path, "r", encoding="ascii") as f:
+                return f.read().strip()
+        except (OSError, UnicodeDecodeError):
+            return ""
+
+    def get_cpu_percent(self) -> float:
+        """获取自上次调用以来的CPU使用率"""
+        buf = self._stat_buf
+        n = os.preadv(self._stat_fd, [buf], 0)
+        end = buf.find(b"\n", 0, n)
+        # 首行格式: cpu  user nice system idle iowait irq softirq steal guest guest_nice
+        fields = buf[4:end].split(None, 8)
+        user, nice, system, idle, iowait, irq, softirq, steal = map(int, fields[:8])
+
+        total = user + nice + system + idle + iowait + irq + softirq + steal
+        idle_all = idle + iowait
+        delta_total = total - self._last_cpu_total
+        delta_idle = idle_all - self._last_cpu_idle
+        self._last_cpu_total = total
+        self._last_cpu_idle = idle_all
+
+        if delta_total <= 0:
+            return 0.0
+        return max(0.0, min(1.0, 1.0 - delta_idle / delta_total))
+
+    def read_core_times(self) -> Tuple[List[int], List[int]]:
+        """读取每个核心的累计总时间和空闲时间，差值由各个使用者自己计算"""
+        buf = self._stat_buf
+        n = os.preadv(self._stat_fd, [buf], 0)
+        lines = buf[:n].split(b"\n")
+
+        totals = []
+        idles = []
+        for line in lines[1:]:
+            if not line.startswith(b"cpu"):
+                break
+            fields = line.split(None, 9)
+            user, nice, system, idle, iowait, irq, softirq, steal = map(int, fields[1:9])
+            totals.append(user + nice + system + idle + iowait + irq + softirq + steal)
+            idles.append(idle + iowait)
+        return totals, idles
+
+    def get_memory_percent(self) -> float:
+        """获取内存使用率，与psutil一致按(总量-可用)/总量计算"""
+        buf = self._meminfo_buf
+        n = os.preadv(self._meminfo_fd, [buf], 0)
+        total = available = 0
+        for line in buf[:n].split(b"\n"):
+            if line.startswith(b"MemTotal:"):
+                total = int(line.split()[1])
+            elif line.startswith(b"MemAvailable:"):
+                available = int(line.split()[1])
+                break
+
+        if total <= 0:
+            return 0.0
+        return (total - available) / total
+
+    def get_battery_percent(self) -> Optional[float]:
+        """获取电池电量，多块电池取平均值，没有电池时返回None"""
+        if not self._battery_fds:
+            return None
+
+        buf = self._battery_buf
+        values = []
+        for fd in self._battery_fds:
+            try:
+                n = os.preadv(fd, [buf], 0)
+                values.append(int(buf[:n]))
+            except (OSError, ValueError):
+                continue
+
+        if not values:
+            return None
+        return sum(values) / len(values) / 100.0
+
+    def close(self):
+        """关闭所有常驻的文件描述符"""
+        for fd in [self._stat_fd, self._meminfo_fd] + self._battery_fds:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._battery_fds = []
@@ -0,0 +1,92 @@
+# memory_profiler.py - 基于tracemalloc的内存快照对比
+import gc
+import time
+import tracemalloc
+from collections import Counter
+from typing import List, Tuple
+import shiboken6
+from PySide6.QtCore import QObject
+from PySide6.QtWidgets import QApplication
+
+
+class MemoryProfiler:
+    """
+    按需开启tracemalloc，拍摄快照并按文件行号对比两次快照之间的内存增长
+    开启后所有内存分配都会变慢，只应在排查泄漏时临时使用
+    """
+
+    MAX_SNAPSHOTS = 10
+
+    def __init__(self):
+        self.snapshots: List[Tuple[str, tracemalloc.Snapshot]] = []
+
+    @staticmethod
+    def is_tracing() -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1):
+        """开始追踪内存分配"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self):
+        """停止追踪并丢弃快照"""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.snapshots.clear()
+
+    def take_snapshot(self) -> str:
+        """拍摄快照，返回快照标签"""
+        if not tracemalloc.is_tracing():
+            self.start()
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        label = f"#{len(self.snapshots) + 1} {time.strftime('%H:%M:%S')}"
+        self.snapshots.append((label, snapshot))
+        if len(self.snapshots) > self.MAX_SNAPSHOTS:
+            self.snapshots.pop(0)
+        return label
+
+    def compare_latest(self, limit: int = 20) -> List[str]:
+        """对比最近两次快照，返回按增长量排序的文件:行号统计"""
+        if len(self.snapshots) < 2:
+            return []
+
+        (old_label, old_snapshot), (new_label, new_snapshot) = self.snapshots[-2:]
+        stats = new_snapshot.compare_to(old_snapshot, "lineno")
+        stats.sort(key=lambda stat: stat.size_diff, reverse=True)
+
+        lines = [f"{old_label} → {new_label}"]
+        for stat in stats[:limit]:
+            if stat.size_diff <= 0:
+                break
+            frame = stat.traceback[0]
+            lines.append(
+                f"{stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+7d} 块  {frame.filename}:{frame.lineno}"
+            )
+        return lines
+
+    @staticmethod
+    def widget_census() -> Counter:
+        """按类型统计存活的Qt控件"""
+        return Counter(type(widget).__name__ for widget in QApplication.allWidgets())
+
+    @staticmethod
+    def python_qobject_census() -> Tuple[Counter, int]:
+        """
+        按类型统计Python侧持有的QObject（包括没有父对象的QThread、worker等）
+        返回存活对象统计，以及C++对象已销毁但Python包装仍被引用的数量
+        """
+        census = Counter()
+        dangling = 0
+        for obj in gc.get_objects():
+            if isinstance(obj, QObject):
+                if shiboken6.isValid(obj):
+                    census[type(obj).__name__] += 1
+                else:
+                    dangling += 1
+        return census, dangling
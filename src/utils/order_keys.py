@@ -0,0 +1,157 @@
+# order_keys.py - 可排序的分数排序键（LexoRank风格）
+from typing import List, Optional
+
+# 按ASCII顺序排列的62进制数字，字符串比较即数值比较
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+SMALLEST_INTEGER = "A" + "0" * 26
+
+# 排序键由“整数部分 + 小数部分”组成：
+# 整数部分首字符表示整数的位数（a-z为正，A-Z为负），在末尾追加时只需整数加一，键长按对数增长；
+# 在两个键之间插入时在小数部分取中点，不需要修改其他记录的键
+
+
+def _integer_length(head: str) -> int:
+    if "a" <= head <= "z":
+        return ord(head) - ord("a") + 2
+    if "A" <= head <= "Z":
+        return ord("Z") - ord(head) + 2
+    raise ValueError(f"无效的排序键: {head}")
+
+
+def _split(key: str):
+    integer = key[:_integer_length(key[0])]
+    return integer, key[len(integer):]
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    """返回严格位于小数a与b之间的小数，b为None表示1"""
+    if b is not None:
+        # 跳过公共前缀
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else "0") == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else len(DIGITS)
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    # 首位相邻时向后一位取中点
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def _increment_integer(integer: str) -> Optional[str]:
+    head, digits = integer[0], list(integer[1:])
+    for i in range(len(digits) - 1, -1, -1):
+        value = DIGITS.index(digits[i]) + 1
+        if value < len(DIGITS):
+            digits[i] = DIGITS[value]
+            return head + "".join(digits)
+        digits[i] = "0"
+    # 进位后位数加一
+    if head == "Z":
+        return "a0"
+    if head == "z":
+        return None
+    head = chr(ord(head) + 1)
+    if head > "a":
+        digits.append("0")
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def _decrement_integer(integer: str) -> Optional[str]:
+    head, digits = integer[0], list(integer[1:])
+    for i in range(len(digits) - 1, -1, -1):
+        value = DIGITS.index(digits[i]) - 1
+        if value >= 0:
+            digits[i] = DIGITS[value]
+            return head + "".join(digits)
+        digits[i] = DIGITS[-1]
+    if head == "a":
+        return "Z" + DIGITS[-1]
+    if head == "A":
+        return None
+    head = chr(ord(head) - 1)
+    if head < "Z":
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def is_valid_key(key) -> bool:
+    """检查是否为合法的排序键"""
+    if not isinstance(key, str) or not key:
+        return False
+    try:
+        integer, fraction = _split(key)
+    except ValueError:
+        return False
+    return (len(integer) == _integer_length(key[0]) and not fraction.endswith("0")
+            and integer != SMALLEST_INTEGER and all(ch in DIGITS for ch in key[1:]))
+
+
+def key_between(a: Optional[str], b: Optional[str]) -> str:
+    """返回排在a与b之间的键，a为None表示最前，b为None表示最后"""
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f"排序键顺序错误: {a} >= {b}")
+
+    if a is None:
+        if b is None:
+            return "a0"
+        integer_b, fraction_b = _split(b)
+        if integer_b == SMALLEST_INTEGER:
+            return integer_b + _midpoint("", fraction_b)
+        if fraction_b:
+            return integer_b
+        result = _decrement_integer(integer_b)
+        if result is None:
+            raise ValueError("排序键已达到下限")
+        return result
+
+    integer_a, fraction_a = _split(a)
+    if b is None:
+        result = _increment_integer(integer_a)
+        return integer_a + _midpoint(fraction_a, None) if result is None else result
+
+    integer_b, fraction_b = _split(b)
+    if integer_a == integer_b:
+        return integer_a + _midpoint(fraction_a, fraction_b)
+    result = _increment_integer(integer_a)
+    if result is None:
+        raise ValueError("排序键已达到上限")
+    if result < b:
+        return result
+    return integer_a + _midpoint(fraction_a, None)
+
+
+def keys_between(a: Optional[str], b: Optional[str], n: int) -> List[str]:
+    """返回a与b之间按顺序排列的n个键，用于批量插入"""
+    if n <= 0:
+        return []
+    if n == 1:
+        return [key_between(a, b)]
+    if b is None:
+        keys = []
+        key = a
+        for _ in range(n):
+            key = key_between(key, None)
+            keys.append(key)
+        return keys
+    if a is None:
+        keys = []
+        key = b
+        for _ in range(n):
+            key = key_between(None, key)
+            keys.append(key)
+        keys.reverse()
+        return keys
+
+    middle = n // 2
+    key = key_between(a, b)
+    return keys_between(a, key, middle) + [key] + keys_between(key, b, n - middle - 1)
@@ -0,0 +1,97 @@
+# partition_cache.py - 已挂载分区列表缓存
+import os
+import select
+import shutil
+import sys
+import time
+from typing import List, NamedTuple, Optional, Tuple
+import psutil
+
+
+class Partition(NamedTuple):
+    device: str
+    mountpoint: str
+    fstype: str
+
+
+class PartitionCache:
+    """
+    缓存已挂载分区列表，只有挂载点变化时才重新枚举
+    Linux下通过poll /proc/self/mounts的POLLPRI事件感知挂载变化，
+    其他系统退化为按固定间隔重新枚举并比较
+    """
+
+    MOUNTS_PATH = "/proc/self/mounts"
+    IGNORED_FSTYPES = {"squashfs", "tmpfs", "devtmpfs", "overlay", ""}
+
+    def __init__(self, fallback_interval: float = 10.0):
+        self.fallback_interval = fallback_interval
+        self.version = 0  # 分区列表每变化一次加1，供界面判断是否需要重建
+        self._partitions: Optional[List[Partition]] = None
+        self._last_scan = 0.0
+        self._mounts_fd = None
+        self._poller = None
+
+        if sys.platform.startswith("linux") and hasattr(select, "poll"):
+            try:
+                self._mounts_fd = os.open(self.MOUNTS_PATH, os.O_RDONLY)
+                self._poller = select.poll()
+                self._poller.register(self._mounts_fd, select.POLLPRI | select.POLLERR)
+            except OSError:
+                self._mounts_fd = None
+                self._poller = None
+
+    def _mounts_changed(self) -> bool:
+        """判断自上次枚举以来挂载点是否可能发生变化"""
+        if self._partitions is None:
+            return True
+        if self._poller is not None:
+            # 挂载表变化时内核会在该文件上触发POLLPRI，poll本身会重置事件
+            return bool(self._poller.poll(0))
+        return time.monotonic() - self._last_scan >= self.fallback_interval
+
+    def _scan(self) -> List[Partition]:
+        """枚举物理分区，过滤掉光驱和伪文件系统"""
+        partitions = []
+        seen = set()
+        for part in psutil.disk_partitions(all=False):
+            if part.fstype in self.IGNORED_FSTYPES or 'cdrom' in part.opts:
+                continue
+            if part.mountpoint in seen:
+                continue
+            seen.add(part.mountpoint)
+            partitions.append(Partition(part.device, part.mountpoint, part.fstype))
+        return partitions
+
+    def get_partitions(self) -> List[Partition]:
+        """获取分区列表，未变化时直接返回缓存"""
+        if self._mounts_changed():
+            partitions = self._scan()
+            self._last_scan = time.monotonic()
+            if partitions != self._partitions:
+                self._partitions = partitions
+                self.version += 1
+        return self._partitions
+
+    def get_usages(self) -> List[Tuple[Partition, float, int]]:
+        """获取每个分区的使用率和剩余GB数，无法访问的分区会被跳过"""
+        usages = []
+        for partition in self.get_partitions():
+            try:
+                usage = shutil.disk_usage(partition.mountpoint)
+            except OSError:
+                continue
+            if usage.total <= 0:
+                continue
+            usages.append((partition, usage.used / usage.total, usage.free // (1024**3)))
+        return usages
+
+    def close(self):
+        """关闭挂载表文件描述符"""
+        if self._mounts_fd is not None:
+            try:
+                os.close(self._mounts_fd)
+            except OSError:
+                pass
+            self._mounts_fd = None
+            self._poller = None
@@ -2,17 +2,51 @@ import psutil
 import shutil
 import platform
 from datetime import datetime
-import wmi
+from src.utils.linux_sampler import LinuxProcSampler
 
 class PerformanceMonitor:
+    _linux_sampler = None
+    _linux_sampler_checked = False
+    
+    @staticmethod
+    def _get_linux_sampler():
+        """获取Linux快速采样器，仅在首次调用时创建，不支持时返回None"""
+        if not PerformanceMonitor._linux_sampler_checked:
+            PerformanceMonitor._linux_sampler_checked = True
+            if LinuxProcSampler.is_supported():
+                try:
+                    PerformanceMonitor._linux_sampler = LinuxProcSampler()
+                except (OSError, ValueError) as e:
+                    print(f"Linux采样器初始化失败，回退到psutil: {e}")
+        return PerformanceMonitor._linux_sampler
+    
     @staticmethod
     def get_cpu_percent() -> float:
         """获取CPU使用率"""
+        sampler = PerformanceMonitor._get_linux_sampler()
+        if sampler:
+            return sampler.get_cpu_percent()
         return psutil.cpu_percent() / 100.0
     
+    @staticmethod
+    def get_per_core_times() -> tuple[list[float], list[float]]:
+        """获取每个核心的累计 (总时间, 空闲时间)，使用率由PerCoreCpuMeter按各自的上次采样计算"""
+        sampler = PerformanceMonitor._get_linux_sampler()
+        if sampler:
+            return sampler.read_core_times()
+        totals = []
+        idles = []
+        for times in psutil.cpu_times(percpu=True):
+            totals.append(sum(times))
+            idles.append(times.idle + getattr(times, "iowait", 0.0))
+        return totals, idles
+    
     @staticmethod
     def get_memory_percent() -> float:
         """获取内存使用率"""
+        sampler = PerformanceMonitor._get_linux_sampler()
+        if sampler:
+            return sampler.get_memory_percent()
         memory = psutil.virtual_memory()
         return memory.percent / 100.0
     
@@ -32,17 +66,18 @@ class PerformanceMonitor:
         
     @staticmethod
     def get_battery_percent() -> float:
-        """获取电池电量"""
-        if platform.system() == "Windows":
-            try:
-                battery = psutil.sensors_battery()
-                if battery:
-                    return battery.percent / 100.0
-                else:
-                    return 1.0 
-            except:
-                return 1.0
-        else:
+        """获取电池电量，没有电池时返回1.0"""
+        sampler = PerformanceMonitor._get_linux_sampler()
+        if sampler:
+            percent = sampler.get_battery_percent()
+            return percent if percent is not None else 1.0
+        try:
+            battery = psutil.sensors_battery()
+            if battery:
+                return battery.percent / 100.0
+            else:
+                return 1.0 
+        except:
             return 1.0
     
     @staticmethod
@@ -78,4 +113,37 @@ class PerformanceMonitor:
         now = datetime.now()
         days_in_year = 366 if now.year % 4 == 0 and (now.year % 100 != 0 or now.year % 400 == 0) else 365
         day_of_year = now.timetuple().tm_yday
-        return (day_of_year - 1 + (now.hour * 3600 + now.minute * 60 + now.second) / (24 * 3600)) / days_in_year
\ No newline at end of file
+        return (day_of_year - 1 + (now.hour * 3600 + now.minute * 60 + now.second) / (24 * 3600)) / days_in_year
+
+
+class PerCoreCpuMeter:
+    """
+    每核心CPU使用率，每个使用者持有自己的上一次采样：
+    多个视图同时刷新时各自的差值都覆盖完整的刷新间隔，互不干扰
+    """
+
+    def __init__(self):
+        self._last_totals, self._last_idles = PerformanceMonitor.get_per_core_times()
+
+    @property
+    def core_count(self) -> int:
+        return len(self._last_totals)
+
+    def sample(self) -> list[float]:
+        """返回自上次sample以来每个核心的使用率"""
+        totals, idles = PerformanceMonitor.get_per_core_times()
+        last_totals, last_idles = self._last_totals, self._last_idles
+        if len(last_totals) != len(totals):
+            # 核心数变化（CPU热插拔）时以0为基准
+            last_totals = [0] * len(totals)
+            last_idles = [0] * len(totals)
+        self._last_totals, self._last_idles = totals, idles
+
+        result = []
+        for total, idle, last_total, last_idle in zip(totals, idles, last_totals, last_idles):
+            delta_total = total - last_total
+            if delta_total <= 0:
+                result.append(0.0)
+            else:
+                result.append(max(0.0, min(1.0, 1.0 - (idle - last_idle) / delta_total)))
+        return result
@@ -0,0 +1,112 @@
+# profiler.py - 可选的热点函数耗时统计
+import atexit
+import functools
+import os
+import threading
+import time
+from array import array
+from typing import Callable, Dict
+from src.configs.base_config import get_profile_hooks
+
+PROFILE_ENV = "SMT2_PROFILE"
+PROFILE_REPORT_FILE = "resources/profile_report.txt"
+
+
+class SlotStats:
+    """单个函数的耗时统计，保留最近的若干次样本用于计算分位数"""
+
+    MAX_SAMPLES = 8192
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self._samples = array('q', bytes(8 * self.MAX_SAMPLES))
+        self._lock = threading.Lock()
+
+    def add(self, elapsed_ns: int):
+        with self._lock:
+            self._samples[self.count % self.MAX_SAMPLES] = elapsed_ns
+            self.count += 1
+            self.total_ns += elapsed_ns
+            if elapsed_ns > self.max_ns:
+                self.max_ns = elapsed_ns
+
+    def percentile(self, ratio: float) -> int:
+        """计算最近样本的分位数（纳秒）"""
+        with self._lock:
+            samples = sorted(self._samples[:min(self.count, self.MAX_SAMPLES)])
+        if not samples:
+            return 0
+        return samples[min(len(samples) - 1, int(len(samples) * ratio))]
+
+
+class HotPathProfiler:
+    """
+    热点函数耗时统计
+    通过环境变量SMT2_PROFILE=1或配置项profile_hooks开启，
+    关闭时profile_slot直接返回原函数，不引入任何额外开销
+    """
+
+    enabled = os.environ.get(PROFILE_ENV, "") not in ("", "0") or get_profile_hooks()
+    _stats: Dict[str, SlotStats] = {}
+
+    @staticmethod
+    def get_stats(name: str) -> SlotStats:
+        stats = HotPathProfiler._stats.get(name)
+        if stats is None:
+            stats = HotPathProfiler._stats.setdefault(name, SlotStats())
+        return stats
+
+    @staticmethod
+    def report() -> str:
+        """生成按总耗时排序的文本报告"""
+        lines = [f"{'函数':<40}{'次数':>8}{'总计ms':>12}{'平均ms':>10}{'p50ms':>10}{'p99ms':>10}{'最大ms':>10}"]
+        items = sorted(HotPathProfiler._stats.items(), key=lambda x: x[1].total_ns, reverse=True)
+        for name, stats in items:
+            if not stats.count:
+                continue
+            lines.append(
+                f"{name:<40}{stats.count:>8}"
+                f"{stats.total_ns / 1e6:>12.2f}"
+                f"{stats.total_ns / stats.count / 1e6:>10.3f}"
+                f"{stats.percentile(0.5) / 1e6:>10.3f}"
+                f"{stats.percentile(0.99) / 1e6:>10.3f}"
+                f"{stats.max_ns / 1e6:>10.3f}"
+            )
+        return "\n".join(lines)
+
+    @staticmethod
+    def dump(path: str = PROFILE_REPORT_FILE) -> str:
+        """输出报告到控制台并保存到文件，返回文件路径"""
+        report = HotPathProfiler.report()
+        print(report)
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(report + "\n")
+        except OSError as e:
+            print(f"保存性能分析报告出错: {e}")
+        return path
+
+
+def profile_slot(func: Callable) -> Callable:
+    """统计被装饰函数的耗时，未开启统计时原样返回"""
+    if not HotPathProfiler.enabled:
+        return func
+
+    stats = HotPathProfiler.get_stats(func.__qualname__)
+    perf_counter_ns = time.perf_counter_ns
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats.add(perf_counter_ns() - start)
+
+    return wrapper
+
+
+if HotPathProfiler.enabled:
+    atexit.register(HotPathProfiler.dump)
@@ -0,0 +1,64 @@
+# sample_ring.py - 基于array的二维环形采样缓冲区
+from array import array
+from typing import Iterator, List, Sequence
+
+
+class CoreSampleRing:
+    """
+    按核心保存历史采样的二维环形缓冲区
+    底层是一块连续的array('f')，每次采样占用一列（core_count个值），写满后覆盖最旧的一列
+    """
+
+    def __init__(self, core_count: int, capacity: int):
+        self.core_count = max(1, core_count)
+        self.capacity = max(1, capacity)
+        self._data = array('f', bytes(4 * self.core_count * self.capacity))
+        self._head = 0  # 下一次写入的列
+        self._size = 0  # 已写入的列数
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, values: Sequence[float]):
+        """追加一次采样，多余的核心被截断，不足的核心补0"""
+        count = self.core_count
+        if len(values) != count:
+            values = (list(values) + [0.0] * count)[:count]
+        offset = self._head * count
+        self._data[offset:offset + count] = array('f', values)
+        self._head = (self._head + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def _column_offset(self, index: int) -> int:
+        """第index个有效列（0为最旧）在底层数组中的偏移"""
+        start = (self._head - self._size) % self.capacity
+        return ((start + index) % self.capacity) * self.core_count
+
+    def column(self, index: int) -> List[float]:
+        """获取第index次采样（0为最旧）的所有核心数据"""
+        if not 0 <= index < self._size:
+            raise IndexError("采样索引超出范围")
+        offset = self._column_offset(index)
+        return self._data[offset:offset + self.core_count].tolist()
+
+    def latest(self) -> List[float]:
+        """获取最近一次采样，没有数据时返回全0"""
+        if not self._size:
+            return [0.0] * self.core_count
+        return self.column(self._size - 1)
+
+    def iter_columns(self) -> Iterator[List[float]]:
+        """从旧到新遍历所有采样"""
+        for index in range(self._size):
+            yield self.column(index)
+
+    def core_history(self, core: int) -> List[float]:
+        """获取单个核心从旧到新的历史数据"""
+        data = self._data
+        return [data[self._column_offset(index) + core] for index in range(self._size)]
+
+    def clear(self):
+        """清空所有采样"""
+        self._head = 0
+        self._size = 0
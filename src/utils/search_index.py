@@ -0,0 +1,162 @@
+# search_index.py - 待办事项全文搜索的倒排索引
+import re
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 中日韩字符按单字和相邻二元组建索引，无需分词；英文和数字按单词建索引，查询时按单词前缀匹配
+_CJK_RUN = re.compile(r"[぀-ヿ㐀-䶿一-鿿豈-﫿가-힯]+")
+_WORD = re.compile(r"[a-z0-9_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """把文本拆成索引项（已转小写、去重）"""
+    text = text.lower()
+    terms = set(_WORD.findall(text))
+    for run in _CJK_RUN.findall(text):
+        terms.update(run)
+        terms.update(run[i:i + 2] for i in range(len(run) - 1))
+    return list(terms)
+
+
+def _intersect(a: array, b: array) -> array:
+    """求两个有序数组的交集，长度相差很大时用二分查找，否则用集合求交"""
+    if len(a) > len(b):
+        a, b = b, a
+    if len(a) * 32 < len(b):
+        result = array("I")
+        n = len(b)
+        lo = 0
+        for value in a:
+            lo = bisect_left(b, value, lo)
+            if lo == n:
+                break
+            if b[lo] == value:
+                result.append(value)
+        return result
+    return array("I", sorted(set(a).intersection(b)))
+
+
+class SearchIndex:
+    """
+    增量维护的倒排索引，倒排表是按文档编号递增的array('I')
+    文档编号只增不减：新增和修改都分配新编号追加到倒排表末尾，无需重新排序；
+    删除只做标记，查询时跳过，删除过多时整体重建
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, array] = {}
+        self._texts: List[Optional[str]] = []  # 文档编号 -> 小写文本，已删除为None
+        self._keys: List[Optional[str]] = []  # 文档编号 -> 外部key
+        self._numbers: Dict[str, int] = {}  # 外部key -> 文档编号
+        self._vocabulary: Optional[List[str]] = None  # 英文单词有序表，用于前缀匹配
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def clear(self):
+        self.__init__()
+
+    def add(self, key: str, text: str):
+        """添加或更新文档"""
+        if key in self._numbers:
+            self.remove(key)
+        number = len(self._texts)
+        self._texts.append(text.lower())
+        self._keys.append(key)
+        self._numbers[key] = number
+        for term in tokenize(text):
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = array("I")
+                self._vocabulary = None
+            postings.append(number)
+
+    def add_many(self, items: Iterable[Tuple[str, str]]):
+        for key, text in items:
+            self.add(key, text)
+
+    def remove(self, key: str):
+        number = self._numbers.pop(key, None)
+        if number is None:
+            return
+        self._texts[number] = None
+        self._keys[number] = None
+        # 已删除的编号超过一半时重建，避免倒排表中堆积无效编号
+        if len(self._texts) > 1024 and len(self._numbers) * 2 < len(self._texts):
+            self._rebuild()
+
+    def _rebuild(self):
+        items = [(key, text) for key, text in zip(self._keys, self._texts) if key is not None]
+        self.clear()
+        self.add_many(items)
+
+    def _word_postings(self, word: str) -> Optional[array]:
+        """英文单词按前缀匹配，合并所有以该前缀开头的单词的倒排表"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(term for term in self._postings if _WORD.fullmatch(term))
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, word)
+        matched = []
+        for i in range(start, len(vocabulary)):
+            if not vocabulary[i].startswith(word):
+                break
+            matched.append(self._postings[vocabulary[i]])
+        if not matched:
+            return None
+        if len(matched) == 1:
+            return matched[0]
+        return array("I", sorted(set().union(*matched)))
+
+    def _candidates(self, part: str) -> Optional[array]:
+        """返回可能包含part的文档编号，part中没有可索引的内容时返回None"""
+        lists = []
+        for word in _WORD.findall(part):
+            postings = self._word_postings(word)
+            if postings is None:
+                return array("I")
+            lists.append(postings)
+        for run in _CJK_RUN.findall(part):
+            terms = [run[i:i + 2] for i in range(len(run) - 1)] or [run]
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    return array("I")
+                lists.append(postings)
+        if not lists:
+            return None
+
+        lists.sort(key=len)
+        result = lists[0]
+        for postings in lists[1:]:
+            result = _intersect(result, postings)
+            if not result:
+                break
+        return result
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """返回包含查询中所有词的文档key，最新添加的在前"""
+        parts = query.lower().split()
+        if not parts:
+            return []
+
+        candidates = None
+        for part in parts:
+            part_candidates = self._candidates(part)
+            if part_candidates is None:
+                continue
+            candidates = part_candidates if candidates is None else _intersect(candidates, part_candidates)
+        if candidates is None:
+            # 查询中只有标点等无法索引的字符，逐条比较
+            candidates = range(len(self._texts))
+
+        # 倒排索引只保证包含各个索引项，最后按原文确认子串匹配
+        results = []
+        texts = self._texts
+        for number in reversed(candidates):
+            text = texts[number]
+            if text is not None and all(part in text for part in parts):
+                results.append(self._keys[number])
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
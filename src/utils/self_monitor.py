@@ -0,0 +1,122 @@
+# self_monitor.py - 统计SMT2自身的资源占用
+import os
+import threading
+import time
+import weakref
+from collections import Counter
+import psutil
+import shiboken6
+from PySide6.QtCore import QObject, QEvent, QCoreApplication
+from PySide6.QtWidgets import QApplication
+
+
+# 没有父对象的非控件对象（如标签提取线程和worker）不在任何控件树中，需要登记后才会被统计
+_census_roots = weakref.WeakSet()
+
+
+class SelfMonitor(QObject):
+    """
+    统计本进程的CPU时间、RSS、线程数、存活的Qt对象数量以及定时器唤醒频率
+    定时器唤醒通过应用级事件过滤器计数，每个事件都会多一次Python调用，
+    因此只在需要展示时调用start_timer_counting开启
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.process = psutil.Process()
+        self._timer_events = 0
+        self._counting = False
+        self._last_cpu_time = self._get_cpu_time()
+        self._last_sample_time = time.monotonic()
+
+    @staticmethod
+    def _get_cpu_time() -> float:
+        """本进程累计的用户态+内核态CPU时间（秒）"""
+        times = os.times()
+        return times.user + times.system
+
+    def reset_baseline(self):
+        """以当前时刻作为下一次采样的基准，避免把暂停统计的时间算进频率里"""
+        self._timer_events = 0
+        self._last_cpu_time = self._get_cpu_time()
+        self._last_sample_time = time.monotonic()
+
+    def start_timer_counting(self):
+        """开始统计定时器唤醒次数，同时重置采样基准"""
+        app = QCoreApplication.instance()
+        if app and not self._counting:
+            app.installEventFilter(self)
+            self._counting = True
+        self.reset_baseline()
+
+    def stop_timer_counting(self):
+        """停止统计定时器唤醒次数"""
+        app = QCoreApplication.instance()
+        if app and self._counting:
+            app.removeEventFilter(self)
+            self._counting = False
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Timer:
+            self._timer_events += 1
+        return False
+
+    @staticmethod
+    def register_root(obj: QObject):
+        """登记没有父对象的非控件对象，统计时连同其子对象一起计入；只保存弱引用"""
+        _census_roots.add(obj)
+
+    @staticmethod
+    def qobject_census() -> Counter:
+        """
+        统计存活的Qt对象数量（按类名），遍历顶层控件、QApplication和register_root登记的对象
+        已deleteLater但尚未销毁的对象也会被计入
+        """
+        census = Counter()
+        seen = set()
+        roots = list(QApplication.topLevelWidgets())
+        app = QCoreApplication.instance()
+        if app:
+            roots.append(app)
+        roots += [obj for obj in list(_census_roots) if shiboken6.isValid(obj)]
+
+        for root in roots:
+            for obj in [root] + root.findChildren(QObject):
+                key = id(obj)
+                if key in seen:
+                    continue
+                seen.add(key)
+                census[type(obj).__name__] += 1
+        return census
+
+    def sample(self, include_qobjects: bool = True) -> dict:
+        """采样一次自身开销，Qt对象统计需要遍历整棵对象树，include_qobjects为False时不统计"""
+        now = time.monotonic()
+        cpu_time = self._get_cpu_time()
+        elapsed = max(now - self._last_sample_time, 1e-6)
+        cpu_percent = (cpu_time - self._last_cpu_time) / elapsed
+        timer_wakeups = self._timer_events / elapsed if self._counting else None
+
+        self._last_cpu_time = cpu_time
+        self._last_sample_time = now
+        self._timer_events = 0
+
+        try:
+            rss = self.process.memory_info().rss
+            os_threads = self.process.num_threads()
+        except psutil.Error:
+            rss = 0
+            os_threads = 0
+
+        sample = {
+            "timestamp": time.time(),
+            "cpu_time": cpu_time,
+            "cpu_percent": cpu_percent,
+            "rss": rss,
+            "os_threads": os_threads,
+            "python_threads": threading.active_count(),
+            "timer_wakeups_per_second": timer_wakeups,
+        }
+        if include_qobjects:
+            sample["qobjects"] = dict(self.qobject_census().most_common())
+        return sample
@@ -0,0 +1,195 @@
+# single_instance.py - 单实例运行：后启动的进程把命令转发给已运行的实例后退出
+# 本模块不导入Qt，转发命令时不需要加载界面
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import stat
+import sys
+import tempfile
+import threading
+from multiprocessing.connection import Client, Listener
+from typing import Callable, List, Optional
+from src.configs.base_config import get_todo_file_name
+
+COMMANDS = ("show", "toggle-performance", "add")
+MAX_MESSAGE_SIZE = 64 * 1024
+RECEIVE_TIMEOUT = 2.0  # 连接后迟迟不发送命令的客户端在超时后断开
+USAGE = "用法: main.py [show | toggle-performance | add 文本]"
+
+
+def parse_command(args: List[str]) -> Optional[dict]:
+    """
+    解析命令行参数，只忽略命令之前以-开头的Qt参数，add之后的文本原样保留（开头的--除外）
+    没有命令时为show，无法识别时返回None
+    """
+    words = list(args)
+    while words and words[0].startswith("-"):
+        words.pop(0)
+    if not words:
+        return {"command": "show"}
+    name, rest = words[0], words[1:]
+    if name not in COMMANDS:
+        return None
+    if name == "add":
+        if rest[:1] == ["--"]:
+            rest = rest[1:]
+        text = " ".join(rest).strip()
+        return {"command": "add", "text": text} if text else None
+    return {"command": name}
+
+
+def _runtime_dir() -> str:
+    """
+    只有当前用户能访问的目录，存放套接字和密钥：优先使用XDG_RUNTIME_DIR，
+    否则在临时目录下创建0700的子目录；目录不属于当前用户或权限过宽时拒绝使用
+    """
+    if sys.platform == "win32":
+        path = os.path.join(os.environ.get("LOCALAPPDATA") or tempfile.gettempdir(), "smt2")
+        os.makedirs(path, exist_ok=True)
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        path = os.path.join(runtime_dir, "smt2")
+    else:
+        path = os.path.join(tempfile.gettempdir(), f"smt2-{os.getuid()}")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"目录不属于当前用户或权限过宽: {path}")
+    return path
+
+
+def _paths():
+    """返回 (监听地址, 密钥文件路径)，按todo文件的绝对路径区分实例，使用同一个todos.json的进程只能有一个"""
+    key = hashlib.blake2b(os.path.abspath(get_todo_file_name()).encode("utf-8"), digest_size=8).hexdigest()
+    directory = _runtime_dir()
+    secret_path = os.path.join(directory, f"{key}.key")
+    if sys.platform == "win32":
+        return rf"\\.\pipe\smt2-{key}", secret_path
+    return os.path.join(directory, f"{key}.sock"), secret_path
+
+
+def _read_secret(path: str, create: bool = False) -> Optional[str]:
+    """读取随机密钥，create为True时不存在则以0600权限创建；转发的命令必须带上该密钥"""
+    try:
+        with open(path, "r", encoding="ascii") as f:
+            secret = f.read().strip()
+        if secret:
+            return secret
+    except FileNotFoundError:
+        pass
+    if not create:
+        return None
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return _read_secret(path)
+    with os.fdopen(fd, "w", encoding="ascii") as f:
+        f.write(secrets.token_hex(32))
+    return _read_secret(path)
+
+
+def _is_listening(address: str) -> bool:
+    try:
+        Client(address).close()
+        return True
+    except OSError:
+        return False
+
+
+def forward_command(command: dict, timeout: float = 2.0) -> bool:
+    """把命令发给已运行的实例，成功送达返回True；没有运行中的实例时返回False"""
+    try:
+        address, secret_path = _paths()
+        secret = _read_secret(secret_path)
+    except OSError:
+        return False
+    if secret is None:
+        return False
+    try:
+        connection = Client(address)
+    except OSError:
+        return False
+    try:
+        # 只传JSON字节，不用pickle
+        message = dict(command, secret=secret)
+        connection.send_bytes(json.dumps(message, ensure_ascii=False).encode("utf-8"))
+        return connection.poll(timeout) and connection.recv_bytes(16) == b"ok"
+    except (OSError, EOFError):
+        return False
+    finally:
+        connection.close()
+
+
+class InstanceListener:
+    """在后台线程中接收转发的命令，回调在连接线程中执行，需要由调用方转到GUI线程"""
+
+    def __init__(self, listener: Listener, secret: str):
+        self._listener = listener
+        self._secret = secret
+        self._thread = None
+
+    @staticmethod
+    def acquire() -> Optional["InstanceListener"]:
+        """成为运行中的实例；已有实例在运行或无法监听时返回None"""
+        try:
+            address, secret_path = _paths()
+            secret = _read_secret(secret_path, create=True)
+        except OSError as e:
+            print(f"单实例监听失败: {e}")
+            return None
+        try:
+            listener = Listener(address)
+        except OSError:
+            # 套接字文件可能是上次异常退出留下的，确认无人监听后删除重试；目录只有当前用户可写
+            if sys.platform == "win32" or _is_listening(address):
+                return None
+            try:
+                os.remove(address)
+                listener = Listener(address)
+            except OSError as e:
+                print(f"单实例监听失败: {e}")
+                return None
+        return InstanceListener(listener, secret)
+
+    def start(self, callback: Callable[[dict], None]):
+        self._thread = threading.Thread(target=self._serve, args=(callback,), name="InstanceListener", daemon=True)
+        self._thread.start()
+
+    def _serve(self, callback):
+        while True:
+            listener = self._listener
+            if listener is None:
+                return
+            try:
+                connection = listener.accept()
+            except OSError:
+                continue
+            # 每个连接在单独的线程中接收，不发送命令的客户端不会阻塞后续连接
+            threading.Thread(target=self._handle, args=(connection, callback), daemon=True).start()
+
+    def _handle(self, connection, callback):
+        try:
+            if not connection.poll(RECEIVE_TIMEOUT):
+                return
+            command = json.loads(connection.recv_bytes(MAX_MESSAGE_SIZE).decode("utf-8"))
+            secret = str(command.pop("secret", "")) if isinstance(command, dict) else ""
+            if not hmac.compare_digest(secret.encode("utf-8"), self._secret.encode("utf-8")):
+                connection.send_bytes(b"denied")
+                return
+            if command.get("command") in COMMANDS:
+                callback(command)
+            connection.send_bytes(b"ok")
+        except EOFError:
+            pass  # 只检查是否有实例在监听的连接
+        except (OSError, ValueError) as e:
+            print(f"处理转发的命令失败: {e}")
+        finally:
+            connection.close()
+
+    def close(self):
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.close()
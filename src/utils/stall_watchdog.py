@@ -0,0 +1,87 @@
+# stall_watchdog.py - 事件循环卡顿看门狗
+import logging
+import sys
+import threading
+import time
+import traceback
+from logging.handlers import RotatingFileHandler
+from PySide6.QtCore import QObject, QTimer
+
+STALL_LOG_FILE = "resources/stall.log"
+
+
+class StallWatchdog(QObject):
+    """
+    主线程通过定时器定期心跳，看门狗线程检查心跳是否超时
+    超时后通过sys._current_frames抓取主线程的Python堆栈，
+    卡顿结束后记录持续时间，均写入滚动日志
+    """
+
+    def __init__(self, threshold_ms: int, log_path: str = STALL_LOG_FILE):
+        super().__init__()
+        self.threshold = threshold_ms / 1000
+        self._main_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        # 心跳间隔取阈值的1/4：0间隔的定时器会在每次空闲时触发，使GUI线程一直忙碌
+        self.heartbeat_timer = QTimer(self)
+        self.heartbeat_timer.setInterval(max(20, threshold_ms // 4))
+        self.heartbeat_timer.timeout.connect(self._beat)
+
+        self.logger = logging.getLogger("smt2.stall")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        if not self.logger.handlers:
+            try:
+                handler = RotatingFileHandler(log_path, maxBytes=512 * 1024, backupCount=3, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+                self.logger.addHandler(handler)
+            except OSError as e:
+                print(f"无法创建卡顿日志: {e}")
+
+    def start(self):
+        """开始监测，需在主线程中调用"""
+        self._main_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop_event.clear()
+        self.heartbeat_timer.start()
+        self._thread = threading.Thread(target=self._watch, name="StallWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止监测"""
+        self.heartbeat_timer.stop()
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _beat(self):
+        self._last_beat = time.monotonic()
+
+    def _capture_main_stack(self) -> str:
+        """抓取主线程当前的Python堆栈"""
+        frame = sys._current_frames().get(self._main_thread_id)
+        if frame is None:
+            return "<无法获取主线程堆栈>\n"
+        return "".join(traceback.format_stack(frame))
+
+    def _watch(self):
+        check_interval = self.threshold / 4
+        stall_start = None
+
+        while not self._stop_event.wait(check_interval):
+            last_beat = self._last_beat
+            lag = time.monotonic() - last_beat
+
+            if lag > self.threshold:
+                if stall_start is None:
+                    stall_start = last_beat
+                    self.logger.warning(
+                        f"检测到主线程卡顿，已超过 {lag * 1000:.0f} ms，主线程堆栈:\n{self._capture_main_stack()}"
+                    )
+            elif stall_start is not None:
+                self.logger.warning(f"主线程卡顿结束，持续约 {(last_beat - stall_start) * 1000:.0f} ms")
+                stall_start = None
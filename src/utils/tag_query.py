@@ -0,0 +1,150 @@
+# tag_query.py - 基于位集合的标签布尔查询
+import re
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+# 查询语法：[标签] 或不含空白的标签名，AND/&、OR/|、NOT/!/-，括号；相邻的项按AND处理
+_TOKEN_PATTERN = re.compile(r"\[([^\]]+)\]|(\()|(\))|(&&?|\|\|?|!|-(?=\S))|([^\s()\[\]&|!]+)")
+_KEYWORDS = {"and": "&", "or": "|", "not": "!"}
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        if text[position:match.start()].strip():
+            raise ValueError(f"无法解析: {text[position:match.start()]}")
+        position = match.end()
+        bracket_tag, left, right, operator, word = match.groups()
+        if bracket_tag is not None:
+            tokens.append(("tag", bracket_tag.strip()))
+        elif left or right:
+            tokens.append((left or right, ""))
+        elif operator:
+            tokens.append((operator[0].replace("-", "!"), ""))
+        elif word.lower() in _KEYWORDS:
+            tokens.append((_KEYWORDS[word.lower()], ""))
+        else:
+            tokens.append(("tag", word))
+    if text[position:].strip():
+        raise ValueError(f"无法解析: {text[position:]}")
+    return tokens
+
+
+def parse_tag_query(text: str) -> tuple:
+    """
+    把查询解析为语法树：("tag", 名称) / ("not", 子树) / ("and", 左, 右) / ("or", 左, 右)
+    优先级 NOT > AND > OR，语法错误时抛出ValueError
+    """
+    tokens = _tokenize(text)
+    if not tokens:
+        raise ValueError("查询为空")
+    position = 0
+
+    def peek():
+        return tokens[position][0] if position < len(tokens) else None
+
+    def take(kind):
+        nonlocal position
+        if peek() != kind:
+            raise ValueError(f"查询语法错误，缺少 {kind}")
+        token = tokens[position]
+        position += 1
+        return token
+
+    def parse_or():
+        node = parse_and()
+        while peek() == "|":
+            take("|")
+            node = ("or", node, parse_and())
+        return node
+
+    def parse_and():
+        node = parse_not()
+        while peek() in ("&", "!", "tag", "("):
+            if peek() == "&":
+                take("&")
+            node = ("and", node, parse_not())
+        return node
+
+    def parse_not():
+        if peek() == "!":
+            take("!")
+            return ("not", parse_not())
+        if peek() == "(":
+            take("(")
+            node = parse_or()
+            take(")")
+            return node
+        return take("tag")
+
+    tree = parse_or()
+    if position != len(tokens):
+        raise ValueError("查询语法错误，多余的内容")
+    return tree
+
+
+class TagBitsetIndex:
+    """
+    按记录顺序为每条记录分配密集编号，每个标签对应一个Python int位集合（第i位表示第i条记录）
+    布尔查询只做整数的位运算，复杂度为O(N/64)；位集合在首次查询某个标签时才由位置列表生成
+    """
+
+    def __init__(self, ids: Sequence[str], tag_lists: Iterable[Iterable[str]]):
+        self.ids = list(ids)
+        self.size = len(self.ids)
+        self.all_mask = (1 << self.size) - 1
+        self._positions: Dict[str, List[int]] = {}
+        for position, tags in enumerate(tag_lists):
+            for tag in tags:
+                self._positions.setdefault(tag, []).append(position)
+        self._bitsets: Dict[str, int] = {}
+        self._position_of = None
+
+    def _from_positions(self, positions: Iterable[int]) -> int:
+        data = bytearray((self.size + 7) // 8)
+        for position in positions:
+            data[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(data, "little")
+
+    def bitset(self, tag: str) -> int:
+        bitset = self._bitsets.get(tag)
+        if bitset is None:
+            bitset = self._bitsets[tag] = self._from_positions(self._positions.get(tag, ()))
+        return bitset
+
+    def mask_of(self, ids: Iterable[str]) -> int:
+        """把一组记录id转换为位集合"""
+        if self._position_of is None:
+            self._position_of = {todo_id: position for position, todo_id in enumerate(self.ids)}
+        position_of = self._position_of
+        return self._from_positions(position_of[todo_id] for todo_id in ids if todo_id in position_of)
+
+    def select(self, include: Iterable[str], exclude: Iterable[str], match_all: bool) -> int:
+        """标签按钮的筛选：包含全部(AND)或任一(OR)选中标签，且不含任何排除的标签"""
+        include = list(include)
+        if include:
+            mask = self.all_mask if match_all else 0
+            for tag in include:
+                mask = mask & self.bitset(tag) if match_all else mask | self.bitset(tag)
+        else:
+            mask = self.all_mask
+        for tag in exclude:
+            mask &= ~self.bitset(tag)
+        return mask
+
+    def evaluate(self, tree: tuple) -> int:
+        """计算查询语法树对应的位集合"""
+        kind = tree[0]
+        if kind == "tag":
+            return self.bitset(tree[1])
+        if kind == "not":
+            return self.all_mask & ~self.evaluate(tree[1])
+        if kind == "and":
+            return self.evaluate(tree[1]) & self.evaluate(tree[2])
+        return self.evaluate(tree[1]) | self.evaluate(tree[2])
+
+    def iter_bits(self, mask: int) -> Iterator[bool]:
+        """按记录顺序逐位输出，先整体转为字节避免对大整数反复移位"""
+        data = (mask & self.all_mask).to_bytes((self.size + 7) // 8, "little")
+        for position in range(self.size):
+            yield bool(data[position >> 3] >> (position & 7) & 1)
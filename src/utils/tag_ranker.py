@@ -0,0 +1,65 @@
+# tag_ranker.py - 增量维护的TF-IDF标签排序
+import math
+from collections import Counter
+from typing import Dict, List, Mapping
+
+
+class TfidfTagRanker:
+    """
+    以记录id为key保存每条事项的词频，增删改时只更新该记录对文档频率(df)和总词频的贡献，
+    单条事项的标签和全局标签栏都按TF-IDF排序，不需要重新扫描全部事项
+    """
+
+    def __init__(self):
+        self._documents: Dict[str, Counter] = {}  # 记录id -> 词频
+        self._document_freq = Counter()  # 标签 -> 包含该标签的事项数
+        self._term_total = Counter()  # 标签 -> 所有事项中的总词频
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def clear(self):
+        self._documents.clear()
+        self._document_freq.clear()
+        self._term_total.clear()
+
+    def set_document(self, key: str, term_counts: Mapping[str, int]):
+        """添加或替换一条事项的词频"""
+        self.remove_document(key)
+        if not term_counts:
+            return
+        counts = Counter(term_counts)
+        self._documents[key] = counts
+        self._document_freq.update(counts.keys())
+        self._term_total.update(counts)
+
+    def remove_document(self, key: str):
+        counts = self._documents.pop(key, None)
+        if counts is None:
+            return
+        self._document_freq.subtract(counts.keys())
+        self._term_total.subtract(counts)
+        for term in counts:
+            if self._document_freq[term] <= 0:
+                del self._document_freq[term]
+                del self._term_total[term]
+
+    def idf(self, term: str) -> float:
+        """平滑的逆文档频率，所有事项都包含的标签权重最低"""
+        return math.log((1 + len(self._documents)) / (1 + self._document_freq.get(term, 0))) + 1
+
+    def rank_document(self, key: str, limit: int = 10) -> List[str]:
+        """按TF-IDF返回一条事项的标签"""
+        counts = self._documents.get(key)
+        if not counts:
+            return []
+        ranked = sorted(counts, key=lambda term: (-counts[term] * self.idf(term), term))
+        return ranked[:limit]
+
+    def rank_corpus(self) -> List[str]:
+        """按所有事项中TF-IDF之和（总词频 × idf）对标签排序，用于标签栏"""
+        scores = {term: total * self.idf(term) for term, total in self._term_total.items()}
+        return sorted(scores, key=lambda term: (-scores[term], term))
+
+    def tags(self) -> set:
+        return set(self._document_freq)
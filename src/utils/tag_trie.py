@@ -0,0 +1,96 @@
+# tag_trie.py - 标签自动补全用的前缀树
+from typing import Dict, List, Optional, Tuple
+
+
+class _TrieNode:
+    __slots__ = ("children", "tag", "count", "top", "dirty")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.tag: Optional[str] = None  # 以该节点结尾的标签（保留原始大小写）
+        self.count = 0
+        self.top: List[Tuple[int, str]] = []  # 子树中出现次数最多的K个标签 (次数, 标签)
+        self.dirty = False  # top需要由子节点重新合并
+
+
+class TagTrie:
+    """
+    按小写字符建立的前缀树，每个节点缓存子树中出现次数最多的K个标签，
+    补全时只需走到前缀对应的节点直接返回缓存，与标签总数无关
+    计数增加时沿路径就地更新缓存；计数减少可能使其他标签进入前K，只把路径上的缓存标记为失效，
+    下次查询该节点时再由子节点合并
+    """
+
+    def __init__(self, top_k: int = 10):
+        self.top_k = top_k
+        self._root = _TrieNode()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self):
+        self._root = _TrieNode()
+        self._size = 0
+
+    def add(self, tag: str, delta: int = 1):
+        """增加（delta为负时减少）标签的出现次数"""
+        key = tag.lower()
+        if not key:
+            return
+        path = [self._root]
+        node = self._root
+        for ch in key:
+            child = node.children.get(ch)
+            if child is None:
+                if delta <= 0:
+                    return
+                child = node.children[ch] = _TrieNode()
+            node = child
+            path.append(node)
+
+        old_count = node.count
+        node.count = max(0, old_count + delta)
+        if node.tag is None or node.count == 0 or old_count == 0:
+            node.tag = tag if node.count else None
+        if old_count == 0 and node.count:
+            self._size += 1
+        elif old_count and node.count == 0:
+            self._size -= 1
+
+        display = node.tag or tag
+        for path_node in path:
+            if node.count > old_count:
+                self._promote(path_node, key, display, node.count)
+            elif any(entry[1].lower() == key for entry in path_node.top):
+                path_node.dirty = True
+
+    def _promote(self, node: _TrieNode, key: str, tag: str, count: int):
+        """计数增加时更新节点缓存"""
+        if node.dirty:
+            return  # 查询时会整体重算
+        top = [entry for entry in node.top if entry[1].lower() != key]
+        if len(top) < self.top_k or (-count, tag) < (-top[-1][0], top[-1][1]):
+            top.append((count, tag))
+            top.sort(key=lambda entry: (-entry[0], entry[1]))
+            del top[self.top_k:]
+        node.top = top
+
+    def _refresh(self, node: _TrieNode) -> List[Tuple[int, str]]:
+        if node.dirty:
+            entries = [(node.count, node.tag)] if node.count else []
+            for child in node.children.values():
+                entries.extend(self._refresh(child))
+            entries.sort(key=lambda entry: (-entry[0], entry[1]))
+            node.top = entries[:self.top_k]
+            node.dirty = False
+        return node.top
+
+    def complete(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """返回以prefix开头、出现次数最多的标签"""
+        node = self._root
+        for ch in prefix.lower():
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return [tag for _, tag in self._refresh(node)[:limit or self.top_k]]
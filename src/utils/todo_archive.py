@@ -0,0 +1,145 @@
+# todo_archive.py - 已完成待办事项的归档
+import json
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+from src.configs.base_config import get_todo_file_name
+from src.utils.file_lock import file_lock
+
+INDEX_FILE = "index.json"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+def default_archive_dir() -> str:
+    """归档目录放在待办事项文件旁边"""
+    return os.path.join(os.path.dirname(get_todo_file_name()) or ".", "archive")
+
+
+class TodoArchive:
+    """
+    已完成事项按完成月份追加到分段文件（如 2026-10.jsonl），index.json只记录各分段的条数和时间范围
+    打开归档界面时只读索引，选中某个分段时才读取该分段，待办列表本身保持精简
+    """
+
+    MAX_CACHED_SEGMENTS = 4
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or default_archive_dir()
+        self._index: Optional[Dict[str, dict]] = None  # 分段名 -> {count, first, last}
+        self._segment_cache: Dict[str, List[dict]] = {}
+
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def _segment_path(self, name: str) -> str:
+        return os.path.join(self.directory, name + SEGMENT_SUFFIX)
+
+    def _load_index(self) -> Dict[str, dict]:
+        if self._index is None:
+            try:
+                with open(self._index_path(), "r", encoding="utf-8") as f:
+                    self._index = {segment["name"]: segment for segment in json.load(f)["segments"]}
+            except FileNotFoundError:
+                self._index = self._rebuild_index()
+            except (ValueError, KeyError) as e:
+                print(f"归档索引损坏，重新生成: {e}")
+                self._index = self._rebuild_index()
+        return self._index
+
+    def _rebuild_index(self) -> Dict[str, dict]:
+        """索引丢失时扫描分段文件重新生成"""
+        index = {}
+        if not os.path.isdir(self.directory):
+            return index
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(SEGMENT_SUFFIX):
+                name = file_name[:-len(SEGMENT_SUFFIX)]
+                items = self._read_segment(name)
+                if items:
+                    times = [item.get("completed_at", 0) for item in items]
+                    index[name] = {"name": name, "count": len(items), "first": min(times), "last": max(times)}
+        if index:
+            self._index = index
+            self._save_index()
+        return index
+
+    def _save_index(self):
+        segments = sorted(self._index.values(), key=lambda segment: segment["name"])
+        temp_path = self._index_path() + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"segments": segments}, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self._index_path())
+
+    def _read_segment(self, name: str) -> List[dict]:
+        items = []
+        try:
+            with open(self._segment_path(name), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        items.append(json.loads(line))
+                    except ValueError:
+                        continue  # 写到一半的行
+        except FileNotFoundError:
+            pass
+        return items
+
+    def append(self, records: Iterable) -> int:
+        """把已完成的记录追加到当前月份的分段，返回归档条数"""
+        now = time.time()
+        name = time.strftime("%Y-%m", time.localtime(now))
+        lines = []
+        for record in records:
+            item = {
+                "id": record.id,
+                "text": record.text,
+                "created_at": record.created_at,
+                "completed_at": now,
+            }
+            if record.tags is not None:
+                item["tags"] = list(record.tags)
+            lines.append(json.dumps(item, ensure_ascii=False))
+        if not lines:
+            return 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        with file_lock(self._index_path()):
+            # 其他进程可能也在归档，持有锁后重新读取索引再修改
+            self._index = None
+            index = self._load_index()
+            with open(self._segment_path(name), "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+            segment = index.setdefault(name, {"name": name, "count": 0, "first": now, "last": now})
+            segment["count"] += len(lines)
+            segment["last"] = now
+            self._save_index()
+        self._segment_cache.pop(name, None)
+        return len(lines)
+
+    def segments(self) -> List[dict]:
+        """返回各分段的摘要，最新的在前，只读取索引"""
+        return sorted(self._load_index().values(), key=lambda segment: segment["name"], reverse=True)
+
+    def total_count(self) -> int:
+        return sum(segment["count"] for segment in self._load_index().values())
+
+    def load_segment(self, name: str) -> List[dict]:
+        """读取分段中的记录，最近完成的在前"""
+        items = self._segment_cache.get(name)
+        if items is None:
+            items = self._read_segment(name)
+            items.reverse()
+            self._segment_cache[name] = items
+            if len(self._segment_cache) > self.MAX_CACHED_SEGMENTS:
+                self._segment_cache.pop(next(iter(self._segment_cache)))
+        return items
+
+    def iter_items(self) -> Iterator[dict]:
+        """从最新的分段开始依次读取所有归档记录"""
+        for segment in self.segments():
+            yield from self._read_segment(segment["name"])[::-1]
+
+    def reload(self):
+        """丢弃缓存，下次访问时重新读取（归档被其他窗口修改后调用）"""
+        self._index = None
+        self._segment_cache.clear()
@@ -0,0 +1,76 @@
+# todo_cli.py - 命令行工具（python -m smt2），直接读写todo文件，不导入PySide6、psutil和jieba
+# 修改追加到日志中，运行中的界面监视到文件变化后读入
+import sys
+from typing import List, Optional
+from src.configs.base_config import get_todo_file_name
+from src.utils.todo_store import TodoRecord, TodoStore
+
+USAGE = """用法: python -m smt2 <命令>
+  add 文本            添加一条待办事项
+  list [--all]        列出未完成的事项，--all同时列出已完成的
+  done 序号|id ...    把事项标记为完成，序号为list输出的第一列，id可只写前几位"""
+
+
+def _find(store: TodoStore, key: str) -> Optional[TodoRecord]:
+    """按list中的序号或id前缀查找记录，id前缀不唯一时视为找不到"""
+    records = store.records()
+    if key.isdigit() and 1 <= int(key) <= len(records):
+        return records[int(key) - 1]
+    matches = [record for record in records if record.id.startswith(key)]
+    return matches[0] if len(matches) == 1 else None
+
+
+def _add(store: TodoStore, path: str, args: List[str]) -> int:
+    text = " ".join(args).strip()
+    if not text:
+        print(USAGE, file=sys.stderr)
+        return 2
+    store.load(path)
+    record = store.add(text)
+    store.save(path)
+    print(f"已添加 {record.id[:8]}")
+    return 0
+
+
+def _list(store: TodoStore, path: str, args: List[str]) -> int:
+    show_all = "--all" in args
+    store.load(path)
+    for index, record in enumerate(store.records(), 1):
+        if not record.text.strip() or (record.completed and not show_all):
+            continue
+        mark = "[x]" if record.completed else "[ ]"
+        print(f"{index:>3}  {record.id[:8]}  {mark} {record.text}")
+    return 0
+
+
+def _done(store: TodoStore, path: str, args: List[str]) -> int:
+    if not args:
+        print(USAGE, file=sys.stderr)
+        return 2
+    store.load(path)
+    records = []
+    for key in args:
+        record = _find(store, key)
+        if record is None:
+            print(f"找不到事项: {key}", file=sys.stderr)
+            return 1
+        records.append(record)
+    store.update_many({record.id: {"completed": True} for record in records})
+    store.save(path)
+    for record in records:
+        print(f"已完成: {record.text}")
+    return 0
+
+
+COMMANDS = {"add": _add, "list": _list, "done": _done}
+
+
+def main(argv: List[str]) -> int:
+    if not argv or argv[0] not in COMMANDS:
+        print(USAGE, file=sys.stderr)
+        return 2
+    try:
+        return COMMANDS[argv[0]](TodoStore(), get_todo_file_name(), argv[1:])
+    except (OSError, ValueError) as e:
+        print(f"读写待办事项出错: {e}", file=sys.stderr)
+        return 1
@@ -0,0 +1,639 @@
+# todo_store.py - 不依赖Qt的待办事项存储
+import hashlib
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from src.utils.file_lock import file_lock
+from src.utils.order_keys import is_valid_key, key_between, keys_between
+
+JOURNAL_SUFFIX = ".journal"
+
+
+class TodoRecord:
+    """单条待办事项，使用__slots__减少每条记录的内存占用"""
+
+    __slots__ = ("id", "text", "completed", "order", "tags", "created_at", "updated_at")
+
+    def __init__(self, id: str, text: str, completed: bool = False, order: str = "a0",
+                 tags: Optional[tuple] = None, created_at: float = 0.0, updated_at: float = 0.0):
+        self.id = id
+        self.text = text
+        self.completed = completed
+        self.order = order  # 分数排序键，见order_keys
+        self.tags = tags  # 由标签提取得到的派生数据，None表示尚未提取
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    def to_dict(self) -> dict:
+        data = {
+            "id": self.id,
+            "text": self.text,
+            "completed": self.completed,
+            "order": self.order,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+        if self.tags is not None:
+            data["tags"] = list(self.tags)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TodoRecord":
+        """从字典创建记录，兼容只有text/completed字段的旧格式（排序键由load_list补齐）"""
+        now = time.time()
+        tags = data.get("tags")
+        return cls(
+            id=data.get("id") or new_todo_id(),
+            text=data.get("text", ""),
+            completed=bool(data.get("completed", False)),
+            order=data.get("order"),
+            tags=tuple(tags) if tags is not None else None,
+            created_at=data.get("created_at", now),
+            updated_at=data.get("updated_at", now),
+        )
+
+    def __repr__(self):
+        return f"TodoRecord({self.id!r}, {self.text!r}, completed={self.completed})"
+
+
+def new_todo_id() -> str:
+    """生成跨进程唯一的记录id"""
+    return uuid.uuid4().hex
+
+
+def _merge_fields(record: TodoRecord) -> tuple:
+    """三方合并时逐个比较的字段"""
+    return record.text, record.completed, record.order
+
+
+class TodoChange:
+    """一次（或一批）修改的汇总，批量操作结束后只通知一次"""
+
+    __slots__ = ("added", "updated", "removed", "moved", "reset")
+
+    def __init__(self):
+        self.added: Set[str] = set()
+        self.updated: Set[str] = set()
+        self.removed: Set[str] = set()
+        self.moved: Set[str] = set()
+        self.reset = False
+
+    @property
+    def reordered(self) -> bool:
+        return bool(self.moved)
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.updated or self.removed or self.moved or self.reset)
+
+    def text_changed(self) -> bool:
+        """是否涉及文本内容的变化（需要重新提取标签）"""
+        return bool(self.added or self.updated or self.removed or self.reset)
+
+
+class TodoStore:
+    """
+    待办事项的内存存储与持久化，不依赖Qt，可在无界面环境下测试
+    所有修改通过subscribe注册的回调以TodoChange通知，batch()内的修改合并为一次通知
+    持久化使用快照 + 只追加的日志：save只把上次保存后修改过的记录追加到日志，
+    日志过长时再合并为新的快照；读写时持有文件锁，其他进程（如命令行工具、另一个实例）写入的修改
+    在refresh或save时按记录三方合并，不会覆盖本进程尚未保存的修改
+    """
+
+    COMPACT_THRESHOLD = 1000  # 日志条数超过该值（且超过记录数）时合并快照
+    JOURNAL_TAIL = 64  # 记住日志已读位置之前的字节数，用于发现日志被清空后又追加到原位置之后
+
+    def __init__(self):
+        self._records: Dict[str, TodoRecord] = {}
+        self._ordered: Optional[List[TodoRecord]] = None  # 排序结果缓存
+        self._listeners: List[Callable[[TodoChange], None]] = []
+        self._batch_depth = 0
+        self._pending_change: Optional[TodoChange] = None
+        self._dirty: Set[str] = set()  # 上次保存后修改过的记录id
+        self._base: Dict[str, tuple] = {}  # 文件中的记录id -> 上次与文件同步时的字段，三方合并的共同祖先
+        self._journal_entries = 0
+        self._journal_offset = 0  # 日志中已读入或由本进程写入的字节数
+        self._journal_id = None  # 日志文件的 (设备, inode)，变化说明日志被替换
+        self._journal_tail = b""  # 日志已读位置之前的若干字节
+        self._snapshot_stat = None  # 读入或写入快照时的 (修改时间, 大小)，变化后再比较哈希
+        self._snapshot_digest = None
+        self._needs_snapshot = True  # 需要完整写入快照（首次保存或旧格式文件）
+
+    # ---- 通知 ----
+
+    def subscribe(self, callback: Callable[[TodoChange], None]):
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[TodoChange], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    @contextmanager
+    def batch(self):
+        """批量修改，结束时只发出一次通知"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush_change()
+
+    def _change(self) -> TodoChange:
+        if self._pending_change is None:
+            self._pending_change = TodoChange()
+        return self._pending_change
+
+    def _commit(self):
+        if self._batch_depth == 0:
+            self._flush_change()
+
+    def _flush_change(self):
+        change = self._pending_change
+        self._pending_change = None
+        if change is None or change.is_empty():
+            return
+        for callback in list(self._listeners):
+            callback(change)
+
+    # ---- 查询 ----
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, todo_id: str) -> bool:
+        return todo_id in self._records
+
+    def get(self, todo_id: str) -> Optional[TodoRecord]:
+        return self._records.get(todo_id)
+
+    def records(self) -> List[TodoRecord]:
+        """按顺序返回所有记录（结果被缓存，调用方不应修改列表）"""
+        if self._ordered is None:
+            self._ordered = sorted(self._records.values(), key=lambda r: (r.order, r.created_at, r.id))
+        return self._ordered
+
+    def index_of(self, todo_id: str) -> int:
+        for index, record in enumerate(self.records()):
+            if record.id == todo_id:
+                return index
+        return -1
+
+    # ---- 修改 ----
+
+    def _last_order(self) -> Optional[str]:
+        records = self.records()
+        return records[-1].order if records else None
+
+    def _insert(self, text: str, completed: bool, order: str) -> TodoRecord:
+        now = time.time()
+        record = TodoRecord(new_todo_id(), text, completed, order, None, now, now)
+        self._records[record.id] = record
+        self._ordered = None
+        self._dirty.add(record.id)
+        self._change().added.add(record.id)
+        return record
+
+    def add(self, text: str, completed: bool = False) -> TodoRecord:
+        """在末尾添加一条记录"""
+        record = self._insert(text, completed, key_between(self._last_order(), None))
+        self._commit()
+        return record
+
+    def add_many(self, texts: Iterable[str]) -> List[TodoRecord]:
+        """批量添加到末尾，只发出一次通知"""
+        texts = list(texts)
+        orders = keys_between(self._last_order(), None, len(texts))
+        with self.batch():
+            records = [self._insert(text, False, order) for text, order in zip(texts, orders)]
+        return records
+
+    def update(self, todo_id: str, **fields) -> Optional[TodoRecord]:
+        """修改text/completed字段，文本变化时清空派生的标签"""
+        record = self._records.get(todo_id)
+        if record is None:
+            return None
+
+        changed = False
+        if "text" in fields and fields["text"] != record.text:
+            record.text = fields["text"]
+            record.tags = None
+            changed = True
+        if "completed" in fields and bool(fields["completed"]) != record.completed:
+            record.completed = bool(fields["completed"])
+            changed = True
+
+        if changed:
+            record.updated_at = time.time()
+            self._dirty.add(todo_id)
+            self._change().updated.add(todo_id)
+            self._commit()
+        return record
+
+    def update_many(self, changes: Dict[str, dict]):
+        """批量修改，changes为 {id: {字段: 值}}"""
+        with self.batch():
+            for todo_id, fields in changes.items():
+                self.update(todo_id, **fields)
+
+    def set_tags(self, todo_id: str, tags: Iterable[str]):
+        """写入提取出的标签。标签是派生数据，不发出修改通知"""
+        record = self._records.get(todo_id)
+        if record is not None:
+            record.tags = tuple(tags)
+
+    def remove(self, todo_id: str) -> Optional[TodoRecord]:
+        record = self._records.pop(todo_id, None)
+        if record is None:
+            return None
+        self._dirty.add(todo_id)
+        self._note_removed(todo_id)
+        self._commit()
+        return record
+
+    def _note_removed(self, todo_id: str):
+        self._ordered = None
+        change = self._change()
+        if todo_id in change.added:
+            change.added.discard(todo_id)
+        else:
+            change.removed.add(todo_id)
+        change.updated.discard(todo_id)
+        change.moved.discard(todo_id)
+
+    def remove_many(self, todo_ids: Iterable[str]) -> List[TodoRecord]:
+        with self.batch():
+            removed = [self.remove(todo_id) for todo_id in list(todo_ids)]
+        return [record for record in removed if record is not None]
+
+    def move(self, todo_id: str, new_index: int):
+        """移动记录到新的位置，只修改被移动记录的排序键"""
+        old_index = self.index_of(todo_id)
+        if old_index < 0:
+            return
+        records = list(self.records())
+        record = records.pop(old_index)
+        new_index = max(0, min(new_index, len(records)))
+        if new_index == old_index:
+            return
+
+        before = records[new_index - 1].order if new_index > 0 else None
+        after = records[new_index].order if new_index < len(records) else None
+        try:
+            record.order = key_between(before, after)
+        except ValueError:
+            # 相邻记录的键相同（例如其他进程同时追加），重新分配全部排序键
+            self._rebalance_orders(records)
+            record.order = key_between(records[new_index - 1].order if new_index > 0 else None,
+                                       records[new_index].order if new_index < len(records) else None)
+        records.insert(new_index, record)
+        self._ordered = records
+        self._dirty.add(todo_id)
+        self._change().moved.add(todo_id)
+        self._commit()
+
+    def _rebalance_orders(self, records: List[TodoRecord]):
+        for record, order in zip(records, keys_between(None, None, len(records))):
+            record.order = order
+            self._dirty.add(record.id)
+
+    def clear(self):
+        self._dirty.update(self._records)
+        self._records.clear()
+        self._ordered = None
+        self._change().reset = True
+        self._commit()
+
+    # ---- 持久化 ----
+
+    def to_list(self) -> List[dict]:
+        """导出需要持久化的记录（不保存空文本）"""
+        return [record.to_dict() for record in self.records() if record.text.strip()]
+
+    def load_list(self, items: List[dict]):
+        """用字典列表替换全部记录，缺少id或排序键的旧记录按原顺序补齐"""
+        records = [TodoRecord.from_dict(data) for data in items]
+        if not all(is_valid_key(record.order) for record in records):
+            for record, order in zip(records, keys_between(None, None, len(records))):
+                record.order = order
+            self._needs_snapshot = True
+        if not all("id" in data for data in items):
+            self._needs_snapshot = True
+
+        self._records = {record.id: record for record in records}
+        self._ordered = None
+        self._change().reset = True
+        self._commit()
+
+    @staticmethod
+    def _read_journal(path: str, offset: int = 0):
+        """从offset开始读取日志，返回 (日志条目, 读到的位置)；写到一半的最后一行不计入"""
+        entries = []
+        try:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return entries, 0
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        return entries, offset + end
+
+    def load(self, path: str):
+        """从快照加载并重放日志，文件不存在时清空"""
+        with file_lock(path):
+            self._load(path)
+
+    @staticmethod
+    def _stat(path: str):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _read_disk(path: str):
+        """读取快照并重放日志，返回 (记录字典列表, 快照哈希, 日志条数, 日志读到的位置)，快照不存在时哈希为None"""
+        items = []
+        digest = None
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            items = json.loads(data.decode("utf-8"))
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+        except FileNotFoundError:
+            pass
+
+        # 重放日志：put覆盖同id的记录，del删除记录
+        journal, offset = TodoStore._read_journal(path + JOURNAL_SUFFIX)
+        if journal:
+            by_id = {data.get("id") or new_todo_id(): data for data in items}
+            for entry in journal:
+                if entry.get("op") == "put":
+                    data = entry["record"]
+                    by_id[data["id"]] = data
+                elif entry.get("op") == "del":
+                    by_id.pop(entry.get("id"), None)
+            items = list(by_id.values())
+        return items, digest, len(journal), offset
+
+    def _load(self, path: str):
+        stat = self._stat(path)
+        items, digest, entries, offset = self._read_disk(path)
+        self._needs_snapshot = digest is None
+        self.load_list(items)
+        self._dirty.clear()
+        self._base = {record.id: _merge_fields(record) for record in self._records.values()}
+        self._snapshot_stat, self._snapshot_digest = stat, digest
+        self._journal_entries, self._journal_offset = entries, offset
+        self._remember_journal(path)
+
+    def _remember_journal(self, path: str):
+        """记下日志文件的inode和已读位置之前的若干字节"""
+        try:
+            with open(path + JOURNAL_SUFFIX, "rb") as f:
+                info = os.fstat(f.fileno())
+                start = max(0, self._journal_offset - self.JOURNAL_TAIL)
+                f.seek(start)
+                self._journal_tail = f.read(self._journal_offset - start)
+            self._journal_id = (info.st_dev, info.st_ino)
+        except FileNotFoundError:
+            self._journal_id = None
+            self._journal_tail = b""
+
+    def _journal_state(self, path: str):
+        """
+        返回 (日志是否被重写, 日志大小)：文件被替换、被截短，或已读位置之前的内容变了
+        （其他进程合并快照时清空日志后又追加到了原位置之后）都需要从头读取
+        """
+        try:
+            with open(path + JOURNAL_SUFFIX, "rb") as f:
+                info = os.fstat(f.fileno())
+                if self._journal_offset == 0:
+                    return False, info.st_size
+                if (info.st_dev, info.st_ino) != self._journal_id or info.st_size < self._journal_offset:
+                    return True, info.st_size
+                start = max(0, self._journal_offset - self.JOURNAL_TAIL)
+                f.seek(start)
+                return f.read(self._journal_offset - start) != self._journal_tail, info.st_size
+        except FileNotFoundError:
+            return self._journal_offset > 0, 0
+
+    def refresh(self, path: str) -> bool:
+        """读入其他进程写入的修改，文件有变化时返回True"""
+        with file_lock(path):
+            return self._apply_external(path)
+
+    def _apply_external(self, path: str) -> bool:
+        """
+        只有新追加的日志时逐条合并；快照被替换或日志被重写时，与文件中的全部记录三方合并
+        快照的修改时间或大小变化后再比较内容哈希，内容未变（如只是被touch）时不必合并
+        快照不存在（其他程序非原子替换的间隙或被用户删除）时不视为外部修改，下次保存时重新写入快照
+        """
+        stat = self._stat(path)
+        snapshot_changed = False
+        if stat is None:
+            if self._snapshot_stat is not None:
+                self._needs_snapshot = True
+        elif stat != self._snapshot_stat:
+            try:
+                with open(path, "rb") as f:
+                    digest = hashlib.blake2b(f.read(), digest_size=16).digest()
+                snapshot_changed = digest != self._snapshot_digest
+                if not snapshot_changed:
+                    self._snapshot_stat = stat
+            except OSError:
+                pass
+        journal_replaced, journal_size = self._journal_state(path)
+        if snapshot_changed or journal_replaced:
+            return self._merge_disk(path)
+        if journal_size == self._journal_offset:
+            return False
+
+        entries, self._journal_offset = self._read_journal(path + JOURNAL_SUFFIX, self._journal_offset)
+        self._journal_entries += len(entries)
+        self._remember_journal(path)
+        with self.batch():
+            for entry in entries:
+                if entry.get("op") == "put" and (entry.get("record") or {}).get("id"):
+                    self._merge_record(entry["record"]["id"], TodoRecord.from_dict(entry["record"]))
+                elif entry.get("op") == "del" and entry.get("id"):
+                    self._merge_record(entry["id"], None)
+        return bool(entries)
+
+    def _merge_disk(self, path: str) -> bool:
+        """
+        与文件中的全部记录三方合并，只对实际变化的记录发出通知，不重新写入快照
+        快照不存在或无法解析（如其他程序正在写入）时不合并，下次再检查
+        """
+        stat = self._stat(path)
+        try:
+            items, digest, entries, offset = self._read_disk(path)
+        except (OSError, ValueError):
+            return False
+        if digest is None:
+            self._needs_snapshot = True
+            return False
+        theirs = {}
+        for data in items:
+            record = TodoRecord.from_dict(data)
+            theirs[record.id] = record
+        if not all("id" in data for data in items):
+            # 快照被替换为旧格式（id是刚生成的），下次保存时写入完整快照
+            self._needs_snapshot = True
+
+        with self.batch():
+            for todo_id in list(theirs) + [todo_id for todo_id in self._base if todo_id not in theirs]:
+                incoming = theirs.get(todo_id)
+                if incoming is not None and self._base.get(todo_id) == _merge_fields(incoming):
+                    continue
+                self._merge_record(todo_id, incoming)
+        self._snapshot_stat, self._snapshot_digest = stat, digest
+        self._journal_entries, self._journal_offset = entries, offset
+        self._remember_journal(path)
+        return True
+
+    def _merge_record(self, todo_id: str, incoming: Optional[TodoRecord]):
+        """
+        三方合并一条记录：共同祖先是上次与文件同步时的字段，incoming是文件中的新版本（None表示已删除）
+        只有一方修改的字段取修改后的值，双方都修改时取updated_at较新的一方；
+        一方删除而另一方修改过时保留修改。合并结果与文件不同的记录保持待保存
+        """
+        record = self._records.get(todo_id)
+        if incoming is not None and not is_valid_key(incoming.order):
+            incoming.order = record.order if record is not None else key_between(self._last_order(), None)
+        base = self._base.pop(todo_id, None)
+        if incoming is not None:
+            self._base[todo_id] = _merge_fields(incoming)
+
+        if todo_id not in self._dirty:
+            self._set_record(todo_id, incoming)
+            return
+        if record is None or incoming is None:
+            if record is None and incoming is not None and _merge_fields(incoming) != base:
+                # 本进程删除了记录，对方修改过：恢复对方的版本
+                self._set_record(todo_id, incoming)
+                self._dirty.discard(todo_id)
+            elif record is None and incoming is None:
+                self._dirty.discard(todo_id)
+            # 对方删除了记录，本进程修改过：保留本进程的版本，保存时重新写入
+            return
+
+        ours = _merge_fields(record)
+        theirs = _merge_fields(incoming)
+        if base is None:
+            base = theirs
+        ours_newer = record.updated_at >= incoming.updated_at
+        merged = []
+        for mine, other, old in zip(ours, theirs, base):
+            if other == old or other == mine:
+                merged.append(mine)
+            elif mine == old:
+                merged.append(other)
+            else:
+                merged.append(mine if ours_newer else other)
+        self._set_fields(record, tuple(merged), max(record.updated_at, incoming.updated_at))
+        if tuple(merged) == theirs:
+            self._dirty.discard(todo_id)
+
+    def _set_record(self, todo_id: str, incoming: Optional[TodoRecord]):
+        """让内存中的记录与文件一致，不标记为待保存"""
+        record = self._records.get(todo_id)
+        if incoming is None:
+            if record is not None:
+                del self._records[todo_id]
+                self._note_removed(todo_id)
+        elif record is None:
+            self._records[todo_id] = incoming
+            self._ordered = None
+            self._change().added.add(todo_id)
+        else:
+            self._set_fields(record, _merge_fields(incoming), incoming.updated_at)
+
+    def _set_fields(self, record: TodoRecord, fields: tuple, updated_at: float):
+        text, completed, order = fields
+        if order != record.order:
+            record.order = order
+            self._ordered = None
+            self._change().moved.add(record.id)
+        if text != record.text or completed != record.completed:
+            if text != record.text:
+                record.tags = None
+            record.text = text
+            record.completed = completed
+            self._change().updated.add(record.id)
+        record.updated_at = updated_at
+
+    def save(self, path: str):
+        """先合并其他进程的修改，再把修改过的记录追加到日志，没有修改时不写文件"""
+        with file_lock(path):
+            self._apply_external(path)
+            if self._needs_snapshot or self._journal_entries > max(self.COMPACT_THRESHOLD, len(self._records)):
+                self._compact(path)
+                return
+            if not self._dirty:
+                return
+
+            lines = []
+            for todo_id in self._dirty:
+                record = self._records.get(todo_id)
+                if record is not None and record.text.strip():
+                    lines.append(json.dumps({"op": "put", "record": record.to_dict()}, ensure_ascii=False))
+                    self._base[todo_id] = _merge_fields(record)
+                elif todo_id in self._base:
+                    # 已删除或被清空的记录
+                    lines.append(json.dumps({"op": "del", "id": todo_id}))
+                    del self._base[todo_id]
+
+            if lines:
+                data = ("\n".join(lines) + "\n").encode("utf-8")
+                with open(path + JOURNAL_SUFFIX, "ab") as f:
+                    if f.tell() > self._journal_offset:
+                        # 末尾是写到一半的行，换行后再追加，避免与新的日志连成一行
+                        data = b"\n" + data
+                    f.write(data)
+                    self._journal_offset = f.tell()
+                self._journal_entries += len(lines)
+                self._remember_journal(path)
+            self._dirty.clear()
+
+    def compact(self, path: str):
+        """写入完整快照并清空日志"""
+        with file_lock(path):
+            self._apply_external(path)
+            self._compact(path)
+
+    def _compact(self, path: str):
+        items = self.to_list()
+        data = json.dumps(items, ensure_ascii=False, indent=2).encode("utf-8")
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        if hasattr(os, "O_DIRECTORY"):
+            # 替换本身也要落盘，之后才能清空日志
+            directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+        # 快照替换后再清空日志，中途退出时重放日志也只是重复写入相同内容
+        open(path + JOURNAL_SUFFIX, "w", encoding="utf-8").close()
+
+        self._dirty.clear()
+        self._base = {item["id"]: (item["text"], item["completed"], item["order"]) for item in items}
+        self._journal_entries = 0
+        self._journal_offset = 0
+        self._remember_journal(path)
+        self._snapshot_stat = self._stat(path)
+        self._snapshot_digest = hashlib.blake2b(data, digest_size=16).digest()
+        self._needs_snapshot = False
@@ -1,9 +1,27 @@
+import threading
 from src.configs.base_config import get_extractor_model
+from collections import Counter
 from typing import List
 from src.utils.lightweight_tag_extractor import LightweightTagExtractor
-from src.configs.base_config import get_color, get_todo_poses
+from src.configs.base_config import get_color, get_todo_pos_prefixes
 
-JIEBA_AVAILABLE = get_extractor_model() == 'jieba'
+EXTRACTOR_MODEL = get_extractor_model()
+JIEBA_AVAILABLE = EXTRACTOR_MODEL == 'jieba'
+TRIE_AVAILABLE = EXTRACTOR_MODEL == 'trie'
+
+# 标签提取线程和GUI线程可能同时首次使用jieba，词典设置只能执行一次
+_jieba_lock = threading.Lock()
+
+# 教育技术领域自定义词汇，是用户词典和trie词表的初始内容
+EDUCATION_TECH_WORDS = [
+    '课程开发', '教育应用', '教学设计', '微课', '慕课', '在线课程', '混合学习',
+    '翻转课堂', '项目学习', '学习管理系统', 'LMS', 'SCORM', 'xAPI', 'EdTech',
+    '教育技术', '数字学习', '智慧教育', '个性化学习', '适应性学习', '学习分析',
+    '教学资源', '互动白板', '虚拟现实', '增强现实', '移动学习', '游戏化学习',
+    '学习对象', '内容管理系统', '学习路径', '评估系统', '反馈机制', '协作学习',
+    '同步教学', '异步教学', '视频会议', '远程教育', '网络课程', '电子教材',
+    '学习平台', '教学平台', '教育软件', '学习软件', '教学工具', '学习工具'
+]
 
 class TodoTagExtractor:
     """
@@ -49,50 +67,40 @@ class TodoTagExtractor:
                 return TodoTagExtractor._extract_with_jieba(text)
             except Exception:
                 return TodoTagExtractor._extract_with_regex(text)
+        elif TRIE_AVAILABLE:
+            try:
+                return TodoTagExtractor._extract_with_trie(text)
+            except Exception:
+                return TodoTagExtractor._extract_with_regex(text)
         else:
             return TodoTagExtractor._extract_with_regex(text)
     
+    @staticmethod
+    def extract_term_counts(text: str) -> Counter:
+        """
+        返回候选标签及其在该事项中的词频，供跨事项的TF-IDF排序使用
+        """
+        if not text or not isinstance(text, str) or not text.strip():
+            return Counter()
+        
+        if JIEBA_AVAILABLE:
+            try:
+                return TodoTagExtractor._count_with_jieba(text.strip())
+            except Exception as e:
+                print(f"Jieba extraction failed: {e}")
+        elif TRIE_AVAILABLE:
+            try:
+                from src.utils.trie_tag_extractor import TrieTagExtractor
+                return TrieTagExtractor.count_terms(text)
+            except Exception as e:
+                print(f"Trie extraction failed: {e}")
+        return LightweightTagExtractor.count_terms(text)
+    
     @staticmethod
     def _extract_with_jieba(text: str) -> List[str]:
-        """使用jieba分词提取标签，仅在调用时加载词典"""
+        """使用jieba分词提取标签，按词频排序"""
         try:
-            # 动态导入jieba以减少内存占用
-            import jieba.posseg as pseg
-            from collections import Counter
-            
-            # 添加教育技术领域自定义词典（减少对大词典的依赖）
-            education_tech_words = [
-                '课程开发', '教育应用', '教学设计', '微课', '慕课', '在线课程', '混合学习',
-                '翻转课堂', '项目学习', '学习管理系统', 'LMS', 'SCORM', 'xAPI', 'EdTech',
-                '教育技术', '数字学习', '智慧教育', '个性化学习', '适应性学习', '学习分析',
-                '教学资源', '互动白板', '虚拟现实', '增强现实', '移动学习', '游戏化学习',
-                '学习对象', '内容管理系统', '学习路径', '评估系统', '反馈机制', '协作学习',
-                '同步教学', '异步教学', '视频会议', '远程教育', '网络课程', '电子教材',
-                '学习平台', '教学平台', '教育软件', '学习软件', '教学工具', '学习工具'
-            ]
-            
-            # 仅在首次加载时添加词典
-            if not TodoTagExtractor._jieba_loaded:
-                import jieba
-                for word in education_tech_words:
-                    jieba.add_word(word)
-                TodoTagExtractor._jieba_loaded = True
-            
-            # 分词并标注词性
-            words = pseg.cut(text)
-            
-            tags = []
-            for word, flag in words:
-                if word in TodoTagExtractor.CHINESE_STOPWORDS or word in TodoTagExtractor.ENGLISH_STOPWORDS:
-                    continue
-                
-                if flag.startswith(tuple(get_todo_poses())) or word in education_tech_words:  # 名词、英文或自定义词
-                    if len(word) > 1 or ('\u4e00' <= word <= '\u9fff'):
-                        tags.append(word)
-            
-            
-            # 统计词频并按频率排序（降序）
-            word_freq = Counter(tags)
+            word_freq = TodoTagExtractor._count_with_jieba(text)
             sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
            
             # 去重并限制标签数量
@@ -111,6 +119,52 @@ class TodoTagExtractor:
             print(f"Jieba extraction failed: {e}")
             return TodoTagExtractor._extract_with_regex(text)
     
+    @staticmethod
+    def _count_with_jieba(text: str) -> Counter:
+        """使用jieba分词统计候选标签的词频，仅在调用时加载词典"""
+        from src.utils.user_dictionary import UserDictionary
+        
+        # 首次使用时换成合并了用户词典的词典文件，必须在导入jieba.posseg之前设置，词性表才会从该文件读取
+        if not TodoTagExtractor._jieba_loaded:
+            with _jieba_lock:
+                if not TodoTagExtractor._jieba_loaded:
+                    # 动态导入jieba以减少内存占用
+                    import jieba
+                    try:
+                        dictionary_path, cache_path = UserDictionary.compile_for_jieba()
+                        jieba.set_dictionary(dictionary_path)
+                        jieba.dt.cache_file = cache_path
+                    except Exception as e:
+                        print(f"合并用户词典失败: {e}")
+                        for word in UserDictionary.words():
+                            jieba.add_word(word)
+                    # 在锁内导入，其他线程等设置完成后才会开始分词
+                    import jieba.posseg
+                    TodoTagExtractor._jieba_loaded = True
+        import jieba.posseg as pseg
+        
+        # 分词并标注词性
+        words = pseg.cut(text)
+        
+        poses = get_todo_pos_prefixes()
+        user_words = UserDictionary.words()
+        tags = []
+        for word, flag in words:
+            if word in TodoTagExtractor.CHINESE_STOPWORDS or word in TodoTagExtractor.ENGLISH_STOPWORDS:
+                continue
+            
+            if flag.startswith(poses) or word in user_words:  # 名词、英文或自定义词
+                if len(word) > 1 or ('\u4e00' <= word <= '\u9fff'):
+                    tags.append(word)
+        
+        return Counter(tags)
+    
+    @staticmethod
+    def _extract_with_trie(text: str) -> List[str]:
+        """使用词表双数组Trie分词提取标签，仅在调用时加载"""
+        from src.utils.trie_tag_extractor import TrieTagExtractor
+        return TrieTagExtractor.extract_tags(text, max_tags=10)
+    
     @staticmethod
     def _extract_with_regex(text: str) -> List[str]:
         """使用轻量级提取器提取标签"""
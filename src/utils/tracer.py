@@ -0,0 +1,149 @@
+# tracer.py - Chrome Trace事件记录器
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional
+from src.configs.base_config import get_trace_events
+
+TRACE_ENV = "SMT2_TRACE"
+TRACE_FILE = "resources/trace.json"
+
+
+class _NullSpan:
+    """未开启记录时使用的空区间"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class _TraceSpan:
+    """记录一对begin/end事件的区间"""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        EventTracer.begin(self.name)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        EventTracer.end(self.name)
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class EventTracer:
+    """
+    记录GUI线程与后台线程的begin/end事件，导出为Chrome Trace JSON，可在Perfetto中查看
+    每个线程只向自己的deque追加事件，记录时无需加锁；只有线程首次记录时登记缓冲区才加锁
+    通过环境变量SMT2_TRACE=1或配置项trace_events开启
+    """
+
+    enabled = os.environ.get(TRACE_ENV, "") not in ("", "0") or get_trace_events()
+    MAX_EVENTS_PER_THREAD = 200000
+
+    _local = threading.local()
+    _buffers: List[list] = []  # [[tid, 线程名, deque], ...]
+    _register_lock = threading.Lock()
+    _origin_ns = time.perf_counter_ns()
+
+    @staticmethod
+    def _get_buffer() -> deque:
+        buffer = getattr(EventTracer._local, "events", None)
+        if buffer is None:
+            buffer = deque(maxlen=EventTracer.MAX_EVENTS_PER_THREAD)
+            EventTracer._local.events = buffer
+            thread = threading.current_thread()
+            with EventTracer._register_lock:
+                EventTracer._buffers.append([threading.get_native_id(), thread.name, buffer])
+        return buffer
+
+    @staticmethod
+    def set_thread_name(name: str):
+        """为当前线程设置在时间线上显示的名称（QThread在Python侧没有可读的名称）"""
+        if not EventTracer.enabled:
+            return
+        EventTracer._get_buffer()
+        native_id = threading.get_native_id()
+        with EventTracer._register_lock:
+            for entry in EventTracer._buffers:
+                if entry[0] == native_id:
+                    entry[1] = name
+
+    @staticmethod
+    def begin(name: str):
+        EventTracer._get_buffer().append(("B", name, time.perf_counter_ns()))
+
+    @staticmethod
+    def end(name: str):
+        EventTracer._get_buffer().append(("E", name, time.perf_counter_ns()))
+
+    @staticmethod
+    def export(path: str = TRACE_FILE) -> str:
+        """导出所有线程的事件为Chrome Trace JSON，返回文件路径"""
+        pid = os.getpid()
+        origin = EventTracer._origin_ns
+        trace_events = []
+
+        with EventTracer._register_lock:
+            buffers = [(tid, name, buffer.copy()) for tid, name, buffer in EventTracer._buffers]
+
+        for tid, thread_name, events in buffers:
+            trace_events.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                "args": {"name": thread_name},
+            })
+            for phase, name, timestamp in events:
+                trace_events.append({
+                    "name": name, "ph": phase, "pid": pid, "tid": tid,
+                    "ts": (timestamp - origin) / 1000,
+                })
+
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"导出Trace出错: {e}")
+        return path
+
+
+def trace_span(name: str):
+    """返回记录begin/end事件的上下文管理器，未开启记录时返回空区间"""
+    if not EventTracer.enabled:
+        return _NULL_SPAN
+    return _TraceSpan(name)
+
+
+def trace_slot(func: Optional[Callable] = None, *, name: Optional[str] = None) -> Callable:
+    """为被装饰函数记录begin/end事件，未开启记录时原样返回"""
+    if func is None:
+        return lambda f: trace_slot(f, name=name)
+    if not EventTracer.enabled:
+        return func
+
+    span_name = name or func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        EventTracer.begin(span_name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            EventTracer.end(span_name)
+
+    return wrapper
+
+
+if EventTracer.enabled:
+    atexit.register(EventTracer.export)
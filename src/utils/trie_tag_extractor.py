@@ -0,0 +1,131 @@
+import os
+import re
+from collections import Counter
+from typing import List
+from src.configs.base_config import get_tag_word_list
+from src.utils.double_array_trie import DoubleArrayTrie, word_list_digest
+from src.utils.lightweight_tag_extractor import LightweightTagExtractor
+from src.utils.todo_tag_extractor import EDUCATION_TECH_WORDS, TodoTagExtractor
+
+
+class TrieTagExtractor:
+    """
+    基于用户词表的双向最大匹配分词，介于jieba和LightweightTagExtractor之间：
+    词表编译为双数组Trie的二进制文件，启动时mmap映射，不需要加载jieba的大词典
+    """
+
+    _trie = None
+    STOPWORDS = TodoTagExtractor.CHINESE_STOPWORDS | LightweightTagExtractor.STOPWORDS
+
+    @staticmethod
+    def _binary_path(word_list_path: str) -> str:
+        return os.path.splitext(word_list_path)[0] + ".dat"
+
+    @staticmethod
+    def get_trie() -> DoubleArrayTrie:
+        """加载编译好的词表，词表不存在时用内置的教育技术词汇创建，词表修改后重新编译"""
+        if TrieTagExtractor._trie is not None:
+            return TrieTagExtractor._trie
+
+        word_list_path = get_tag_word_list()
+        if not os.path.exists(word_list_path):
+            try:
+                with open(word_list_path, 'w', encoding='utf-8') as f:
+                    f.write("\n".join(EDUCATION_TECH_WORDS) + "\n")
+            except OSError as e:
+                print(f"创建词表失败: {e}")
+        try:
+            with open(word_list_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            data = "\n".join(EDUCATION_TECH_WORDS).encode('utf-8')
+        digest = word_list_digest(data)
+
+        binary_path = TrieTagExtractor._binary_path(word_list_path)
+        trie = DoubleArrayTrie.load(binary_path)
+        if trie is None or trie.digest != digest:
+            # 与用户词典格式相同，每行第一列是词，后面可以有词频和词性
+            words = [line.split()[0] for line in data.decode('utf-8', errors='ignore').splitlines() if line.split()]
+            trie = DoubleArrayTrie.build((word for word in words if not word.startswith('#')), digest)
+            try:
+                trie.save(binary_path)
+                trie = DoubleArrayTrie.load(binary_path) or trie
+            except OSError as e:
+                print(f"保存词表索引失败: {e}")
+        TrieTagExtractor._trie = trie
+        return trie
+
+    @staticmethod
+    def _forward(trie: DoubleArrayTrie, text: str) -> List[str]:
+        """正向最大匹配"""
+        words = []
+        i = 0
+        while i < len(text):
+            length = trie.longest_prefix(text, i) or 1
+            words.append(text[i:i + length])
+            i += length
+        return words
+
+    @staticmethod
+    def _backward(trie: DoubleArrayTrie, text: str) -> List[str]:
+        """逆向最大匹配"""
+        words = []
+        j = len(text)
+        while j > 0:
+            length = 1
+            for candidate in range(min(trie.max_length, j), 1, -1):
+                if text[j - candidate:j] in trie:
+                    length = candidate
+                    break
+            words.append(text[j - length:j])
+            j -= length
+        words.reverse()
+        return words
+
+    @staticmethod
+    def segment(text: str) -> List[str]:
+        """
+        双向最大匹配：取词数较少的结果，词数相同时取单字较少的，仍相同时取逆向结果
+        """
+        trie = TrieTagExtractor.get_trie()
+        forward = TrieTagExtractor._forward(trie, text)
+        backward = TrieTagExtractor._backward(trie, text)
+        if len(forward) != len(backward):
+            return forward if len(forward) < len(backward) else backward
+        forward_singles = sum(1 for word in forward if len(word) == 1)
+        backward_singles = sum(1 for word in backward if len(word) == 1)
+        return forward if forward_singles < backward_singles else backward
+
+    @staticmethod
+    def count_terms(text: str) -> Counter:
+        """
+        统计候选标签的词频：[]标签、词表中的词、英文单词，
+        以及未登录的连续2-4个单字（通常是人名、专有名词）
+        """
+        text = text.strip()
+        if not text:
+            return Counter()
+
+        counts = Counter(LightweightTagExtractor.extract_hashtag_tags(text))
+        for word in re.findall(r'[a-zA-Z][a-zA-Z0-9]+', text):
+            if word.lower() not in TodoTagExtractor.ENGLISH_STOPWORDS:
+                counts[word] += 1
+
+        trie = TrieTagExtractor.get_trie()
+        for run in re.findall(r'[一-鿿]+', text):
+            unknown = ""
+            for word in TrieTagExtractor.segment(run) + [""]:
+                if len(word) == 1 and word not in TrieTagExtractor.STOPWORDS:
+                    unknown += word
+                    continue
+                if 2 <= len(unknown) <= 4 and unknown not in TrieTagExtractor.STOPWORDS:
+                    counts[unknown] += 1
+                unknown = ""
+                if len(word) > 1 and word in trie:
+                    counts[word] += 1
+        return counts
+
+    @staticmethod
+    def extract_tags(text: str, max_tags: int = 10) -> List[str]:
+        """按词频返回前max_tags个标签"""
+        return [word for word, _ in TrieTagExtractor.count_terms(text).most_common(max_tags)]
@@ -0,0 +1,101 @@
+import glob
+import hashlib
+import os
+from typing import Dict, FrozenSet, Optional, Tuple
+from src.configs.base_config import get_user_dictionaries
+
+CACHE_DIR = "resources/cache"
+DEFAULT_USER_FREQ = 2000  # 未指定词频时使用，足以让jieba不把自定义词切开
+DEFAULT_USER_TAG = "nz"  # 未指定词性时按专有名词处理，能通过默认的名词过滤
+
+
+class UserDictionary:
+    """
+    用户词典：properties.json中user_dictionaries列出的文件，每行 “词 [词频] [词性]”，#开头为注释
+    jieba使用时与自带词典合并成一个文件，按内容哈希缓存，jieba再为它生成自己的前缀词典缓存，
+    启动时不必逐个add_word，词表再大也只在内容变化后重建一次
+    """
+
+    _entries = None  # 词 -> (词频, 词性)，未指定为None
+    _digest = None
+    _words = None
+
+    @staticmethod
+    def _load():
+        if UserDictionary._entries is not None:
+            return
+        from src.utils.todo_tag_extractor import EDUCATION_TECH_WORDS
+
+        entries: Dict[str, Tuple[Optional[int], Optional[str]]] = {}
+        hasher = hashlib.blake2b(digest_size=8)
+        for path in get_user_dictionaries():
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                continue
+            hasher.update(path.encode('utf-8') + b"\0" + data + b"\0")
+            for line in data.decode('utf-8', errors='ignore').splitlines():
+                parts = line.split()
+                if not parts or parts[0].startswith('#'):
+                    continue
+                freq = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+                tag = parts[-1] if len(parts) > 1 and not parts[-1].isdigit() else None
+                entries[parts[0]] = (freq, tag)
+        if not entries:
+            # 没有可用的词典文件时使用内置词汇
+            entries = {word: (None, None) for word in EDUCATION_TECH_WORDS}
+            hasher.update(b"builtin")
+
+        UserDictionary._entries = entries
+        UserDictionary._digest = hasher.hexdigest()
+        UserDictionary._words = frozenset(entries)
+
+    @staticmethod
+    def words() -> FrozenSet[str]:
+        """所有自定义词，用于逐词过滤时的集合查找"""
+        UserDictionary._load()
+        return UserDictionary._words
+
+    @staticmethod
+    def compile_for_jieba() -> Tuple[str, str]:
+        """
+        返回 (合并后的词典路径, jieba前缀词典缓存路径)，文件名中含jieba版本和用户词典内容的哈希，
+        内容不变时直接复用；生成新文件后删除旧版本
+        """
+        import jieba
+        UserDictionary._load()
+        key = hashlib.blake2b((jieba.__version__ + UserDictionary._digest).encode('utf-8'),
+                              digest_size=8).hexdigest()
+        dictionary_path = os.path.abspath(os.path.join(CACHE_DIR, f"jieba_{key}.txt"))
+        cache_path = os.path.abspath(os.path.join(CACHE_DIR, f"jieba_{key}.cache"))
+        if os.path.exists(dictionary_path):
+            return dictionary_path, cache_path
+
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        entries = dict(UserDictionary._entries)
+        tmp_path = dictionary_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as out:
+            # 自带词典中已有的词按用户指定的词频、词性覆盖
+            with jieba.Tokenizer().get_dict_file() as f:
+                for raw_line in f:
+                    line = raw_line.decode('utf-8').strip()
+                    if not line:
+                        continue
+                    word, freq, tag = line.split(" ")
+                    if word in entries:
+                        user_freq, user_tag = entries.pop(word)
+                        freq = user_freq or max(int(freq), DEFAULT_USER_FREQ)
+                        tag = user_tag or tag
+                    out.write(f"{word} {freq} {tag}\n")
+            for word, (freq, tag) in entries.items():
+                out.write(f"{word} {freq or DEFAULT_USER_FREQ} {tag or DEFAULT_USER_TAG}\n")
+        os.replace(tmp_path, dictionary_path)
+
+        for old_path in glob.glob(os.path.join(CACHE_DIR, "jieba_*")):
+            if os.path.abspath(old_path) not in (dictionary_path, cache_path):
+                try:
+                    os.remove(old_path)
+                except OSError:
+                    pass
+        return dictionary_path, cache_path
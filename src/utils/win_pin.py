@@ -6,6 +6,8 @@ import threading
 import atexit
 import time
 from typing import Dict, List, Tuple, Callable
+from src.utils.profiler import profile_slot
+from src.utils.tracer import trace_span
 
 class WindowPinner:
     def __init__(self):
@@ -36,6 +38,7 @@ class WindowPinner:
         self.topped.clear()
         print("清理完成")
 
+    @profile_slot
     def iter_visible_windows(self) -> List[Tuple[int, str]]:
         """返回 [(hwnd, title), ...] 只含实际可见窗口"""
         result = []
@@ -163,13 +166,14 @@ class WindowPinner:
         while not self.stop_event.is_set():
             time.sleep(self.refresh_interval)
             if self.callback:
-                self.cleanup_invalid_windows()
-                self.callback()
+                with trace_span("WindowPinner.refresh"):
+                    self.cleanup_invalid_windows()
+                    self.callback()
 
     def start_auto_refresh(self, callback: Callable[[], None]):
         """启动自动刷新定时器"""
         self.callback = callback
-        self.refresh_thread = threading.Thread(target=self.refresh_loop, daemon=True)
+        self.refresh_thread = threading.Thread(target=self.refresh_loop, name="WindowPinner.refresh", daemon=True)
         self.refresh_thread.start()
 
     def stop_auto_refresh(self):
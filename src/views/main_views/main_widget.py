@@ -1,13 +1,18 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QApplication
 from PySide6.QtGui import QMouseEvent, QShowEvent
-from PySide6.QtCore import  QTimer, Qt, QPoint, QPropertyAnimation, QEasingCurve, Property
+from PySide6.QtCore import  QTimer, Qt, QPoint, QPropertyAnimation, QEasingCurve, Property, Signal
 from src.views.main_views.performance_panel import PerformancePanel
 from src.views.main_views.todo_panel import TodoPanel, TodoItemWidget
 from src.utils.performance_monitor import PerformanceMonitor
+from src.utils.theme_manager import ThemeManager
+from src.utils.tracer import trace_slot
+from src.views.toolbox_views.performance_view import PerformanceView
 import sys
 import ctypes
 
 class MainWidget(QWidget):
+    instanceCommand = Signal(object)  # 后启动的进程转发来的命令，可在其他线程中发出
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("SMT2") 
@@ -32,6 +37,9 @@ class MainWidget(QWidget):
         # 鼠标拖动相关
         self.drag_position = QPoint()
         
+        # 性能详情窗口（中键单击时创建）
+        self.performance_detail = None
+        
         # 定时器更新时间数据
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_time_data)
@@ -42,6 +50,8 @@ class MainWidget(QWidget):
         self.animation.setDuration(300)
         self.animation.setEasingCurve(QEasingCurve.OutCubic)
         
+        self.instanceCommand.connect(self.handle_instance_command)
+        
         # 更新初始数据
         self.update_time_data()
     
@@ -75,6 +85,8 @@ class MainWidget(QWidget):
             event.accept()
         elif event.button() == Qt.RightButton:
             self.toggle_todo_panel()
+        elif event.button() == Qt.MiddleButton:
+            self.open_performance_detail()
             
     def mouseMoveEvent(self, event: QMouseEvent):
         if event.buttons() == Qt.LeftButton and self.performance_panel.geometry().contains(event.pos()):
@@ -107,6 +119,18 @@ class MainWidget(QWidget):
         if self.todo_panel.todo_visible:
             self.todo_panel.update_todo_list()
             
+    def open_performance_detail(self):
+        """打开性能详情窗口"""
+        if self.performance_detail is None:
+            self.performance_detail = PerformanceView()
+            self.performance_detail.setWindowTitle("SMT2 性能详情")
+            self.performance_detail.resize(480, 420)
+            self.performance_detail.setStyleSheet(ThemeManager().get_current_theme())
+        
+        self.performance_detail.show()
+        self.performance_detail.raise_()
+        self.performance_detail.activateWindow()
+            
     def hide_todo_panel(self):
         self.todo_panel.setVisible(False)
         try:
@@ -114,10 +138,24 @@ class MainWidget(QWidget):
         except RuntimeError:
             pass
 
+    @trace_slot
     def update_time_data(self):
         self.performance_panel.update_time_data()
         if not self.performance_panel.performance_mode:
             self.performance_panel.update()
         
+    def handle_instance_command(self, command):
+        """执行命令行或其他进程转发的命令"""
+        name = command.get("command")
+        if name == "show":
+            self.show()
+            self.raise_()
+            self.activateWindow()
+            self.force_foreground()
+        elif name == "toggle-performance":
+            self.toggle_mode()
+        elif name == "add":
+            self.todo_panel.quick_add(command.get("text", ""))
+    
     def toggle_mode(self):
         self.performance_panel.toggle_mode()
\ No newline at end of file
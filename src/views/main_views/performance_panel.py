@@ -3,7 +3,9 @@ from PySide6.QtGui import QPainter, QColor, QFont, QPen
 from PySide6.QtCore import Qt, QTimer
 from datetime import datetime
 from src.utils.performance_monitor import PerformanceMonitor
-from src.configs.base_config import get_color
+from src.configs.base_config import get_color, get_performance_interval
+from src.utils.profiler import profile_slot
+from src.utils.tracer import trace_slot
 
 class PerformancePanel(QWidget):
     def __init__(self):
@@ -31,6 +33,8 @@ class PerformancePanel(QWidget):
         self.performance_timer = QTimer(self)
         self.performance_timer.timeout.connect(self.update_performance_data)
         
+    @trace_slot
+    @profile_slot
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
@@ -113,12 +117,13 @@ class PerformancePanel(QWidget):
         self.performance_mode = not self.performance_mode
         
         if self.performance_mode:
-            self.performance_timer.start(1000)
+            self.performance_timer.start(get_performance_interval())
         else:
             self.performance_timer.stop()
             
         self.update()
         
+    @trace_slot
     def update_performance_data(self):
         """仅在性能模式下更新性能数据"""
         if self.performance_mode:
@@ -1,30 +1,185 @@
 import json
 import os
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from functools import lru_cache
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QCheckBox, QLineEdit,
-    QScrollArea, QFrame, QSizePolicy, QTextEdit, QToolButton, QScrollBar
+    QScrollArea, QFrame, QSizePolicy, QTextEdit, QToolButton, QScrollBar,
+    QApplication, QMenu, QToolTip, QInputDialog, QListWidget, QCompleter
 )
-from PySide6.QtCore import Qt, QPoint, Signal, QThread, QObject
-from PySide6.QtGui import QMouseEvent, QFontMetrics, QWheelEvent
+from PySide6.QtCore import Qt, QPoint, Signal, QThread, QObject, QEvent, QStringListModel, QFileSystemWatcher, QTimer
+from PySide6.QtGui import QMouseEvent, QFontMetrics, QWheelEvent, QKeySequence, QShortcut
 from src.utils.todo_tag_extractor import TodoTagExtractor
-from src.configs.base_config import get_qss_color, get_todo_file_name
+from src.configs.base_config import get_qss_color, get_todo_file_name, get_tag_bar_max_tags, get_extraction_process
+from src.utils.profiler import profile_slot
+from src.utils.tracer import EventTracer, trace_slot, trace_span
+from src.utils.todo_store import JOURNAL_SUFFIX, TodoStore
+from src.utils.todo_archive import TodoArchive
+from src.utils.self_monitor import SelfMonitor
+from src.utils.search_index import SearchIndex
+from src.utils.tag_query import TagBitsetIndex, parse_tag_query
+from src.utils.tag_ranker import TfidfTagRanker
+from src.utils.extraction_service import ExtractionClient
+from src.utils.tag_trie import TagTrie
+from src.utils.duplicate_detector import DuplicateDetector
+from src.utils.lightweight_tag_extractor import LightweightTagExtractor
 
 class TagRefreshWorker(QObject):
-    """异步刷新标签的worker"""
-    finished = Signal(set)  # 完成信号，传递标签集合
+    """
+    常驻后台线程的标签提取worker
+    请求是按记录id的增量修改，尚未处理的请求会合并；处理过程中有新请求到达时，
+    先发出已处理部分的结果，未处理的修改与新请求合并后继续
+    标签按TF-IDF排序，文档频率在worker中随增量修改维护
+    开启extraction_process时分批交给子进程提取，jieba词典不常驻GUI进程
+    """
+    finished = Signal(int, object)  # 完成信号，传递请求代号和结果字典
+    BATCH_SIZE = 64  # 每批提取的事项数，批与批之间检查新请求
     
-    def __init__(self, todo_items):
+    def __init__(self):
         super().__init__()
-        self.todo_items = todo_items
+        self._condition = threading.Condition()
+        self._pending = {}  # 尚未处理的修改 {记录id: 文本，None表示删除}
+        self._pending_reset = False  # 是否需要先清空已有数据
+        self._latest_generation = 0
+        self._stopped = False
+        self._texts = {}  # 记录id -> 已处理的文本
+        self.ranker = TfidfTagRanker()
+        self.extraction_client = ExtractionClient() if get_extraction_process() else None
+    
+    def request(self, generation, changes, reset=False):
+        """提交增量修改（GUI线程调用），reset为True时changes是全部记录"""
+        with self._condition:
+            if reset:
+                self._pending = dict(changes)
+                self._pending_reset = True
+            else:
+                self._pending.update(changes)
+            self._latest_generation = generation
+            self._condition.notify()
+    
+    def stop(self):
+        """停止worker循环"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self.extraction_client is not None:
+            self.extraction_client.close()
     
     def run(self):
-        """在后台线程中执行标签提取"""
-        all_tags = set()
-        for item in self.todo_items:
-            if hasattr(item, 'content_text') and item.content_text.strip():
-                tags = TodoTagExtractor.extract_tags(item.content_text)
-                all_tags.update(tags)
-        self.finished.emit(all_tags)
+        """在后台线程中循环等待并处理请求"""
+        EventTracer.set_thread_name("TagRefreshWorker")
+        while True:
+            with self._condition:
+                while not self._pending and not self._pending_reset and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                generation = self._latest_generation
+                changes, self._pending = self._pending, {}
+                if self._pending_reset:
+                    self._pending_reset = False
+                    self.ranker.clear()
+                    self._texts.clear()
+            
+            self.finished.emit(generation, self._apply(changes))
+    
+    def _apply(self, changes):
+        """把修改应用到TF-IDF统计，返回 {"tags": {id: (文本, 标签)}, "ranking": 标签栏排序}"""
+        processed = []
+        with trace_span("TagRefreshWorker.extract"):
+            items = list(changes.items())
+            for start in range(0, len(items), self.BATCH_SIZE):
+                if self._pending or self._pending_reset:
+                    # 出现新请求：未处理的修改放回队列（新请求中的同一记录优先）
+                    with self._condition:
+                        if not self._pending_reset:
+                            for pending_id, pending_text in items[start:]:
+                                self._pending.setdefault(pending_id, pending_text)
+                    break
+                batch = items[start:start + self.BATCH_SIZE]
+                extract = [(todo_id, text) for todo_id, text in batch
+                           if text is not None and text.strip() and self._texts.get(todo_id) != text]
+                for (todo_id, text), term_counts in zip(extract, self._count_terms_many([text for _, text in extract])):
+                    self.ranker.set_document(todo_id, term_counts)
+                    self._texts[todo_id] = text
+                for todo_id, text in batch:
+                    if text is None or not text.strip():
+                        self.ranker.remove_document(todo_id)
+                        self._texts.pop(todo_id, None)
+                    processed.append((todo_id, text))
+            
+            tags = {todo_id: (text, self.ranker.rank_document(todo_id))
+                    for todo_id, text in processed if text is not None}
+            return {"tags": tags, "ranking": self.ranker.rank_corpus()}
+    
+    def _count_terms_many(self, texts):
+        """提取一批文本的词频，子进程不可用时改为在本进程中提取"""
+        if not texts:
+            return []
+        if self.extraction_client is not None:
+            try:
+                return self.extraction_client.count_terms_many(texts)
+            except RuntimeError as e:
+                if self._stopped:
+                    return [Counter() for _ in texts]
+                print(f"标签提取进程出错，改为在本进程中提取: {e}")
+                self.extraction_client = None
+        return [TodoTagExtractor.extract_term_counts(text) for text in texts]
+
+
+class TextLayoutCache:
+    """所有待办事项共享的字体度量、缩略文本和提示文本缓存"""
+    
+    _metrics = {}  # 字体key -> QFontMetrics
+    _token_pattern = re.compile(r'[A-Za-z0-9_.\-]+|\s+|.')
+    
+    @staticmethod
+    def metrics(font) -> QFontMetrics:
+        key = font.key()
+        metrics = TextLayoutCache._metrics.get(key)
+        if metrics is None:
+            metrics = TextLayoutCache._metrics[key] = QFontMetrics(font)
+        return metrics
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def elided_text(text: str, width: int, font_key: str) -> str:
+        """按(文本, 宽度, 字体)缓存缩略结果"""
+        metrics = TextLayoutCache._metrics[font_key]
+        if metrics.horizontalAdvance(text) > width:
+            return metrics.elidedText(text, Qt.ElideRight, width)
+        return text
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def wrapped_tooltip(text: str, max_columns: int = 50) -> str:
+        """
+        按显示宽度折行：中日韩字符算两列，可在任意字符间断行；
+        英文单词、数字保持完整，只在空白处断行
+        """
+        lines = []
+        current = ""
+        columns = 0
+        for token in TextLayoutCache._token_pattern.findall(text):
+            if token.isspace():
+                if current:
+                    current += " "
+                    columns += 1
+                continue
+            width = sum(2 if unicodedata.east_asian_width(ch) in "WF" else 1 for ch in token)
+            if columns + width > max_columns and current:
+                lines.append(current.rstrip())
+                current = ""
+                columns = 0
+            current += token
+            columns += width
+        if current:
+            lines.append(current.rstrip())
+        return "\n".join(lines)
 
 
 class TodoItemWidget(QWidget): # 单个待办事项组件
@@ -33,10 +188,18 @@ class TodoItemWidget(QWidget): # 单个待办事项组件
     moveDownRequested = Signal(object)  # 请求向下移动
     isDraggingOn = Signal(object)# 正在拖动信号
     isDraggingDown = Signal(object)# 停止拖动信号
+    textEdited = Signal(object)  # 用户编辑了文本
+    editFinished = Signal(object)  # 回车或失去焦点，结束编辑
+    completedToggled = Signal(object)  # 用户切换了完成状态
+    selectionToggled = Signal(object)  # Ctrl+单击切换选中状态
+    contextMenuRequested = Signal(object, QPoint)  # 只读状态下右键
+    multiLinePasted = Signal(object, str)  # 粘贴了多行文本
     
-    def __init__(self, text="", parent=None):
+    def __init__(self, text="", parent=None, record_id=None):
         super().__init__(parent)
+        self.record_id = record_id  # 对应TodoStore中的记录
         self.content_text = text
+        self.selected = False  # 是否处于多选状态
         self.setFixedHeight(32)
         self.setStyleSheet(f"""
             QToolTip {{
@@ -52,10 +215,8 @@ class TodoItemWidget(QWidget): # 单个待办事项组件
             border: none;
         """)
         
-        # 缓存字体度量，避免重复创建
-        self._font_metrics = None
-        self._cached_tooltip = None
-        self._last_tooltip_text = None
+        # 缩略文本在首次显示时才计算，提示文本在悬停时才计算
+        self._display_dirty = True
         
         # 拖动相关属性
         self.drag_start_global_y = 0
@@ -100,7 +261,9 @@ class TodoItemWidget(QWidget): # 单个待办事项组件
             }}
         """)
         self.text_field.mouseDoubleClickEvent = self.handle_double_click
-        self.handle_text_show()
+        self.text_field.mousePressEvent = self.handle_text_mouse_press
+        self.text_field.contextMenuEvent = self.handle_context_menu
+        self.text_field.keyPressEvent = self.handle_key_press
         
         self.drag_label = QLabel("  ☰  ")
         self.drag_label.setStyleSheet(f"color: {get_qss_color("todo_panel_todoitem_draglabel", "#888")}; font-size: 14px; font-weight: bold;")
@@ -110,8 +273,6 @@ class TodoItemWidget(QWidget): # 单个待办事项组件
         layout.addWidget(self.text_field)
         layout.addWidget(self.drag_label)
         
-        self.auto_wrap_tip()
-        
         self.text_field.editingFinished.connect(self.handle_return_pressed)
         self.text_field.textChanged.connect(self.on_text_changed)
         self.checkbox.clicked.connect(self.on_checkbox_clicked)
@@ -122,61 +283,39 @@ class TodoItemWidget(QWidget): # 单个待办事项组件
     def is_completed(self):
         return self.checkbox.isChecked()
     
-    def auto_wrap_tip(self):
-        text = self.content_text
-        
-        # 如果文本没变，使用缓存
-        if self._last_tooltip_text == text and self._cached_tooltip is not None:
-            self.setToolTip(self._cached_tooltip)
-            return
-            
-        max_length = 25
-        if len(text) > max_length:
-            words = text.split()
-            lines = []
-            current_line = ""
-            
-            for word in words:
-                if len(current_line + word) <= max_length:
-                    current_line += word + " "
-                else:
-                    if current_line:
-                        lines.append(current_line.strip())
-                    current_line = word + " "
-            
-            if current_line:
-                lines.append(current_line.strip())
-                
-            wrapped_text = '\n'.join(lines) if lines else text
-            self._cached_tooltip = wrapped_text
-        else:
-            self._cached_tooltip = text
-            
-        self._last_tooltip_text = text
-        self.setToolTip(self._cached_tooltip)
+    def event(self, event):
+        # 悬停时才生成提示文本，子控件未处理的ToolTip事件会传递到这里
+        if event.type() == QEvent.ToolTip:
+            if self.content_text.strip():
+                QToolTip.showText(event.globalPos(), TextLayoutCache.wrapped_tooltip(self.content_text), self)
+            else:
+                QToolTip.hideText()
+                event.ignore()
+            return True
+        return super().event(event)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._display_dirty:
+            self.handle_text_show()
             
     def handle_text_show(self):
-        """处理文本显示，带缓存优化"""
-        text = self.content_text
-        
-        # 缓存字体度量对象
-        if self._font_metrics is None:
-            self._font_metrics = QFontMetrics(self.text_field.font())
-            
+        """处理文本显示，缩略结果由所有事项共享缓存"""
+        font = self.text_field.font()
+        TextLayoutCache.metrics(font)
         max_width = 130
         
-        if self._font_metrics.horizontalAdvance(text) > max_width:
-            elided_text = self._font_metrics.elidedText(text, Qt.ElideRight, max_width) # 缩略显示
-            self.text_field.setText(elided_text)
-        else:
-            self.text_field.setText(text)
+        elided_text = TextLayoutCache.elided_text(self.content_text, max_width, font.key()) # 缩略显示
+        # 仅改变显示，不触发文本修改信号，避免缩略文本覆盖原文
+        self.text_field.blockSignals(True)
+        self.text_field.setText(elided_text)
+        self.text_field.blockSignals(False)
+        self._display_dirty = False
 
     def on_text_changed(self, event):
         if not self.text_field.isReadOnly():
             self.content_text = self.get_text()
-            # 清除标签缓存，因为文本已改变
-            self._cached_tags = None
-        self.auto_wrap_tip()
+            self.textEdited.emit(self)
         
     def handle_return_pressed(self):
         """处理回车键按下事件"""
@@ -184,6 +323,7 @@ class TodoItemWidget(QWidget): # 单个待办事项组件
         self.content_text = self.get_text()
         self.handle_text_show()
         self.clearFocus()
+        self.editFinished.emit(self)
         
     
     def handle_double_click(self, event):
@@ -193,13 +333,69 @@ class TodoItemWidget(QWidget): # 单个待办事项组件
         self.text_field.setFocus()
         self.text_field.selectAll()
         QLineEdit.mouseDoubleClickEvent(self.text_field, event)
+    
+    def handle_text_mouse_press(self, event):
+        """Ctrl+单击切换多选状态"""
+        if event.button() == Qt.LeftButton and event.modifiers() & Qt.ControlModifier:
+            self.selectionToggled.emit(self)
+            event.accept()
+            return
+        QLineEdit.mousePressEvent(self.text_field, event)
+    
+    def handle_context_menu(self, event):
+        """只读状态下使用批量操作菜单，编辑时保留输入框自带的菜单"""
+        if self.text_field.isReadOnly():
+            self.contextMenuRequested.emit(self, event.globalPos())
+            event.accept()
+            return
+        QLineEdit.contextMenuEvent(self.text_field, event)
+    
+    def handle_key_press(self, event):
+        """粘贴多行文本时交给面板批量创建事项"""
+        if event.key() in (Qt.Key_Return, Qt.Key_Enter, Qt.Key_Tab) and QApplication.activePopupWidget():
+            # 标签补全弹窗打开时，回车/Tab由补全器选中标签，不结束编辑
+            event.ignore()
+            return
+        if event.matches(QKeySequence.Paste):
+            text = QApplication.clipboard().text()
+            if "\n" in text.strip():
+                self.multiLinePasted.emit(self, text)
+                event.accept()
+                return
+        QLineEdit.keyPressEvent(self.text_field, event)
+        
+    def set_content(self, text, completed):
+        """用存储中的记录更新显示（记录在别处被修改时调用）"""
+        if text != self.content_text:
+            self.content_text = text
+            if self.isVisible():
+                self.handle_text_show()
+            else:
+                self._display_dirty = True
+        if completed != self.checkbox.isChecked():
+            self.checkbox.setChecked(completed)
+            self.update_text_style()
+    
+    def set_selected(self, selected):
+        if selected != self.selected:
+            self.selected = selected
+            self.update_text_style()
         
     def on_checkbox_clicked(self):
-        """复选框状态改变时的处理，优化样式更新"""
+        """复选框状态改变时的处理"""
+        self.update_text_style()
+        self.completedToggled.emit(self)
+        
+    def update_text_style(self):
+        """根据完成状态和选中状态更新文本样式"""
+        if self.selected:
+            background = get_qss_color("todo_panel_todoitem_selected_background", [74, 144, 226, 80])
+        else:
+            background = "transparent"
         if self.checkbox.isChecked():
             self.text_field.setStyleSheet(f"""
                 QLineEdit {{
-                    background-color: transparent;
+                    background-color: {background};
                     border: none;
                     color: {get_qss_color("todo_panel_todoitem_lineedit_finished", "#888")};
                     font-size: 12px;
@@ -210,7 +406,7 @@ class TodoItemWidget(QWidget): # 单个待办事项组件
         else:
             self.text_field.setStyleSheet(f"""
                 QLineEdit {{
-                    background-color: transparent;
+                    background-color: {background};
                     border: none;
                     color: {get_qss_color("todo_panel_todoitem_lineedit_foreground", "#ccc")};
                     font-size: 12px;
@@ -218,8 +414,6 @@ class TodoItemWidget(QWidget): # 单个待办事项组件
                     text-decoration: none;
                 }}
             """)
-        # 标记需要重新计算标签
-        self._cached_tags = None
         
     def mousePressEvent(self, event: QMouseEvent):
         if event.button() == Qt.LeftButton:
@@ -286,7 +480,12 @@ class TodoPanel(QWidget):
         self.setVisible(False)
         self.todo_visible = False
         self.selected_tags = set()  # 存储选中的标签
-        self.tag_refresh_in_progress = False  # 标签刷新进行中标志
+        self.excluded_tags = set()  # Shift+单击排除的标签
+        self.tag_query = None  # 搜索框中输入的标签查询语法树，如 [课程开发] AND NOT [已延期]
+        self._tag_index = None  # 标签位集合索引，存储或标签变化后重建
+        self._tag_changes = {}  # 尚未提交给标签worker的修改 {记录id: 文本或None}
+        self._tag_reset = True  # 下次刷新时提交全部记录
+        self.tag_generation = 0  # 标签刷新请求代号，用于丢弃过期结果
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 10, 0, 0)
@@ -334,15 +533,87 @@ class TodoPanel(QWidget):
         
         # 标签容器
         self.tag_container = QWidget()
-        self.tag_container.setStyleSheet("background-color: transparent;")
+        self.tag_container.setObjectName("tagContainer")
+        # 标签按钮样式只在容器上设置一次，由所有按钮共享
+        self.tag_container.setStyleSheet("#tagContainer { background-color: transparent; }" + self._get_tag_button_style())
         self.tag_layout = QHBoxLayout(self.tag_container)
         self.tag_layout.setContentsMargins(5, 0, 5, 0)
         self.tag_layout.setSpacing(5)
+        
+        # 标签按钮池，按钮只创建不销毁，刷新时按排名重新分配文本
+        self.tag_buttons = []
+        self.overflow_tags = []  # 超出显示数量的标签，放在“更多”菜单中
+        self.more_tag_button = QToolButton()
+        self.more_tag_button.setText("更多")
+        self.more_tag_button.setPopupMode(QToolButton.InstantPopup)
+        self.more_tag_menu = QMenu(self.more_tag_button)
+        self.more_tag_menu.aboutToShow.connect(self._populate_more_tag_menu)
+        self.more_tag_button.setMenu(self.more_tag_menu)
+        self.more_tag_button.setVisible(False)
+        self.tag_layout.addWidget(self.more_tag_button)
         self.tag_layout.addStretch()
         
         self.tag_scroll_area.setWidget(self.tag_container)
         layout.addWidget(self.tag_scroll_area)
         
+        # 搜索栏，可选同时搜索归档
+        self.search_bar = QWidget()
+        self.search_bar.setObjectName("searchBar")
+        self.search_bar.setStyleSheet(f"""
+            #searchBar {{
+                background-color: {get_qss_color("todo_panel_tagscrollarea_background", [50, 50, 50, 200])};
+            }}
+            QLineEdit {{
+                background-color: transparent;
+                border: none;
+                border-bottom: 1px solid {get_qss_color("todo_panel_todoitem_lineedit_focus", "#4a90e2")};
+                color: {get_qss_color("todo_panel_todoitem_lineedit_foreground", "#ccc")};
+                font-size: 12px;
+                padding: 2px;
+            }}
+            QListWidget {{
+                background-color: transparent;
+                border: none;
+                color: {get_qss_color("todo_panel_todoitem_lineedit_finished", "#888")};
+                font-size: 12px;
+            }}
+        """ + self._get_tag_button_style())
+        search_layout = QVBoxLayout(self.search_bar)
+        search_layout.setContentsMargins(15, 4, 15, 4)
+        search_layout.setSpacing(4)
+        search_row = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("搜索待办事项")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(lambda *args: self.on_search_changed())
+        self.archive_scope_button = QToolButton()
+        self.archive_scope_button.setText("含归档")
+        self.archive_scope_button.setCheckable(True)
+        self.archive_scope_button.toggled.connect(lambda *args: self.on_search_changed())
+        # 选中多个标签时的组合方式：任一(OR)或全部(AND)
+        self.tag_mode_button = QToolButton()
+        self.tag_mode_button.setText("任一标签")
+        self.tag_mode_button.setCheckable(True)
+        self.tag_mode_button.setToolTip("单击标签筛选，Shift+单击排除标签\n搜索框中可输入 [标签] AND NOT [标签] 形式的查询")
+        self.tag_mode_button.toggled.connect(self.on_tag_mode_toggled)
+        # 存在近似重复的事项时显示，选中后只显示重复的事项
+        self.duplicate_button = QToolButton()
+        self.duplicate_button.setCheckable(True)
+        self.duplicate_button.setVisible(False)
+        self.duplicate_button.setToolTip("只显示近似重复的事项\n右键事项可合并重复项")
+        self.duplicate_button.toggled.connect(lambda *args: self.filter_todos_by_tags())
+        search_row.addWidget(self.search_edit)
+        search_row.addWidget(self.tag_mode_button)
+        search_row.addWidget(self.duplicate_button)
+        search_row.addWidget(self.archive_scope_button)
+        search_layout.addLayout(search_row)
+        # 归档中的匹配结果
+        self.archive_result_list = QListWidget()
+        self.archive_result_list.setMaximumHeight(100)
+        self.archive_result_list.setVisible(False)
+        search_layout.addWidget(self.archive_result_list)
+        layout.addWidget(self.search_bar)
+        
         # 滚动区域
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
@@ -383,13 +654,87 @@ class TodoPanel(QWidget):
         self.mousePressEvent = self.handle_all_area_click
         self.scroll_area.mouseDoubleClickEvent = self.handle_scroll_area_double_click
         
-        # 存储待办事项
-        self.todo_items = []
+        # 常驻的标签提取线程
+        self.tag_worker = TagRefreshWorker()
+        self.tag_thread = QThread()
+        self.tag_worker.moveToThread(self.tag_thread)
+        self.tag_thread.started.connect(self.tag_worker.run)
+        self.tag_worker.finished.connect(self.on_tags_refreshed)
+        self.tag_thread.start()
+        # 线程和worker没有父对象，登记后资源占用页面的Qt对象统计才能看到它们
+        SelfMonitor.register_root(self.tag_worker)
+        SelfMonitor.register_root(self.tag_thread)
+        app = QApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.stop_tag_worker)
+        
+        # 待办事项数据保存在TodoStore中，控件只负责显示
+        self.store = TodoStore()
+        self.store.subscribe(self.on_store_changed)
+        # 输入时只记下修改的控件，停止输入片刻或结束编辑后才写入存储、更新索引和保存
+        self._pending_edits = {}  # 记录id -> 输入中的控件
+        self.edit_commit_timer = QTimer(self)
+        self.edit_commit_timer.setSingleShot(True)
+        self.edit_commit_timer.setInterval(300)
+        self.edit_commit_timer.timeout.connect(self.save_todos)
+        self.item_widgets = {}  # 记录id -> 控件
+        self.selected_ids = set()  # Ctrl+单击多选的记录id
+        self.archive = TodoArchive()  # 已完成事项移入归档，不再留在todos.json中
+        self.search_index = SearchIndex()  # 随存储修改增量维护
+        self.duplicates = DuplicateDetector()  # 近似重复检测，随存储修改增量维护
+        self.search_matches = None  # 搜索命中的记录id，None表示未搜索
+        self.archive_index = None  # 归档的搜索索引，首次搜索归档时才建立
+        self.archive_texts = {}  # 归档记录id -> (完成时间, 文本)
         self.all_tags = set()  # 存储所有标签
+        self.tag_trie = TagTrie()  # 标签补全，随事项修改和标签提取结果增量更新
+        self._completion_tags = {}  # 记录id -> 该记录计入前缀树的标签
+        self._setup_tag_completer()
         self.load_todos()
+        
+        # 监视todo文件，命令行工具等其他进程写入的修改在短暂延迟后一起读入
+        self.todo_file_timer = QTimer(self)
+        self.todo_file_timer.setSingleShot(True)
+        self.todo_file_timer.setInterval(100)
+        self.todo_file_timer.timeout.connect(self.reload_external_todos)
+        self.todo_file_watcher = QFileSystemWatcher(self)
+        self.todo_file_watcher.fileChanged.connect(lambda path: self.todo_file_timer.start())
+        self.todo_file_watcher.directoryChanged.connect(lambda path: self.todo_file_timer.start())
+        self._watch_todo_file()
+        
+        # 没有输入框获得焦点时，Ctrl+V把剪贴板的每一行添加为一个事项
+        self.paste_shortcut = QShortcut(QKeySequence.Paste, self)
+        self.paste_shortcut.setContext(Qt.WidgetWithChildrenShortcut)
+        self.paste_shortcut.activated.connect(lambda: self.paste_todos(QApplication.clipboard().text()))
+    
+    def _setup_tag_completer(self):
+        """所有事项共用一个补全弹窗，候选项直接来自前缀树，不再由QCompleter过滤"""
+        self.completion_model = QStringListModel(self)
+        self.tag_completer = QCompleter(self.completion_model, self)
+        self.tag_completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.tag_completer.setMaxVisibleItems(8)
+        self.tag_completer.activated[str].connect(self.insert_tag_completion)
+        self.completion_item = None  # 正在补全的事项控件
+        self.tag_completer.popup().setStyleSheet(f"""
+            QListView {{
+                background-color: {get_qss_color("todo_panel_todoitem_background", [50, 50, 50, 100])};
+                color: {get_qss_color("todo_panel_todoitem_foreground", "#ccc")};
+                border: none;
+                font-size: 12px;
+            }}
+            QListView::item:selected {{
+                background-color: {get_qss_color("todo_panel_todoitem_selected_background", [74, 144, 226, 80])};
+            }}
+        """)
+    
+    def stop_tag_worker(self):
+        """退出时停止标签提取线程"""
+        self.tag_worker.stop()
+        self.tag_thread.quit()
+        self.tag_thread.wait(1000)
     
     def handle_all_area_click(self, event):
         """处理在空白处的点击事件"""
+        self.clear_selection()
         self.save_todos()
         self.update_todo_list()
                 
@@ -403,143 +748,438 @@ class TodoPanel(QWidget):
         self.update_todo_list()
         # 添加新项目
         new_item = self.add_todo_item("", is_new=True)
-        new_item.text_field.textChanged.connect(self.on_text_changed)
         new_item.text_field.returnPressed.connect(lambda: self.on_return_pressed(new_item))
         # 当项目被标记为完成时，失去焦点后自动销毁
         new_item.checkbox.clicked.connect(lambda: self.on_checkbox_clicked(new_item))
         
     def add_todo_item(self, text="", is_new=False):
-        todo_widget = TodoItemWidget(text)
-        # 插入到倒数第二个位置（在Stretch之前）
-        self.todo_layout.insertWidget(self.todo_layout.count() - 1, todo_widget)
-        self.todo_items.append(todo_widget)
+        """向存储中添加事项，返回为其创建的控件"""
+        record = self.store.add(text)
+        todo_widget = self.item_widgets[record.id]
         
         if is_new:
             todo_widget.text_field.setReadOnly(False)
             todo_widget.text_field.setFocus()
             todo_widget.text_field.selectAll()
             
+        return todo_widget
+    
+    def on_store_changed(self, change):
+        """根据存储的修改增量更新控件"""
+        self.todo_container.setUpdatesEnabled(False)
+        if change.reset:
+            for todo_id in list(self.item_widgets):
+                self._remove_item_widget(todo_id)
+            for record in self.store.records():
+                self._create_item_widget(record)
+        else:
+            for todo_id in change.removed:
+                self._remove_item_widget(todo_id)
+            if change.added:
+                # 按存储顺序创建，批量添加后无需再移动控件
+                for record in self.store.records():
+                    if record.id in change.added:
+                        self._create_item_widget(record)
+            for todo_id in change.updated:
+                record = self.store.get(todo_id)
+                self.item_widgets[todo_id].set_content(record.text, record.completed)
+            if change.added or change.reordered:
+                self._sync_layout_order()
+        self.todo_container.setUpdatesEnabled(True)
+        self._update_search_index(change)
+        self._update_duplicates(change)
+        self._update_completion_tags(change)
+        self._tag_index = None
+        
+        # 记录需要重新提取标签的事项，下次refresh_tags时一起提交
+        if change.reset:
+            self._tag_reset = True
+            self._tag_changes.clear()
+        else:
+            for todo_id in change.removed:
+                self._tag_changes[todo_id] = None
+            for todo_id in change.added | change.updated:
+                self._tag_changes[todo_id] = self.store.get(todo_id).text
+    
+    def _update_search_index(self, change):
+        """根据存储的修改增量更新搜索索引"""
+        if change.reset:
+            self.search_index.clear()
+            self.search_index.add_many((record.id, record.text) for record in self.store.records())
+            return
+        for todo_id in change.removed:
+            self.search_index.remove(todo_id)
+        for todo_id in change.added | change.updated:
+            self.search_index.add(todo_id, self.store.get(todo_id).text)
+    
+    def _update_duplicates(self, change):
+        """根据存储的修改增量更新重复检测，并刷新重复按钮"""
+        if change.reset:
+            self.duplicates.clear()
+            for record in self.store.records():
+                self.duplicates.add(record.id, record.text)
+        else:
+            for todo_id in change.removed:
+                self.duplicates.remove(todo_id)
+            for todo_id in change.added | change.updated:
+                self.duplicates.add(todo_id, self.store.get(todo_id).text)
+        
+        group_count = len(self.duplicates.groups())
+        self.duplicate_button.setText(f"重复 ({group_count})")
+        if not group_count and self.duplicate_button.isChecked():
+            self.duplicate_button.setChecked(False)
+        self.duplicate_button.setVisible(bool(group_count))
+    
+    def _update_completion_tags(self, change):
+        """根据存储的修改增量更新补全前缀树"""
+        if change.reset:
+            self.tag_trie.clear()
+            self._completion_tags.clear()
+            for record in self.store.records():
+                self._set_completion_tags(record.id)
+            return
+        for todo_id in change.removed | change.added | change.updated:
+            self._set_completion_tags(todo_id)
+    
+    def _set_completion_tags(self, todo_id):
+        """前缀树中的计数为包含该标签的事项数：[]标签即时计入，提取的标签在结果返回后计入"""
+        record = self.store.get(todo_id)
+        if record is None:
+            tags = frozenset()
+        else:
+            tags = LightweightTagExtractor.todo_tags(record.text, record.tags)
+        old_tags = self._completion_tags.get(todo_id, frozenset())
+        if tags == old_tags:
+            return
+        for tag in old_tags - tags:
+            self.tag_trie.add(tag, -1)
+        for tag in tags - old_tags:
+            self.tag_trie.add(tag, 1)
+        if tags:
+            self._completion_tags[todo_id] = tags
+        else:
+            self._completion_tags.pop(todo_id, None)
+    
+    def update_tag_completion(self, item):
+        """输入[后按光标前的前缀弹出标签补全"""
+        line_edit = item.text_field
+        before = line_edit.text()[:line_edit.cursorPosition()]
+        start = before.rfind("[")
+        prefix = before[start + 1:]
+        if start < 0 or not re.fullmatch(r'[\u4e00-\u9fff\w]*', prefix):
+            self.tag_completer.popup().hide()
+            return
+        # 前缀树节点缓存了前K个标签，查询与标签总数无关
+        suggestions = [tag for tag in self.tag_trie.complete(prefix) if tag != prefix]
+        if not suggestions:
+            self.tag_completer.popup().hide()
+            return
+        self.completion_item = item
+        self.completion_model.setStringList(suggestions)
+        self.tag_completer.setWidget(line_edit)
+        self.tag_completer.complete()
+    
+    def insert_tag_completion(self, tag):
+        """用选中的标签替换[之后的前缀并补上]"""
+        item = self.completion_item
+        if item is None or item.text_field.isReadOnly():
+            return
+        line_edit = item.text_field
+        text = line_edit.text()
+        cursor = line_edit.cursorPosition()
+        start = text.rfind("[", 0, cursor)
+        if start < 0:
+            return
+        inserted = tag if text[cursor:cursor + 1] == "]" else tag + "]"
+        line_edit.setText(text[:start + 1] + inserted + text[cursor:])
+        line_edit.setCursorPosition(start + 1 + len(tag) + 1)
+        self.tag_completer.popup().hide()
+    
+    def _create_item_widget(self, record):
+        """为记录创建控件，插入到Stretch之前"""
+        todo_widget = TodoItemWidget(record.text, record_id=record.id)
+        if record.completed:
+            todo_widget.checkbox.setChecked(True)
+            todo_widget.update_text_style()
+        self.todo_layout.insertWidget(self.todo_layout.count() - 1, todo_widget)
+        self.item_widgets[record.id] = todo_widget
+        
+        # 控件上的修改写回存储
+        todo_widget.textEdited.connect(self.queue_text_edit)
+        todo_widget.textEdited.connect(self.update_tag_completion)
+        todo_widget.editFinished.connect(lambda w: self.save_todos())
+        todo_widget.completedToggled.connect(lambda w: self.store.update(w.record_id, completed=w.is_completed()))
+        # 批量操作
+        todo_widget.selectionToggled.connect(self.toggle_item_selection)
+        todo_widget.contextMenuRequested.connect(self.show_item_context_menu)
+        todo_widget.multiLinePasted.connect(lambda w, text: self.paste_todos(text, w))
         # 连接拖动信号
         todo_widget.moveUpRequested.connect(self.move_item_up)
         todo_widget.moveDownRequested.connect(self.move_item_down)
         # 连接拖动信号，使用lambda函数修改self.is_dragging的值为True或False
-        todo_widget.isDraggingOn.connect(lambda: setattr(self, 'is_dragging', True))
-        todo_widget.isDraggingDown.connect(lambda: setattr(self, 'is_dragging', False))
         todo_widget.isDraggingOn.connect(lambda *args: setattr(self, 'is_dragging', True))
         todo_widget.isDraggingDown.connect(lambda *args: setattr(self, 'is_dragging', False))
-            
+        todo_widget.isDraggingDown.connect(self.finish_item_drag)
         return todo_widget
+    
+    def queue_text_edit(self, item):
+        """每次按键只重新计时，不修改存储"""
+        self._pending_edits[item.record_id] = item
+        self.edit_commit_timer.start()
+    
+    def commit_pending_edits(self):
+        """把输入中的文本一次写入存储，之后才更新搜索、重复检测、补全等索引"""
+        self.edit_commit_timer.stop()
+        if not self._pending_edits:
+            return
+        edits, self._pending_edits = self._pending_edits, {}
+        self.store.update_many({todo_id: {"text": item.content_text}
+                                for todo_id, item in edits.items() if todo_id in self.store})
+    
+    def _remove_item_widget(self, todo_id):
+        widget = self.item_widgets.pop(todo_id, None)
+        self.selected_ids.discard(todo_id)
+        if widget is not None:
+            self.todo_layout.removeWidget(widget)
+            widget.deleteLater()
+    
+    def _sync_layout_order(self):
+        """按存储中的顺序调整布局，只移动位置不对的控件"""
+        for index, record in enumerate(self.store.records()):
+            widget = self.item_widgets[record.id]
+            if self.todo_layout.itemAt(index).widget() is not widget:
+                self.todo_layout.removeWidget(widget)
+                self.todo_layout.insertWidget(index, widget)
+        
+    def toggle_item_selection(self, item):
+        """切换事项的多选状态"""
+        if item.record_id in self.selected_ids:
+            self.selected_ids.discard(item.record_id)
+            item.set_selected(False)
+        else:
+            self.selected_ids.add(item.record_id)
+            item.set_selected(True)
+    
+    def clear_selection(self):
+        for todo_id in self.selected_ids:
+            widget = self.item_widgets.get(todo_id)
+            if widget is not None:
+                widget.set_selected(False)
+        self.selected_ids.clear()
+    
+    def show_item_context_menu(self, item, pos):
+        """显示批量操作菜单，右键未选中的事项时只对该事项操作"""
+        if item.record_id not in self.selected_ids:
+            self.clear_selection()
+            self.toggle_item_selection(item)
+        
+        count = len(self.selected_ids)
+        menu = QMenu(self)
+        menu.addAction(f"完成所选 ({count})", self.complete_selected)
+        menu.addAction(f"删除所选 ({count})", self.delete_selected)
+        menu.addAction("批量替换…", self.replace_in_selected)
+        group = self.duplicates.group_of(item.record_id)
+        if group:
+            menu.addAction(f"合并重复项 ({len(group)})", lambda: self.merge_duplicates([item.record_id]))
+        group_count = len(self.duplicates.groups())
+        if group_count:
+            menu.addAction(f"合并全部重复 ({group_count}组)", self.merge_all_duplicates)
+        menu.addSeparator()
+        menu.addAction("取消选择", self.clear_selection)
+        menu.exec(pos)
+    
+    def _finish_bulk_change(self):
+        """批量修改结束后只保存一次、刷新一次标签"""
+        self.save_todos()
+        self.refresh_tags()
+        self.filter_todos_by_tags()
+    
+    def complete_selected(self):
+        """将所选事项标记为完成"""
+        todo_ids = list(self.selected_ids)
+        self.clear_selection()
+        self.store.update_many({todo_id: {"completed": True} for todo_id in todo_ids})
+        self._finish_bulk_change()
+    
+    def delete_selected(self):
+        """删除所选事项"""
+        todo_ids = list(self.selected_ids)
+        self.clear_selection()
+        self.store.remove_many(todo_ids)
+        self._finish_bulk_change()
+    
+    def replace_in_selected(self):
+        """在所选事项中查找替换文本，可用于批量修改标签"""
+        find_text, ok = QInputDialog.getText(self, "批量替换", "查找：")
+        if not ok or not find_text:
+            return
+        replace_text, ok = QInputDialog.getText(self, "批量替换", f"将“{find_text}”替换为：")
+        if not ok:
+            return
+        
+        changes = {}
+        for todo_id in self.selected_ids:
+            record = self.store.get(todo_id)
+            if record is not None and find_text in record.text:
+                new_text = record.text.replace(find_text, replace_text)
+                if new_text.strip():
+                    changes[todo_id] = {"text": new_text}
+        self.clear_selection()
+        if changes:
+            self.store.update_many(changes)
+            self._finish_bulk_change()
+    
+    def quick_add(self, text):
+        """从命令行添加一个事项"""
+        if text.strip():
+            self.store.add(text.strip())
+            self._finish_bulk_change()
+    
+    def merge_duplicates(self, todo_ids):
+        """
+        合并每个事项所在的重复组：保留该事项，其余事项中它没有的[标签]追加到末尾后删除
+        组内有未完成的事项时保留的事项也标记为未完成
+        """
+        with self.store.batch():
+            for todo_id in todo_ids:
+                keep = self.store.get(todo_id)
+                group = self.duplicates.group_of(todo_id)
+                if keep is None or not group:
+                    continue
+                others = [self.store.get(other) for other in group if other != todo_id]
+                others = [record for record in others if record is not None]
+                text = keep.text
+                for record in others:
+                    for tag in LightweightTagExtractor.extract_hashtag_tags(record.text):
+                        if f"[{tag}]" not in text:
+                            text += f" [{tag}]"
+                completed = keep.completed and all(record.completed for record in others)
+                self.store.remove_many([record.id for record in others])
+                self.store.update(todo_id, text=text, completed=completed)
+        self.clear_selection()
+        self._finish_bulk_change()
+    
+    def merge_all_duplicates(self):
+        """合并所有重复组，每组保留排在最前面的事项"""
+        keep_ids = [min(group, key=lambda todo_id: self.store.get(todo_id).order)
+                    for group in self.duplicates.groups()]
+        self.merge_duplicates(keep_ids)
+    
+    def paste_todos(self, text, item=None):
+        """把多行文本的每一行添加为一个事项，粘贴到空的新事项中时替换该事项"""
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        if not lines:
+            return
+        
+        self.commit_pending_edits()
+        with self.store.batch():
+            if item is not None:
+                record = self.store.get(item.record_id)
+                if record is not None and not record.text.strip():
+                    self.store.remove(record.id)
+            self.store.add_many(lines)
+        self._finish_bulk_change()
         
     def move_item_up(self, item):
-        """向上移动项目"""
+        """拖动过程中向上移动项目，只调整布局，松开时才写入存储"""
         index = self.todo_layout.indexOf(item)
         if index > 0:
             self.todo_layout.removeWidget(item)
             self.todo_layout.insertWidget(index - 1, item)
             
     def move_item_down(self, item):
-        """向下移动项目"""
+        """拖动过程中向下移动项目"""
         index = self.todo_layout.indexOf(item)
         # 确保不是最后一个有效项目（前面还有Stretch）
         if index < self.todo_layout.count() - 2:
             self.todo_layout.removeWidget(item)
             self.todo_layout.insertWidget(index + 1, item)
+    
+    def finish_item_drag(self, item):
+        """松开拖动时按最终位置移动记录，只有被移动的记录会被保存"""
+        index = self.todo_layout.indexOf(item)
+        if index >= 0 and index != self.store.index_of(item.record_id):
+            self.store.move(item.record_id, index)
+            self.save_todos()
         
+    @profile_slot
     def refresh_tags(self):
-        """异步刷新标签按钮，优化性能"""
-        # 如果正在刷新，跳过
-        if self.tag_refresh_in_progress:
-            return
-            
-        self.tag_refresh_in_progress = True
-        
-        # 收集待办事项列表（只收集有内容的项目）
-        todo_items = []
-        for i in range(self.todo_layout.count() - 1):  # 排除最后的Stretch
-            widget = self.todo_layout.itemAt(i).widget()
-            if isinstance(widget, TodoItemWidget) and widget.content_text.strip():
-                todo_items.append(widget)
-        
-        # 如果没有待办事项，直接返回
-        if not todo_items:
-            self.all_tags = set()
-            self.tag_refresh_in_progress = False
-            # 清理所有标签按钮
-            self._clear_all_tag_buttons()
+        """把上次刷新后修改过的事项提交给后台线程，没有修改时不提交"""
+        if self._tag_reset:
+            # 只提交文本快照，不把控件或记录对象传到后台线程
+            changes = {record.id: record.text for record in self.store.records()}
+        elif self._tag_changes:
+            changes = self._tag_changes
+        else:
             return
         
-        # 创建worker和线程
-        self.tag_worker = TagRefreshWorker(todo_items)
-        self.tag_thread = QThread()
-        self.tag_worker.moveToThread(self.tag_thread)
+        self.tag_generation += 1
+        self.tag_worker.request(self.tag_generation, changes, reset=self._tag_reset)
+        self._tag_changes = {}
+        self._tag_reset = False
+    
+    @trace_slot
+    @profile_slot
+    def on_tags_refreshed(self, generation, result):
+        """写入各记录的标签，并按TF-IDF更新标签栏"""
+        # 每个结果都包含一部分记录的标签，即使已有更新的请求也要写入
+        for todo_id, (text, tags) in result["tags"].items():
+            record = self.store.get(todo_id)
+            # 文本在提取期间又被修改过的记录等待下一次结果
+            if record is not None and record.text == text:
+                self.store.set_tags(todo_id, tags)
+                self._set_completion_tags(todo_id)
+        self._tag_index = None
         
-        # 连接信号
-        self.tag_worker.finished.connect(self.on_tags_refreshed)
-        self.tag_thread.started.connect(self.tag_worker.run)
-        self.tag_worker.finished.connect(self.tag_thread.quit)
-        self.tag_worker.finished.connect(self.tag_worker.deleteLater)
-        self.tag_thread.finished.connect(self.tag_thread.deleteLater)
+        # 标签栏只按最新一次请求的结果更新，较早的结果只用于重新筛选
+        if generation != self.tag_generation:
+            self.filter_todos_by_tags()
+            return
         
-        # 启动线程
-        self.tag_thread.start()
+        ranked_tags = result["ranking"]
+        self.all_tags = set(ranked_tags)
+        # 只显示前K个，其余放入“更多”菜单
+        max_tags = get_tag_bar_max_tags()
+        self._update_tag_buttons(ranked_tags[:max_tags])
+        self.overflow_tags = ranked_tags[max_tags:]
+        self.more_tag_button.setText(f"更多 ({len(self.overflow_tags)})")
+        self.more_tag_button.setVisible(bool(self.overflow_tags))
     
-    def _clear_all_tag_buttons(self):
-        """清理所有标签按钮"""
-        for i in reversed(range(self.tag_layout.count() - 1)):
-            widget = self.tag_layout.itemAt(i).widget()
-            if widget:
-                widget.deleteLater()
-    
-    def on_tags_refreshed(self, all_tags):
-        """标签刷新完成后的处理，优化按钮重用"""
-        self.all_tags = all_tags
-        self.tag_refresh_in_progress = False
-        
-        # 获取当前按钮列表
-        current_buttons = {}
-        for i in range(self.tag_layout.count()):
-            widget = self.tag_layout.itemAt(i).widget()
-            if isinstance(widget, QToolButton):
-                current_buttons[widget.text()] = widget
-        
-        # 需要保留的标签
-        tags_to_keep = set(self.all_tags)
-        current_tags = set(current_buttons.keys())
-        
-        # 删除不需要的按钮
-        tags_to_remove = current_tags - tags_to_keep
-        for tag in tags_to_remove:
-            if tag in current_buttons:
-                button = current_buttons[tag]
-                self.tag_layout.removeWidget(button)
-                button.deleteLater()
-        
-        # 添加新按钮或重用现有按钮
-        sorted_tags = sorted(list(self.all_tags))
-        existing_buttons = {tag: current_buttons[tag] for tag in sorted_tags if tag in current_buttons}
-        
-        # 重新排列按钮
-        for i, tag in enumerate(sorted_tags):
-            if tag in existing_buttons:
-                # 重用现有按钮
-                button = existing_buttons[tag]
-                button.setChecked(tag in self.selected_tags)
-                # 确保按钮在正确位置
-                current_index = self.tag_layout.indexOf(button)
-                if current_index != i:
-                    self.tag_layout.removeWidget(button)
-                    self.tag_layout.insertWidget(i, button)
+    def _update_tag_buttons(self, tags):
+        """把标签依次分配给池中的按钮，按钮不够时才创建"""
+        self.tag_container.setUpdatesEnabled(False)
+        while len(self.tag_buttons) < len(tags):
+            button = self._create_tag_button()
+            self.tag_layout.insertWidget(len(self.tag_buttons), button)
+            self.tag_buttons.append(button)
+        
+        for i, button in enumerate(self.tag_buttons):
+            if i < len(tags):
+                button.setText(tags[i])
+                button.setVisible(True)
             else:
-                # 创建新按钮
-                button = self._create_tag_button(tag)
-                self.tag_layout.insertWidget(i, button)
+                button.setVisible(False)
+        self._refresh_tag_button_states()
+        self.tag_container.setUpdatesEnabled(True)
+    
+    def _refresh_tag_button_states(self):
+        """按选中/排除状态更新按钮，排除状态通过动态属性交给样式表显示"""
+        for button in self.tag_buttons:
+            # 只跳过池中闲置的按钮，面板隐藏时isVisible()全为False，但复用的按钮仍要更新
+            if button.isHidden():
+                continue
+            tag = button.text()
+            button.setChecked(tag in self.selected_tags)
+            excluded = tag in self.excluded_tags
+            if button.property("excluded") != excluded:
+                button.setProperty("excluded", excluded)
+                button.style().unpolish(button)
+                button.style().polish(button)
     
-    def _create_tag_button(self, tag):
-        """创建标签按钮，提取公共逻辑"""
+    def _create_tag_button(self):
+        """创建池中的标签按钮，样式由容器统一提供"""
         tag_button = QToolButton()
-        tag_button.setText(tag)
         tag_button.setCheckable(True)
-        tag_button.setChecked(tag in self.selected_tags)
         
         # 设置固定字体
         font = tag_button.font()
@@ -547,12 +1187,24 @@ class TodoPanel(QWidget):
         font.setFamily("Microsoft YaHei UI")
         tag_button.setFont(font)
         
-        # 使用预定义样式
-        tag_button.setStyleSheet(self._get_tag_button_style())
-        tag_button.clicked.connect(lambda checked, t=tag: self.toggle_tag_filter(t))
+        # 按钮会被复用，点击时读取当前文本
+        tag_button.clicked.connect(lambda checked, b=tag_button: self.toggle_tag_filter(b.text()))
         
         return tag_button
     
+    def _populate_more_tag_menu(self):
+        """打开“更多”菜单时才创建菜单项"""
+        self.more_tag_menu.clear()
+        max_items = 300
+        for tag in self.overflow_tags[:max_items]:
+            action = self.more_tag_menu.addAction(f"不含 {tag}" if tag in self.excluded_tags else tag)
+            action.setCheckable(True)
+            action.setChecked(tag in self.selected_tags or tag in self.excluded_tags)
+            action.triggered.connect(lambda checked, t=tag: self.toggle_tag_filter(t))
+        if len(self.overflow_tags) > max_items:
+            action = self.more_tag_menu.addAction(f"…还有 {len(self.overflow_tags) - max_items} 个标签")
+            action.setEnabled(False)
+    
     def _get_tag_button_style(self):
         """获取标签按钮样式字符串"""
         return f"""
@@ -575,102 +1227,183 @@ class TodoPanel(QWidget):
             QToolButton:checked:hover {{
                 background-color: {get_qss_color("todo_panel_tagbutton_checked_hover_background", "#5aa0f0")};
             }}
+            QToolButton[excluded="true"] {{
+                background-color: {get_qss_color("todo_panel_tagbutton_excluded_background", "#a05050")};
+                color: {get_qss_color("todo_panel_tagbutton_checked_foreground", "white")};
+                text-decoration: line-through;
+            }}
+            QToolButton::menu-indicator {{
+                image: none;
+            }}
         """
             
     def toggle_tag_filter(self, tag):
-        """切换标签筛选状态"""
-        if tag in self.selected_tags:
-            self.selected_tags.remove(tag)
+        """切换标签筛选状态，按住Shift时切换排除状态"""
+        if QApplication.keyboardModifiers() & Qt.ShiftModifier:
+            self.selected_tags.discard(tag)
+            self.excluded_tags ^= {tag}
         else:
-            self.selected_tags.add(tag)
-            
+            self.excluded_tags.discard(tag)
+            self.selected_tags ^= {tag}
+        
+        self._refresh_tag_button_states()
         self.filter_todos_by_tags()
+    
+    def on_tag_mode_toggled(self, match_all):
+        self.tag_mode_button.setText("全部标签" if match_all else "任一标签")
+        if len(self.selected_tags) > 1:
+            self.filter_todos_by_tags()
+    
+    def _get_tag_index(self):
+        """
+        按当前记录顺序建立标签位集合索引，不在GUI线程中提取标签：
+        尚未返回提取结果的记录只按[]标签处理，结果返回后重建索引并重新筛选
+        """
+        if self._tag_index is None:
+            records = self.store.records()
+            self._tag_index = TagBitsetIndex([record.id for record in records],
+                                             [LightweightTagExtractor.todo_tags(record.text, record.tags)
+                                              for record in records])
+        return self._tag_index
         
+    @profile_slot
     def filter_todos_by_tags(self):
-        """根据选中的标签过滤待办事项，优化性能"""
-        # 如果没有选中的标签，显示所有事项
-        if not self.selected_tags:
-            for i in range(self.todo_layout.count() - 1):  # 排除最后的Stretch
-                widget = self.todo_layout.itemAt(i).widget()
-                if isinstance(widget, TodoItemWidget):
-                    widget.setVisible(True)
+        """把标签条件、标签查询和搜索结果合并为一个位集合，再一次遍历设置可见性"""
+        has_tag_filter = self.selected_tags or self.excluded_tags or self.tag_query is not None
+        # 没有筛选条件时显示所有事项
+        if not has_tag_filter and self.search_matches is None and not self.duplicate_button.isChecked():
+            for widget in self.item_widgets.values():
+                widget.setVisible(True)
             return
-            
-        # 否则只显示包含选中标签的事项
-        for i in range(self.todo_layout.count() - 1):  # 排除最后的Stretch
-            widget = self.todo_layout.itemAt(i).widget()
-            if isinstance(widget, TodoItemWidget):
-                # 使用缓存的标签或重新提取
-                if not hasattr(widget, '_cached_tags') or widget._cached_tags is None:
-                    widget._cached_tags = TodoTagExtractor.extract_tags(widget.content_text)
-                
-                tags = widget._cached_tags
-                # 检查是否有任意一个选中的标签在该事项的标签中
-                if any(tag in tags for tag in self.selected_tags):
-                    widget.setVisible(True)
-                else:
-                    widget.setVisible(False)
+        
+        index = self._get_tag_index()
+        mask = index.all_mask
+        if self.selected_tags or self.excluded_tags:
+            mask &= index.select(self.selected_tags, self.excluded_tags, self.tag_mode_button.isChecked())
+        if self.tag_query is not None:
+            mask &= index.evaluate(self.tag_query)
+        if self.search_matches is not None:
+            mask &= index.mask_of(self.search_matches)
+        if self.duplicate_button.isChecked():
+            mask &= index.mask_of(self.duplicates.duplicate_keys())
+        
+        for todo_id, visible in zip(index.ids, index.iter_bits(mask)):
+            self.item_widgets[todo_id].setVisible(visible)
+    
+    @trace_slot
+    def on_search_changed(self):
+        """输入搜索词时立即筛选，勾选“含归档”时同时列出归档中的匹配"""
+        query = self.search_edit.text().strip()
+        # 含有[标签]时按标签查询解析，解析失败则按普通文本搜索
+        self.tag_query = None
+        if "[" in query:
+            try:
+                self.tag_query = parse_tag_query(query)
+            except ValueError:
+                pass
+        if query and self.tag_query is None:
+            self.search_matches = set(self.search_index.search(query))
+        else:
+            self.search_matches = None
+        self.filter_todos_by_tags()
+        
+        self.archive_result_list.clear()
+        if not query or self.tag_query is not None or not self.archive_scope_button.isChecked():
+            self.archive_result_list.setVisible(False)
+            return
+        
+        if self.archive_index is None:
+            self._build_archive_index()
+        results = self.archive_index.search(query, limit=50)
+        for todo_id in results:
+            completed_at, text = self.archive_texts[todo_id]
+            self.archive_result_list.addItem(f"{time.strftime('%Y-%m-%d', time.localtime(completed_at))}  {text}")
+        if not results:
+            self.archive_result_list.addItem("归档中没有匹配的事项")
+        self.archive_result_list.setVisible(True)
+    
+    def _build_archive_index(self):
+        """读取全部归档建立搜索索引"""
+        self.archive_index = SearchIndex()
+        self.archive_texts = {}
+        self.archive.reload()
+        for item in reversed(list(self.archive.iter_items())):
+            self.archive_index.add(item["id"], item["text"])
+            self.archive_texts[item["id"]] = (item.get("completed_at", 0), item["text"])
                     
+    @trace_slot
     def load_todos(self):
         try:
-            todo_file_source = get_todo_file_name()
-            if os.path.exists(todo_file_source):
-                with open(todo_file_source, "r", encoding="utf-8") as f:
-                    todos = json.load(f)
-                    for todo in todos:
-                        self.add_todo_item(todo["text"])
+            self.store.load(get_todo_file_name())
         except Exception as e:
             print(f"加载待办事项出错: {e}")
         finally:
             # 加载完成后刷新标签
             self.refresh_tags()
             
+    def _watch_todo_file(self):
+        """监视快照、日志及其所在目录；快照被替换或日志新建后需要重新加入"""
+        path = get_todo_file_name()
+        watched = set(self.todo_file_watcher.files()) | set(self.todo_file_watcher.directories())
+        for watch_path in (os.path.dirname(os.path.abspath(path)), path, path + JOURNAL_SUFFIX):
+            if watch_path not in watched and os.path.exists(watch_path):
+                self.todo_file_watcher.addPath(watch_path)
+    
+    @trace_slot
+    def reload_external_todos(self):
+        """读入其他进程追加的修改，本进程自己保存触发的通知不会读到新内容"""
+        self._watch_todo_file()
+        # 先写入输入中的文本，合并时按本进程未保存的修改处理
+        self.commit_pending_edits()
+        try:
+            changed = self.store.refresh(get_todo_file_name())
+        except (OSError, ValueError) as e:
+            print(f"读取外部修改出错: {e}")
+            return
+        if changed:
+            self.refresh_tags()
+            self.filter_todos_by_tags()
+            
+    @trace_slot
+    @profile_slot
     def save_todos(self):
-        todos = []
-        todo_file_source = get_todo_file_name()
-        for i in range(self.todo_layout.count() - 1):  # 排除最后的Stretch
-            widget = self.todo_layout.itemAt(i).widget()
-            if isinstance(widget, TodoItemWidget):
-                # print(widget.content_text)
-                if widget.content_text.strip():  # 不保存空文本
-                    todos.append({
-                        "text": widget.content_text,
-                        "completed": widget.is_completed()
-                    })
-        
-        # 保存到文件
-        with open(todo_file_source, "w", encoding="utf-8") as f:
-            json.dump(todos, f, ensure_ascii=False, indent=2)
+        self.commit_pending_edits()
+        try:
+            self.store.save(get_todo_file_name())
+        except OSError as e:
+            print(f"保存待办事项出错: {e}")
             
     def update_todo_list(self):
-        """更新待办事项列表，优化性能"""
-        # 移除已完成或空的项目
-        to_remove = []
-        items_changed = False
+        """更新待办事项列表，移除已完成或空的项目"""
+        self.commit_pending_edits()
         self.refresh_tags()
         
-        for i in range(self.todo_layout.count() - 1):
-            widget = self.todo_layout.itemAt(i).widget()
-            if isinstance(widget, TodoItemWidget):
-                if widget.is_completed() or not widget.content_text.strip():
-                    to_remove.append(widget)
-                    items_changed = True
+        empty = [record.id for record in self.store.records() if not record.text.strip()]
+        completed = [record for record in self.store.records() if record.completed and record.text.strip()]
         
-        # 批量删除
-        for widget in to_remove:
-            self.todo_layout.removeWidget(widget)
-            if widget in self.todo_items:
-                self.todo_items.remove(widget)
-            widget.deleteLater()
-            
-        if items_changed:
+        # 已完成的移入归档（归档失败时保留在列表中），空的直接删除，只触发一次控件更新
+        to_remove = empty
+        if completed and self._archive_records(completed):
+            to_remove += [record.id for record in completed]
+        if to_remove:
+            self.store.remove_many(to_remove)
             self.save_todos()
             self.filter_todos_by_tags()
+    
+    def _archive_records(self, records):
+        """把记录写入归档，成功时返回True"""
+        try:
+            self.archive.append(records)
+            if self.archive_index is not None:
+                now = time.time()
+                for record in records:
+                    self.archive_index.add(record.id, record.text)
+                    self.archive_texts[record.id] = (now, record.text)
+            return True
+        except OSError as e:
+            print(f"归档待办事项出错: {e}")
+            return False
         
-    def on_text_changed(self, text):
-        if text.strip():
-            self.save_todos()
-            
     def on_return_pressed(self, item):
         if item.content_text.strip(): # 如果文本不为空
             self.save_todos()
@@ -678,10 +1411,7 @@ class TodoPanel(QWidget):
             self.setFocus()
         else:
             # 如果是空文本，移除该项目
-            self.todo_layout.removeWidget(item)
-            if item in self.todo_items:
-                self.todo_items.remove(item)
-            item.deleteLater()
+            self.store.remove(item.record_id)
             self.save_todos()
             
     def on_checkbox_clicked(self, item):
@@ -694,11 +1424,9 @@ class TodoPanel(QWidget):
             
     def remove_completed_item(self, item):
         """移除已完成的项目"""
-        if item.is_completed():
-            self.todo_layout.removeWidget(item)
-            if item in self.todo_items:
-                self.todo_items.remove(item)
-            item.deleteLater()
+        record = self.store.get(item.record_id)
+        if record is not None and record.completed and self._archive_records([record]):
+            self.store.remove(record.id)
             self.save_todos()
             # 删除项目后刷新标签
-            self.refresh_tags()
\ No newline at end of file
+            self.refresh_tags()
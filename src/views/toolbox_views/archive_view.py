@@ -0,0 +1,73 @@
+import time
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem
+)
+from PySide6.QtCore import Qt
+from src.utils.todo_archive import TodoArchive
+
+
+class ArchiveView(QWidget):
+    """已完成事项归档视图：显示时只读取索引，选中分段后才加载该分段"""
+
+    def __init__(self):
+        super().__init__()
+        self.setObjectName("archiveView")
+        self.archive = TodoArchive()
+
+        layout = QVBoxLayout(self)
+        layout.setAlignment(Qt.AlignTop)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        content_layout = QHBoxLayout()
+        # 左侧按月份列出分段
+        self.segment_list = QListWidget()
+        self.segment_list.setFixedWidth(160)
+        self.segment_list.currentItemChanged.connect(self.on_segment_changed)
+        # 右侧显示选中分段的事项
+        self.item_list = QListWidget()
+        self.item_list.setUniformItemSizes(True)
+
+        content_layout.addWidget(self.segment_list)
+        content_layout.addWidget(self.item_list)
+        layout.addLayout(content_layout)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_segments()
+
+    def refresh_segments(self):
+        """重新读取索引（归档可能已被待办面板追加）"""
+        self.archive.reload()
+        segments = self.archive.segments()
+        current = self.segment_list.currentItem()
+        current_name = current.data(Qt.UserRole) if current else None
+
+        self.segment_list.blockSignals(True)
+        self.segment_list.clear()
+        for segment in segments:
+            item = QListWidgetItem(f"{segment['name']}  ({segment['count']})")
+            item.setData(Qt.UserRole, segment["name"])
+            self.segment_list.addItem(item)
+        self.segment_list.blockSignals(False)
+
+        self.summary_label.setText(f"共归档 {self.archive.total_count()} 条已完成事项")
+        if not segments:
+            self.item_list.clear()
+            return
+        names = [segment["name"] for segment in segments]
+        row = names.index(current_name) if current_name in names else 0
+        self.segment_list.setCurrentRow(row)
+        self.on_segment_changed(self.segment_list.item(row), None)
+
+    def on_segment_changed(self, current, previous):
+        """加载选中的分段"""
+        self.item_list.clear()
+        if current is None:
+            return
+        for archived in self.archive.load_segment(current.data(Qt.UserRole)):
+            completed = time.strftime("%m-%d %H:%M", time.localtime(archived.get("completed_at", 0)))
+            item = QListWidgetItem(f"{completed}    {archived['text']}")
+            item.setToolTip(archived["text"])
+            self.item_list.addItem(item)
@@ -1,8 +1,15 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QGroupBox, QFormLayout,
+    QPushButton, QFileDialog
+)
+from PySide6.QtCore import Qt, QTimer
+import json
+from src.utils.self_monitor import SelfMonitor
 
 
 class HomeView(QWidget):
+    QOBJECT_CENSUS_TICKS = 10  # Qt对象统计要遍历整棵对象树，每10次采样才统计一次
+
     def __init__(self):
         super().__init__()
         self.setObjectName("homeView")
@@ -50,4 +57,95 @@ class HomeView(QWidget):
         layout.addWidget(title_label)
         layout.addWidget(desc_label)
         layout.addWidget(features_label)
-        layout.addStretch()  # 添加伸缩器以保持内容在顶部
\ No newline at end of file
+        layout.addWidget(self.create_overhead_group())
+        layout.addStretch()  # 添加伸缩器以保持内容在顶部
+        
+        # 自身开销采样，仅在页面可见时运行
+        self.self_monitor = SelfMonitor()
+        self.last_sample = None
+        self.last_census = {}
+        self._sample_count = 0
+        self.overhead_timer = QTimer(self)
+        self.overhead_timer.timeout.connect(self.update_overhead)
+    
+    def create_overhead_group(self):
+        """创建自身资源占用展示组"""
+        group = QGroupBox("SMT2 资源占用")
+        layout = QVBoxLayout(group)
+        
+        form_layout = QFormLayout()
+        self.cpu_label = QLabel("-")
+        self.rss_label = QLabel("-")
+        self.threads_label = QLabel("-")
+        self.wakeups_label = QLabel("-")
+        self.qobjects_label = QLabel("-")
+        self.qobjects_label.setWordWrap(True)
+        form_layout.addRow("CPU:", self.cpu_label)
+        form_layout.addRow("内存 (RSS):", self.rss_label)
+        form_layout.addRow("线程数:", self.threads_label)
+        form_layout.addRow("定时器唤醒:", self.wakeups_label)
+        form_layout.addRow("Qt 对象:", self.qobjects_label)
+        layout.addLayout(form_layout)
+        
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        dump_btn = QPushButton("导出 JSON")
+        dump_btn.clicked.connect(self.dump_overhead)
+        button_layout.addWidget(dump_btn)
+        layout.addLayout(button_layout)
+        
+        return group
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        # 重置基准后等满一个周期再采样，隐藏期间的时间不计入CPU占用和唤醒频率
+        self.self_monitor.start_timer_counting()
+        self._sample_count = 0
+        self.overhead_timer.start(1000)
+        
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.overhead_timer.stop()
+        self.self_monitor.stop_timer_counting()
+    
+    def update_overhead(self):
+        """采样并刷新自身开销"""
+        include_qobjects = self._sample_count % self.QOBJECT_CENSUS_TICKS == 0
+        self._sample_count += 1
+        sample = self.self_monitor.sample(include_qobjects)
+        if include_qobjects:
+            self.last_census = sample["qobjects"]
+        else:
+            sample["qobjects"] = self.last_census
+        self.last_sample = sample
+        
+        self.cpu_label.setText(f"{sample['cpu_percent']:.1%}（累计 {sample['cpu_time']:.1f} 秒）")
+        self.rss_label.setText(f"{sample['rss'] / 1024 / 1024:.1f} MB")
+        self.threads_label.setText(f"{sample['os_threads']}（Python 线程 {sample['python_threads']}）")
+        wakeups = sample['timer_wakeups_per_second']
+        self.wakeups_label.setText("-" if wakeups is None else f"{wakeups:.1f} 次/秒")
+        
+        if not include_qobjects:
+            return
+        qobjects = sample['qobjects']
+        top_classes = "，".join(f"{name} {count}" for name, count in list(qobjects.items())[:6])
+        self.qobjects_label.setText(f"共 {sum(qobjects.values())} 个：{top_classes}")
+    
+    def dump_overhead(self):
+        """将最近一次采样导出为JSON文件"""
+        if self.last_sample is None:
+            self.update_overhead()
+        else:
+            # 导出时重新统计Qt对象，不使用最多10秒前的结果
+            self.last_census = dict(SelfMonitor.qobject_census().most_common())
+            self.last_sample["qobjects"] = self.last_census
+        
+        file_path, _ = QFileDialog.getSaveFileName(self, "导出资源占用", "smt2_overhead.json", "JSON (*.json)")
+        if not file_path:
+            return
+        
+        try:
+            with open(file_path, "w", encoding="utf-8") as f:
+                json.dump(self.last_sample, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"导出资源占用出错: {e}")
\ No newline at end of file
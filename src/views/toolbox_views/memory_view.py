@@ -0,0 +1,85 @@
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QPlainTextEdit
+)
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFont
+from src.utils.memory_profiler import MemoryProfiler
+
+
+class MemoryView(QWidget):
+    """内存分析视图：tracemalloc快照对比与Qt对象统计"""
+
+    def __init__(self):
+        super().__init__()
+        self.setObjectName("memoryView")
+        self.profiler = MemoryProfiler()
+
+        layout = QVBoxLayout(self)
+        layout.setAlignment(Qt.AlignTop)
+
+        # 操作按钮
+        button_layout = QHBoxLayout()
+        self.trace_btn = QPushButton("开始追踪")
+        self.trace_btn.clicked.connect(self.toggle_tracing)
+        snapshot_btn = QPushButton("拍摄快照")
+        snapshot_btn.clicked.connect(self.take_snapshot)
+        compare_btn = QPushButton("对比最近两次")
+        compare_btn.clicked.connect(self.compare_snapshots)
+        census_btn = QPushButton("Qt 对象统计")
+        census_btn.clicked.connect(self.show_census)
+
+        for btn in (self.trace_btn, snapshot_btn, compare_btn, census_btn):
+            btn.setMinimumHeight(30)
+            button_layout.addWidget(btn)
+        button_layout.addStretch()
+        layout.addLayout(button_layout)
+
+        self.status_label = QLabel("未开启追踪（开启后程序会明显变慢，仅在排查内存泄漏时使用）")
+        layout.addWidget(self.status_label)
+
+        # 输出区域
+        self.output = QPlainTextEdit()
+        self.output.setReadOnly(True)
+        self.output.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.output.setFont(QFont("Consolas", 9))
+        layout.addWidget(self.output)
+
+    def toggle_tracing(self):
+        """开启或停止tracemalloc"""
+        if self.profiler.is_tracing():
+            self.profiler.stop()
+            self.trace_btn.setText("开始追踪")
+            self.status_label.setText("已停止追踪，快照已清空")
+        else:
+            self.profiler.start()
+            self.trace_btn.setText("停止追踪")
+            self.status_label.setText("正在追踪内存分配")
+
+    def take_snapshot(self):
+        """拍摄快照"""
+        label = self.profiler.take_snapshot()
+        self.trace_btn.setText("停止追踪")
+        self.status_label.setText(f"已拍摄快照 {label}，共 {len(self.profiler.snapshots)} 个")
+
+    def compare_snapshots(self):
+        """显示最近两次快照之间增长最多的位置"""
+        lines = self.profiler.compare_latest()
+        if not lines:
+            self.output.setPlainText("至少需要两个快照才能对比")
+            return
+        if len(lines) == 1:
+            lines.append("两次快照之间没有内存增长")
+        self.output.setPlainText("\n".join(lines))
+
+    def show_census(self):
+        """显示Qt控件与Python侧QObject的数量统计"""
+        widget_census = self.profiler.widget_census()
+        qobject_census, dangling = self.profiler.python_qobject_census()
+
+        lines = [f"存活的 Qt 控件：共 {sum(widget_census.values())} 个"]
+        lines += [f"{count:>8}  {name}" for name, count in widget_census.most_common()]
+        lines.append("")
+        lines.append(f"Python 持有的 QObject：共 {sum(qobject_census.values())} 个，"
+                     f"C++ 对象已销毁的包装 {dangling} 个")
+        lines += [f"{count:>8}  {name}" for name, count in qobject_census.most_common()]
+        self.output.setPlainText("\n".join(lines))
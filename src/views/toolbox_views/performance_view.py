@@ -0,0 +1,153 @@
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QGroupBox, QFormLayout, QProgressBar
+)
+from PySide6.QtCore import Qt, QTimer, QRect
+from PySide6.QtGui import QPainter, QImage, QColor, QFont
+from src.utils.performance_monitor import PerCoreCpuMeter
+from src.utils.sample_ring import CoreSampleRing
+from src.utils.partition_cache import PartitionCache
+from src.configs.base_config import get_performance_interval
+
+
+class CoreHeatStrip(QWidget):
+    """按核心绘制CPU占用热力条，每行一个核心，横轴为时间（右侧最新）"""
+
+    LABEL_WIDTH = 32
+
+    def __init__(self, ring: CoreSampleRing, parent=None):
+        super().__init__(parent)
+        self.ring = ring
+        self.setMinimumHeight(min(240, max(60, ring.core_count * 6)))
+
+        # 0~100 对应的调色板，由深蓝过渡到红色
+        self._color_table = []
+        for level in range(101):
+            ratio = level / 100
+            color = QColor.fromHsvF((1 - ratio) * 0.66, 0.85, 0.35 + 0.6 * ratio)
+            self._color_table.append(color.rgb())
+
+    def _build_image(self) -> QImage:
+        """把环形缓冲区转换为索引色图像，每个像素对应一个核心的一次采样"""
+        ring = self.ring
+        width = ring.capacity
+        stride = (width + 3) & ~3  # 索引色图像的扫描行需要4字节对齐
+        pad = bytes(stride - width)
+        empty = bytes(width - len(ring))
+
+        rows = []
+        for core in range(ring.core_count):
+            history = ring.core_history(core)
+            rows.append(empty + bytes(int(value * 100 + 0.5) for value in history) + pad)
+        self._image_data = b"".join(rows)  # QImage不会复制数据，需要保持引用
+
+        image = QImage(self._image_data, width, ring.core_count, stride, QImage.Format_Indexed8)
+        image.setColorTable(self._color_table)
+        return image
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        target = QRect(self.LABEL_WIDTH, 0, self.width() - self.LABEL_WIDTH, self.height())
+        painter.drawImage(target, self._build_image())
+
+        # 行高足够时绘制核心编号
+        row_height = self.height() / self.ring.core_count
+        if row_height >= 10:
+            painter.setFont(QFont("Microsoft YaHei UI", 7))
+            painter.setPen(self.palette().windowText().color())
+            for core in range(self.ring.core_count):
+                painter.drawText(QRect(0, int(core * row_height), self.LABEL_WIDTH - 4, int(row_height)),
+                                 Qt.AlignRight | Qt.AlignVCenter, str(core))
+
+
+class PerformanceView(QWidget):
+    """性能详情视图：每核心CPU占用热力条与所有挂载分区的使用率"""
+
+    HISTORY_LENGTH = 60  # 热力条保留的采样次数
+    DISK_REFRESH_INTERVAL = 5000  # 磁盘使用率刷新间隔（毫秒）
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("performanceView")
+
+        # 每个视图单独保存上一次的CPU时间作为差值基准，工具箱和中键弹出的视图同时显示时互不影响
+        self.core_meter = PerCoreCpuMeter()
+        self.core_ring = CoreSampleRing(self.core_meter.core_count, self.HISTORY_LENGTH)
+        self.partition_cache = PartitionCache()
+        self._disk_version = -1
+        self._disk_bars = {}
+
+        layout = QVBoxLayout(self)
+        layout.setAlignment(Qt.AlignTop)
+
+        # CPU 各核心
+        cpu_group = QGroupBox("CPU 各核心占用")
+        cpu_layout = QVBoxLayout(cpu_group)
+        self.cpu_summary_label = QLabel(f"{self.core_meter.core_count} 个核心")
+        self.heat_strip = CoreHeatStrip(self.core_ring)
+        cpu_layout.addWidget(self.cpu_summary_label)
+        cpu_layout.addWidget(self.heat_strip)
+        layout.addWidget(cpu_group)
+
+        # 磁盘分区
+        disk_group = QGroupBox("磁盘分区")
+        self.disk_layout = QFormLayout(disk_group)
+        layout.addWidget(disk_group)
+        layout.addStretch()
+
+        # 定时器仅在视图可见时运行
+        self.cpu_timer = QTimer(self)
+        self.cpu_timer.timeout.connect(self.update_cpu_data)
+        self.disk_timer = QTimer(self)
+        self.disk_timer.timeout.connect(self.update_disk_data)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.cpu_timer.start(get_performance_interval())
+        self.disk_timer.start(self.DISK_REFRESH_INTERVAL)
+        self.update_disk_data()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.cpu_timer.stop()
+        self.disk_timer.stop()
+
+    def update_cpu_data(self):
+        """采样每个核心的占用并刷新热力条"""
+        values = self.core_meter.sample()
+        self.core_ring.append(values)
+        if values:
+            self.cpu_summary_label.setText(
+                f"{len(values)} 个核心  平均 {sum(values) / len(values):.0%}  最高 {max(values):.0%}"
+            )
+        self.heat_strip.update()
+
+    def update_disk_data(self):
+        """刷新分区使用率，分区列表变化时才重建行"""
+        usages = self.partition_cache.get_usages()
+        if self.partition_cache.version != self._disk_version:
+            self._disk_version = self.partition_cache.version
+            self._rebuild_disk_rows(usages)
+
+        for partition, percent, free_gb in usages:
+            bar = self._disk_bars.get(partition.mountpoint)
+            if bar:
+                bar.setValue(round(percent * 100))
+                bar.setFormat(f"%p%  剩余 {free_gb} GB")
+
+    def _rebuild_disk_rows(self, usages):
+        """按当前分区列表重建磁盘行"""
+        while self.disk_layout.rowCount():
+            self.disk_layout.removeRow(0)
+        self._disk_bars = {}
+
+        if not usages:
+            self.disk_layout.addRow(QLabel("未找到可用分区"))
+            return
+
+        for partition, _, _ in usages:
+            bar = QProgressBar()
+            bar.setRange(0, 100)
+            bar.setTextVisible(True)
+            bar.setToolTip(f"{partition.device} ({partition.fstype})")
+            self.disk_layout.addRow(partition.mountpoint, bar)
+            self._disk_bars[partition.mountpoint] = bar
@@ -9,6 +9,7 @@ from PySide6.QtGui import QColor
 import json
 import os
 from src.configs.defaul_config import defaul_config
+from src.utils.profiler import profile_slot
 
 
 class SettingView(QScrollArea):
@@ -125,6 +126,7 @@ class SettingView(QScrollArea):
         # 重置修改标志
         self.config_modified = False
     
+    @profile_slot
     def create_cards(self):
         """创建配置卡片"""
         for key, value in self.config_data.items():
@@ -405,17 +407,18 @@ class SettingView(QScrollArea):
     def on_config_changed(self, key, value):
         """当配置更改时调用"""
         # 尝试转换值为适当的类型
-        if isinstance(self.original_config.get(key), int):
-            try:
-                value = int(value)
-            except ValueError:
-                pass  # 保持字符串值
-        elif isinstance(self.original_config.get(key), bool):
+        # bool是int的子类，需要先判断
+        if isinstance(self.original_config.get(key), bool):
             if isinstance(value, str):
                 if value.lower() in ['true', '1', 'yes', 'on']:
                     value = True
                 elif value.lower() in ['false', '0', 'no', 'off']:
                     value = False
+        elif isinstance(self.original_config.get(key), int):
+            try:
+                value = int(value)
+            except ValueError:
+                pass  # 保持字符串值
         
         self.config_data[key] = value
         self.config_modified = True
@@ -428,17 +431,18 @@ class SettingView(QScrollArea):
         
         # 尝试转换值为适当的类型
         original_value = self.original_config.get(dict_key, {}).get(sub_key)
-        if isinstance(original_value, int):
-            try:
-                value = int(value)
-            except ValueError:
-                pass  # 保持字符串值
-        elif isinstance(original_value, bool):
+        # bool是int的子类，需要先判断
+        if isinstance(original_value, bool):
             if isinstance(value, str):
                 if value.lower() in ['true', '1', 'yes', 'on']:
                     value = True
                 elif value.lower() in ['false', '0', 'no', 'off']:
                     value = False
+        elif isinstance(original_value, int):
+            try:
+                value = int(value)
+            except ValueError:
+                pass  # 保持字符串值
         
         # 更新字典
         current_dict[sub_key] = value
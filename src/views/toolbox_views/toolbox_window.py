@@ -6,11 +6,17 @@ from PySide6.QtCore import Qt, QSize, Signal, QPoint, QPropertyAnimation, QEasin
 from PySide6.QtGui import QIcon, QPalette, QColor, QPainter, QPen
 from .home_view import HomeView
 from .setting_view import SettingView
+from .performance_view import PerformanceView
+from .memory_view import MemoryView
+from .archive_view import ArchiveView
 from src.views.components.switch import Switch
 from src.utils.theme_manager import ThemeManager
 
 
 class ToolBoxWindow(QWidget):
+    MEMORY_PAGE = 3  # 内存分析页在导航中的位置
+    ARCHIVE_PAGE = 4  # 归档页在导航中的位置
+    
     def __init__(self):
         super().__init__()
         # 设置为无边框窗口并添加圆角
@@ -100,6 +106,9 @@ class ToolBoxWindow(QWidget):
         # 创建视图
         self.home_view = HomeView()
         self.setting_view = SettingView()
+        self.performance_view = PerformanceView()
+        self.memory_view = MemoryView()
+        self.archive_view = ArchiveView()
         
         # 设置应用按钮的回调
         self.setting_view.changes_made.connect(self.show_apply_button)
@@ -107,6 +116,9 @@ class ToolBoxWindow(QWidget):
         # 添加到堆叠窗口
         self.stacked_widget.addWidget(self.home_view)
         self.stacked_widget.addWidget(self.setting_view)
+        self.stacked_widget.addWidget(self.performance_view)
+        self.stacked_widget.addWidget(self.memory_view)
+        self.stacked_widget.addWidget(self.archive_view)
         
         # 设置初始页面
         self.current_view = self.home_view
@@ -178,6 +190,9 @@ class ToolBoxWindow(QWidget):
         nav_items = [
             {"name": "首页", "icon": None},
             {"name": "设置", "icon": None},
+            {"name": "性能详情", "icon": None},
+            {"name": "内存分析", "icon": None},
+            {"name": "已完成归档", "icon": None},
         ]
         
         for item in nav_items:
@@ -217,6 +232,12 @@ class ToolBoxWindow(QWidget):
             self.current_view = self.home_view
         elif index == 1:
             self.current_view = self.setting_view
+        elif index == 2:
+            self.current_view = self.performance_view
+        elif index == 3:
+            self.current_view = self.memory_view
+        elif index == 4:
+            self.current_view = self.archive_view
 
     def show_apply_button(self):
         """显示或隐藏应用按钮，根据配置是否被修改"""
@@ -0,0 +1,30 @@
+from src.utils.lightweight_tag_extractor import LightweightTagExtractor
+from src.utils.tag_query import TagBitsetIndex, parse_tag_query
+
+
+def _index(records):
+    """records为 [(id, 文本, 提取出的标签)]，与待办面板建立索引的方式相同"""
+    return TagBitsetIndex([todo_id for todo_id, _, _ in records],
+                          [LightweightTagExtractor.todo_tags(text, tags) for _, text, tags in records])
+
+
+def _matches(index, query):
+    return [todo_id for todo_id, hit in zip(index.ids, index.iter_bits(index.evaluate(parse_tag_query(query)))) if hit]
+
+
+def test_bracket_only_tag_is_queryable():
+    # jieba把“已延期”切成 已/d + 延期/v，提取结果中没有这个标签，只能来自[]标签
+    index = _index([
+        ("a", "整理[课程开发]资料 [已延期]", ("课程开发", "资料")),
+        ("b", "[课程开发]教学设计", ("课程开发", "教学设计")),
+        ("c", "复盘会议 [已延期]", None),
+    ])
+    assert _matches(index, "[已延期]") == ["a", "c"]
+    assert _matches(index, "[课程开发] AND NOT [已延期]") == ["b"]
+    assert _matches(index, "NOT [已延期]") == ["b"]
+
+
+def test_pending_records_use_bracket_tags():
+    # 尚未提取标签（tags为None）的记录按[]标签参与筛选
+    assert LightweightTagExtractor.todo_tags("复盘 [已延期]", None) == frozenset({"已延期"})
+    assert LightweightTagExtractor.todo_tags("复盘", ("复盘",)) == frozenset({"复盘"})
@@ -0,0 +1,108 @@
+import json
+from src.utils.todo_store import JOURNAL_SUFFIX, TodoStore
+
+
+def _fields(store):
+    return [(record.id, record.text, record.completed) for record in store.records()]
+
+
+def test_batch_sends_one_change():
+    store = TodoStore()
+    first, second, third = store.add_many(["甲", "乙", "丙"])
+    changes = []
+    store.subscribe(changes.append)
+
+    with store.batch():
+        fourth = store.add("丁")
+        store.update(first.id, completed=True)
+        store.move(third.id, 0)
+        store.remove(second.id)
+        # 同一批中添加后又删除的记录不出现在通知里
+        store.remove(store.add("戊").id)
+    assert len(changes) == 1
+    change = changes[0]
+    assert change.added == {fourth.id}
+    assert change.updated == {first.id}
+    assert change.moved == {third.id}
+    assert change.removed == {second.id}
+    assert [record.text for record in store.records()] == ["丙", "甲", "丁"]
+
+    # 没有实际变化的修改不发出通知
+    store.update(first.id, completed=True)
+    assert len(changes) == 1
+
+
+def test_save_load_round_trip(tmp_path):
+    path = str(tmp_path / "todos.json")
+    store = TodoStore()
+    first, second, third = store.add_many(["甲", "乙", "丙"])
+    store.save(path)
+
+    # 首次保存写入快照，之后的修改只追加到日志
+    store.update(first.id, text="甲2", completed=True)
+    store.remove(second.id)
+    store.move(third.id, 0)
+    store.save(path)
+    with open(path, encoding="utf-8") as f:
+        assert len(json.load(f)) == 3
+    with open(path + JOURNAL_SUFFIX, encoding="utf-8") as f:
+        ops = sorted(json.loads(line)["op"] for line in f)
+    assert ops == ["del", "put", "put"]
+
+    loaded = TodoStore()
+    loaded.load(path)
+    assert _fields(loaded) == _fields(store) == [(third.id, "丙", False), (first.id, "甲2", True)]
+
+    # 合并快照后内容不变，日志被清空
+    loaded.compact(path)
+    reloaded = TodoStore()
+    reloaded.load(path)
+    assert _fields(reloaded) == _fields(store)
+    with open(path + JOURNAL_SUFFIX, encoding="utf-8") as f:
+        assert f.read() == ""
+
+
+def test_legacy_file_gets_ids_and_orders(tmp_path):
+    path = tmp_path / "todos.json"
+    path.write_text(json.dumps([{"text": "甲", "completed": True}, {"text": "乙", "completed": False}]),
+                    encoding="utf-8")
+    store = TodoStore()
+    store.load(str(path))
+    assert [(record.text, record.completed) for record in store.records()] == [("甲", True), ("乙", False)]
+
+    # 旧格式文件在下次保存时写入带id和排序键的完整快照
+    store.save(str(path))
+    items = json.loads(path.read_text(encoding="utf-8"))
+    assert [item["id"] for item in items] == [record.id for record in store.records()]
+    assert all(item["order"] for item in items)
+
+
+def test_refresh_merges_fields_edited_by_two_stores(tmp_path):
+    path = str(tmp_path / "todos.json")
+    ours = TodoStore()
+    record = ours.add("写周报")
+    other = ours.add("开会")
+    ours.save(path)
+    theirs = TodoStore()
+    theirs.load(path)
+
+    # 两个进程修改同一条记录的不同字段
+    ours.update(record.id, text="写周报并发送")
+    ours.save(path)
+    theirs.update(record.id, completed=True)
+    theirs.remove(other.id)
+    changes = []
+    theirs.subscribe(changes.append)
+    assert theirs.refresh(path)
+    assert _fields(theirs) == [(record.id, "写周报并发送", True)]
+    assert changes[-1].updated == {record.id}
+
+    # theirs尚未保存的修改在保存后由ours合并进来
+    theirs.save(path)
+    assert ours.refresh(path)
+    assert _fields(ours) == [(record.id, "写周报并发送", True)]
+    assert not ours.refresh(path)
+
+    reloaded = TodoStore()
+    reloaded.load(path)
+    assert _fields(reloaded) == _fields(ours)